@@ -0,0 +1,24 @@
+"""Índices compostos para verificação de conflitos e listagem de reservas
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index(
+        "ix_bookings_space_status_intervalo",
+        "bookings",
+        ["space_id", "status", "end_time", "start_time"],
+    )
+    op.create_index("ix_bookings_user_inicio", "bookings", ["user_id", "start_time"])
+
+def downgrade():
+    op.drop_index("ix_bookings_user_inicio", table_name="bookings")
+    op.drop_index("ix_bookings_space_status_intervalo", table_name="bookings")
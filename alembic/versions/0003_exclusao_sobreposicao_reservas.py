@@ -0,0 +1,31 @@
+"""Constraint de exclusão contra reservas sobrepostas (somente PostgreSQL)
+
+Garante no banco que duas reservas ativas do mesmo espaço nunca se sobrepõem,
+mesmo que a aplicação tenha algum caminho sem bloqueio. Em outros bancos a
+migração não faz nada: a serialização fica a cargo de `bloquear_espaco`.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_sem_sobreposicao "
+        "EXCLUDE USING gist (space_id WITH =, tsrange(start_time, end_time) WITH &&) "
+        "WHERE (status IN ('PENDENTE', 'CONFIRMADA'))"
+    )
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_sem_sobreposicao")
@@ -0,0 +1,28 @@
+"""Índices para paginação keyset do catálogo de espaços e das reservas do usuário
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_spaces_disponivel_id", "spaces", ["is_available", "id"])
+    op.create_index("ix_spaces_disponivel_capacidade", "spaces", ["is_available", "capacity"])
+    op.create_index("ix_spaces_disponivel_preco", "spaces", ["is_available", "price_per_hour"])
+    op.create_index(
+        "ix_bookings_user_status_inicio",
+        "bookings",
+        ["user_id", "status", "start_time"],
+    )
+
+def downgrade():
+    op.drop_index("ix_bookings_user_status_inicio", table_name="bookings")
+    op.drop_index("ix_spaces_disponivel_preco", table_name="spaces")
+    op.drop_index("ix_spaces_disponivel_capacidade", table_name="spaces")
+    op.drop_index("ix_spaces_disponivel_id", table_name="spaces")
@@ -0,0 +1,20 @@
+"""Índices por início para a exportação em streaming de reservas
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_bookings_space_inicio", "bookings", ["space_id", "start_time"])
+    op.create_index("ix_bookings_inicio", "bookings", ["start_time"])
+
+def downgrade():
+    op.drop_index("ix_bookings_inicio", table_name="bookings")
+    op.drop_index("ix_bookings_space_inicio", table_name="bookings")
@@ -0,0 +1,51 @@
+"""Reservas recorrentes (recurring_bookings) e vínculo das ocorrências em bookings
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "recurring_bookings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("space_id", sa.Integer(), sa.ForeignKey("spaces.id"), nullable=False),
+        sa.Column("rule", sa.String(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("materialized_until", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_recurring_bookings_id", "recurring_bookings", ["id"])
+    op.create_index(
+        "ix_recurring_bookings_ativa_materializada",
+        "recurring_bookings",
+        ["is_active", "materialized_until"],
+    )
+
+    with op.batch_alter_table("bookings") as batch:
+        batch.add_column(sa.Column("recurring_booking_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_bookings_recurring_booking_id", "recurring_bookings",
+            ["recurring_booking_id"], ["id"],
+        )
+        batch.create_index("ix_bookings_recurring_booking_id", ["recurring_booking_id"])
+
+def downgrade():
+    with op.batch_alter_table("bookings") as batch:
+        batch.drop_index("ix_bookings_recurring_booking_id")
+        batch.drop_constraint("fk_bookings_recurring_booking_id", type_="foreignkey")
+        batch.drop_column("recurring_booking_id")
+
+    op.drop_index("ix_recurring_bookings_ativa_materializada", table_name="recurring_bookings")
+    op.drop_index("ix_recurring_bookings_id", table_name="recurring_bookings")
+    op.drop_table("recurring_bookings")
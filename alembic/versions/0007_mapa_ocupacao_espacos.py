@@ -0,0 +1,28 @@
+"""Mapa de ocupação diário por espaço (space_occupancy)
+
+Bancos com reservas existentes devem preencher o mapa depois do upgrade:
+`python gerenciar.py reconstruir-ocupacao`.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "space_occupancy",
+        sa.Column("space_id", sa.Integer(), sa.ForeignKey("spaces.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("occupied", sa.LargeBinary(), nullable=False),
+        sa.Column("confirmed", sa.LargeBinary(), nullable=False),
+    )
+
+def downgrade():
+    op.drop_table("space_occupancy")
@@ -0,0 +1,18 @@
+"""Índice por status e fim para as transições automáticas de reservas
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_bookings_status_fim", "bookings", ["status", "end_time"])
+
+def downgrade():
+    op.drop_index("ix_bookings_status_fim", table_name="bookings")
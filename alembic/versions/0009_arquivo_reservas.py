@@ -0,0 +1,39 @@
+"""Arquivo de reservas concluídas e canceladas (bookings_archive)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "bookings_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("space_id", sa.Integer(), sa.ForeignKey("spaces.id"), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column(
+            "status",
+            # Tipo já criado em 0001 (no PostgreSQL)
+            postgresql.ENUM("PENDENTE", "CONFIRMADA", "CANCELADA", "CONCLUIDA", name="bookingstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("total_price", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("recurring_booking_id", sa.Integer(), sa.ForeignKey("recurring_bookings.id"), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_bookings_archive_user_inicio", "bookings_archive", ["user_id", "start_time"])
+
+def downgrade():
+    op.drop_index("ix_bookings_archive_user_inicio", table_name="bookings_archive")
+    op.drop_table("bookings_archive")
@@ -0,0 +1,31 @@
+"""Regras de preço por espaço (space_price_rules)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "space_price_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("space_id", sa.Integer(), sa.ForeignKey("spaces.id"), nullable=False),
+        sa.Column("kind", sa.String(10), nullable=False),
+        sa.Column("weekdays", sa.Integer(), nullable=True),
+        sa.Column("start_minute", sa.Integer(), nullable=True),
+        sa.Column("end_minute", sa.Integer(), nullable=True),
+        sa.Column("min_duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("multiplier", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_space_price_rules_space_id", "space_price_rules", ["space_id"])
+
+def downgrade():
+    op.drop_index("ix_space_price_rules_space_id", table_name="space_price_rules")
+    op.drop_table("space_price_rules")
@@ -0,0 +1,18 @@
+"""Índice por status e criação para a expiração de pendentes pelo TTL
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_bookings_status_criacao", "bookings", ["status", "created_at"])
+
+def downgrade():
+    op.drop_index("ix_bookings_status_criacao", table_name="bookings")
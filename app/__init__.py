@@ -0,0 +1 @@
+from app import config  # noqa: F401 - carrega o .env antes dos módulos que leem o ambiente
@@ -1,15 +1,22 @@
 from app.auth.security import (
     verificar_senha, 
+    verificar_e_atualizar_senha,
     criptografar_senha, 
     criar_token_acesso, 
     verificar_token,
     obter_usuario_atual
 )
+from app.auth.cache import cache_tokens, UsuarioSessao
+from app.auth.senhas import pool_senhas
 
 __all__ = [
     "verificar_senha", 
+    "verificar_e_atualizar_senha",
     "criptografar_senha", 
     "criar_token_acesso", 
     "verificar_token",
-    "obter_usuario_atual"
+    "obter_usuario_atual",
+    "cache_tokens",
+    "UsuarioSessao",
+    "pool_senhas"
 ]
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Cache de tokens verificados e do usuário logado.
+
+Guarda, por token, as claims já decodificadas e um retrato leve do usuário
+(id, email, is_active), evitando decodificar o JWT e consultar o banco a cada
+requisição autenticada. Cada entrada vive no máximo TOKEN_CACHE_TTL_S segundos
+e nunca além do `exp` do token.
+
+O cache é por processo: alterações de usuário feitas em outro worker só são
+vistas quando a entrada expira (TTL).
+
+Cada usuário tem uma geração, incrementada em `invalidar_usuario`. Quem não
+achou o token no cache lê a geração antes de consultar o usuário e a passa a
+`guardar`: um retrato lido antes de uma alteração concorrente não é guardado
+depois da invalidação (seguiria valendo até o TTL, inclusive para uma conta
+desativada).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+class UsuarioSessao(NamedTuple):
+    """Dados do usuário logado suficientes para autorização"""
+    id: int
+    email: str
+    is_active: bool
+
+class TokenVerificado(NamedTuple):
+    claims: dict
+    usuario: UsuarioSessao
+
+class CacheTokens:
+    """LRU com TTL de tokens verificados, com índice por usuário para invalidação"""
+
+    def __init__(self, max_itens: int = 10_000, ttl_s: float = 300):
+        self.max_itens = max_itens
+        self.ttl_s = ttl_s
+        self._itens = OrderedDict()  # token -> (expira_em, TokenVerificado)
+        self._tokens_por_usuario = {}
+        # usuario_id -> invalidações do usuário (só de quem já foi invalidado)
+        self._geracoes = {}
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+        self.descartados = 0
+
+    def obter(self, token: str) -> Optional[TokenVerificado]:
+        agora = time.time()
+        with self._lock:
+            item = self._itens.get(token)
+            if item is None:
+                self.falhas += 1
+                return None
+            expira_em, verificado = item
+            if expira_em <= agora:
+                self._remover(token)
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(token)
+            self.acertos += 1
+            return verificado
+
+    def usuario_id(self, token: str) -> Optional[int]:
+        """Id do usuário de um token em cache e válido, sem contar acerto/falha nem reordenar"""
+        item = self._itens.get(token)
+        if item is None or item[0] <= time.time():
+            return None
+        return item[1].usuario.id
+
+    def geracao(self, usuario_id: Optional[int]) -> int:
+        """
+        Lida antes de consultar o usuário no banco, para `guardar`. Sem id (tokens
+        antigos, só com email), vale a contagem de todas as invalidações
+        """
+        with self._lock:
+            return self._geracao(usuario_id)
+
+    def guardar(self, token: str, claims: dict, usuario: UsuarioSessao, geracao: Optional[int] = None):
+        """Guarda o token, exceto se o usuário foi invalidado depois de `geracao`"""
+        expira_em = time.time() + self.ttl_s
+        if claims.get("exp"):
+            expira_em = min(expira_em, float(claims["exp"]))
+        with self._lock:
+            if geracao is not None and geracao != self._geracao(claims.get("uid")):
+                self.descartados += 1
+                return
+            self._remover(token)
+            self._itens[token] = (expira_em, TokenVerificado(claims, usuario))
+            self._tokens_por_usuario.setdefault(usuario.id, set()).add(token)
+            while len(self._itens) > self.max_itens:
+                self._remover(next(iter(self._itens)))
+
+    def invalidar_usuario(self, usuario_id: int):
+        """Descarta todos os tokens em cache de um usuário (após alteração ou desativação)"""
+        with self._lock:
+            for token in list(self._tokens_por_usuario.get(usuario_id, ())):
+                self._remover(token)
+            self._geracoes[usuario_id] = self._geracoes.get(usuario_id, 0) + 1
+            self.invalidacoes += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._tokens_por_usuario.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / total, 4) if total else 0.0,
+                "invalidacoes": self.invalidacoes,
+                "descartados": self.descartados,
+            }
+
+    def _geracao(self, usuario_id: Optional[int]) -> int:
+        # Chamado com o lock adquirido
+        return self.invalidacoes if usuario_id is None else self._geracoes.get(usuario_id, 0)
+
+    def _remover(self, token: str):
+        # Chamado com o lock adquirido
+        item = self._itens.pop(token, None)
+        if item is None:
+            return
+        usuario_id = item[1].usuario.id
+        tokens = self._tokens_por_usuario.get(usuario_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_por_usuario[usuario_id]
+
+cache_tokens = CacheTokens(
+    max_itens=int(os.getenv("TOKEN_CACHE_MAX", 10_000)),
+    ttl_s=float(os.getenv("TOKEN_CACHE_TTL_S", 300)),
+)
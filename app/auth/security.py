@@ -1,30 +1,34 @@
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from app.auth.senhas import pool_senhas, _gerar_hash, _verificar_e_atualizar
 
 CHAVE_SECRETA = os.getenv("SECRET_KEY", "chave-secreta-dev")
 ALGORITMO = "HS256"
 TEMPO_EXPIRACAO_TOKEN_MINUTOS = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 def verificar_senha(senha_plana, senha_criptografada):
-    return pwd_context.verify(senha_plana, senha_criptografada)
+    return verificar_e_atualizar_senha(senha_plana, senha_criptografada)[0]
+
+def verificar_e_atualizar_senha(senha_plana, senha_criptografada):
+    """
+    Verifica a senha no pool de senhas. Retorna (confere, novo_hash), onde
+    novo_hash vem preenchido quando o hash atual usa parâmetros desatualizados
+    """
+    return pool_senhas.executar(_verificar_e_atualizar, senha_plana, senha_criptografada)
 
 def criptografar_senha(senha):
-    return pwd_context.hash(senha)
+    return pool_senhas.executar(_gerar_hash, senha)
 
 def criar_token_acesso(dados: dict):
     dados_para_codificar = dados.copy()
     expiracao = datetime.utcnow() + timedelta(minutes=TEMPO_EXPIRACAO_TOKEN_MINUTOS)
     dados_para_codificar.update({"exp": expiracao})
+    # Importado no primeiro uso: python-jose (e o backend de criptografia) pesa na inicialização
+    from jose import jwt
     token_jwt = jwt.encode(dados_para_codificar, CHAVE_SECRETA, algorithm=ALGORITMO)
     return token_jwt
 
@@ -32,6 +36,7 @@ def verificar_token(token: str):
     """
     Verifica e decodifica um token JWT
     """
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, CHAVE_SECRETA, algorithms=[ALGORITMO])
         return payload
@@ -0,0 +1,128 @@
+"""
+Hash e verificação de senhas (bcrypt) em um pool de processos limitado.
+
+Cada operação bcrypt custa centenas de milissegundos de CPU. Executá-las em
+processos separados evita disputar o GIL com o restante da API, e o limite de
+operações em andamento faz uma rajada de logins ser recusada com 429 em vez de
+ocupar todas as threads que também atendem as reservas.
+
+Configuração (variáveis de ambiente):
+    BCRYPT_ROUNDS        custo do bcrypt (hashes antigos são refeitos no login)
+    SENHA_WORKERS        processos do pool (0 = executa na própria thread)
+    SENHA_FILA_MAX       operações em andamento aceitas (executando + na fila)
+    SENHA_RETRY_AFTER_S  valor do cabeçalho Retry-After nas recusas
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+SENHA_WORKERS = int(os.getenv("SENHA_WORKERS", min(4, os.cpu_count() or 1)))
+SENHA_FILA_MAX = int(os.getenv("SENHA_FILA_MAX", max(SENHA_WORKERS, 1) * 4))
+SENHA_RETRY_AFTER_S = int(os.getenv("SENHA_RETRY_AFTER_S", 1))
+
+@lru_cache(maxsize=1)
+def _contexto():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# Funções executadas nos processos do pool (precisam ser de módulo para o pickle)
+
+def _gerar_hash(senha: str) -> str:
+    return _contexto().hash(senha)
+
+def _verificar_e_atualizar(senha: str, senha_criptografada: str):
+    # Retorna (senha confere, novo hash se o atual usa parâmetros antigos)
+    return _contexto().verify_and_update(senha, senha_criptografada)
+
+class PoolSenhas:
+    """Pool de processos com controle de admissão e métricas"""
+
+    def __init__(self, workers: int, fila_max: int, retry_after_s: int):
+        self.workers = workers
+        self.fila_max = fila_max
+        self.retry_after_s = retry_after_s
+        self._executor = None
+        self._lock = threading.Lock()
+        self.em_andamento = 0
+        self.concluidas = 0
+        self.recusadas = 0
+        self.latencia_total_s = 0.0
+        self.latencia_max_s = 0.0
+
+    def executar(self, funcao, *args):
+        """Executa no pool e espera o resultado (endpoints síncronos)"""
+        self._admitir()
+        inicio = time.perf_counter()
+        try:
+            if not self.workers:
+                return funcao(*args)
+            return self._obter_executor().submit(funcao, *args).result()
+        finally:
+            self._liberar(inicio)
+
+    async def executar_async(self, funcao, *args):
+        """Executa no pool sem bloquear o event loop (endpoints assíncronos)"""
+        self._admitir()
+        inicio = time.perf_counter()
+        try:
+            if not self.workers:
+                return await asyncio.to_thread(funcao, *args)
+            return await asyncio.wrap_future(self._obter_executor().submit(funcao, *args))
+        finally:
+            self._liberar(inicio)
+
+    def encerrar(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "fila_max": self.fila_max,
+                "em_andamento": self.em_andamento,
+                "concluidas": self.concluidas,
+                "recusadas": self.recusadas,
+                "latencia_media_ms": round(self.latencia_total_s / self.concluidas * 1000, 1) if self.concluidas else 0.0,
+                "latencia_max_ms": round(self.latencia_max_s * 1000, 1),
+            }
+
+    def _admitir(self):
+        with self._lock:
+            if self.em_andamento >= self.fila_max:
+                self.recusadas += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Muitas requisições de autenticação em andamento, tente novamente em instantes",
+                    headers={"Retry-After": str(self.retry_after_s)},
+                )
+            self.em_andamento += 1
+
+    def _liberar(self, inicio: float):
+        latencia = time.perf_counter() - inicio
+        with self._lock:
+            self.em_andamento -= 1
+            self.concluidas += 1
+            self.latencia_total_s += latencia
+            self.latencia_max_s = max(self.latencia_max_s, latencia)
+
+    def _obter_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: o servidor já tem threads rodando, e fork copiaria locks em uso
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+pool_senhas = PoolSenhas(SENHA_WORKERS, SENHA_FILA_MAX, SENHA_RETRY_AFTER_S)
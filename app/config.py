@@ -0,0 +1,10 @@
+"""
+Carregamento único do ambiente.
+
+O .env é lido uma vez, ao importar o pacote `app` (ver app/__init__.py), antes
+de qualquer módulo ler suas variáveis com os.getenv na importação. Variáveis
+já definidas no ambiente têm precedência sobre o arquivo.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
@@ -1,15 +1,37 @@
-from app.crud.user import obter_usuario_por_email, criar_usuario, autenticar_usuario
-from app.crud.space import obter_espacos, obter_espaco_por_id, criar_espaco, atualizar_disponibilidade_espaco
+from app.crud.user import (
+    obter_usuario_por_email, obter_usuario_por_id, criar_usuario, autenticar_usuario,
+    atualizar_usuario, desativar_usuario
+)
+from app.crud.space import (
+    obter_espacos, obter_espacos_serializados, obter_espaco_por_id, obter_espaco_serializado,
+    criar_espaco, atualizar_disponibilidade_espaco
+)
 from app.crud.booking import (
-    verificar_disponibilidade, calcular_preco_reserva, criar_reserva,
-    obter_reservas_usuario, obter_reserva_por_id, cancelar_reserva,
-    confirmar_reserva, obter_reservas_por_espaco
+    verificar_disponibilidade, calcular_preco_reserva, criar_reserva, criar_reserva_idempotente, criar_reservas_lote,
+    obter_reservas_usuario, obter_reservas_usuario_serializadas, obter_reserva_por_id, cancelar_reserva,
+    confirmar_reserva, obter_reservas_por_espaco, buscar_janelas_livres
+)
+from app.crud.recurring_booking import (
+    criar_reserva_recorrente, materializar_recorrencias, obter_reserva_recorrente,
+    listar_ocorrencias, cancelar_reserva_recorrente
 )
+from app.crud.booking_lifecycle import aplicar_transicoes
+from app.crud.booking_archive import arquivar_reservas
+from app.crud.idempotency import varrer_chaves_expiradas
+from app.crud.space_pricing import obter_regras_preco, substituir_regras_preco, tabelas_precos, cotar
+from app.crud.space_occupancy import marcar_ocupacao, recalcular_ocupacao, reconstruir_ocupacao, obter_calendarios
 
 __all__ = [
-    "obter_usuario_por_email", "criar_usuario", "autenticar_usuario",
-    "obter_espacos", "obter_espaco_por_id", "criar_espaco", "atualizar_disponibilidade_espaco",
-    "verificar_disponibilidade", "calcular_preco_reserva", "criar_reserva",
-    "obter_reservas_usuario", "obter_reserva_por_id", "cancelar_reserva",
-    "confirmar_reserva", "obter_reservas_por_espaco"
+    "obter_usuario_por_email", "obter_usuario_por_id", "criar_usuario", "autenticar_usuario",
+    "atualizar_usuario", "desativar_usuario",
+    "obter_espacos", "obter_espacos_serializados", "obter_espaco_por_id", "obter_espaco_serializado",
+    "criar_espaco", "atualizar_disponibilidade_espaco",
+    "verificar_disponibilidade", "calcular_preco_reserva", "criar_reserva", "criar_reserva_idempotente", "criar_reservas_lote",
+    "obter_reservas_usuario", "obter_reservas_usuario_serializadas", "obter_reserva_por_id", "cancelar_reserva",
+    "confirmar_reserva", "obter_reservas_por_espaco", "buscar_janelas_livres",
+    "criar_reserva_recorrente", "materializar_recorrencias", "obter_reserva_recorrente",
+    "listar_ocorrencias", "cancelar_reserva_recorrente",
+    "aplicar_transicoes", "arquivar_reservas", "varrer_chaves_expiradas",
+    "obter_regras_preco", "substituir_regras_preco", "tabelas_precos", "cotar",
+    "marcar_ocupacao", "recalcular_ocupacao", "reconstruir_ocupacao", "obter_calendarios"
 ]
\ No newline at end of file
@@ -1,46 +1,86 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from collections import defaultdict
+from itertools import groupby
+from typing import List
+from sqlalchemy import select, exists, insert, tuple_, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, selectinload
 from app.models.booking import Booking, BookingStatus
-from app.schemas.booking import ReservaCriar
-from datetime import datetime
+from app.models.booking_archive import BookingArchive
+from app.models.space import Space
+from app.schemas.booking import ReservaCriar, ReservaResposta
+from datetime import datetime, timedelta
 from fastapi import HTTPException
-from app.crud.space import obter_espaco_por_id  # ✅ IMPORTANTE: Importar esta função
+from app.crud.space import obter_espaco_por_id, consulta_espacos  # ✅ IMPORTANTE: Importar esta função
+from app.services.disponibilidade import motor_disponibilidade
+from app.services.tempo_real import broker_eventos
+from app.services.janelas import primeiras_janelas
+from app.services.serializacao import CAMPOS_RESERVA, INCLUSOES_RESERVA, colunas, como_dicts, para_json, reserva_com_inclusoes
+from app.crud.space_occupancy import marcar_ocupacao, recalcular_ocupacao
+from app.crud.space_pricing import tabela_precos, tabelas_precos
+from app.crud.idempotency import idempotencia
+from app.services.precos import preco_intervalo
 
 def verificar_disponibilidade(db: Session, espaco_id: int, inicio: datetime, fim: datetime, reserva_id: int = None):
     """
     Verifica se o espaço está disponível no horário solicitado.
-    Lógica complexa que considera sobreposição de horários.
+    Com o motor de disponibilidade ligado, responde pela memória sem consultar o banco.
     """
-    # Query para encontrar reservas conflitantes
-    query = db.query(Booking).filter(
+    # Um intervalo vazio ou invertido não se sobrepõe a nada: seria sempre "disponível"
+    if inicio >= fim:
+        raise HTTPException(status_code=400, detail="Horário de início deve ser antes do horário de fim")
+    
+    if motor_disponibilidade.ativo and not reserva_id:
+        disponivel = motor_disponibilidade.esta_disponivel(db, espaco_id, inicio, fim)
+        if disponivel is not None:
+            if motor_disponibilidade.deve_conferir():
+                motor_disponibilidade.registrar_conferencia(
+                    espaco_id, inicio, fim, disponivel,
+                    _consultar_disponibilidade(db, espaco_id, inicio, fim)
+                )
+            return disponivel
+    
+    return _consultar_disponibilidade(db, espaco_id, inicio, fim, reserva_id)
+
+def _consultar_disponibilidade(db: Session, espaco_id: int, inicio: datetime, fim: datetime, reserva_id: int = None):
+    """
+    Verifica a disponibilidade direto no banco.
+    Dois intervalos se sobrepõem se, e somente se, um começa antes do fim do outro
+    e termina depois do início dele.
+    """
+    # Reservas ativas que se sobrepõem ao intervalo [inicio, fim)
+    conflito = select(Booking.id).where(
         Booking.space_id == espaco_id,
         Booking.status.in_([BookingStatus.PENDENTE, BookingStatus.CONFIRMADA]),
-        or_(
-            # Caso 1: Nova reserva começa durante uma reserva existente
-            and_(Booking.start_time <= inicio, Booking.end_time > inicio),
-            # Caso 2: Nova reserva termina durante uma reserva existente
-            and_(Booking.start_time < fim, Booking.end_time >= fim),
-            # Caso 3: Nova reserva engloba uma reserva existente
-            and_(Booking.start_time >= inicio, Booking.end_time <= fim),
-            # Caso 4: Reserva existente engloba a nova reserva
-            and_(Booking.start_time <= inicio, Booking.end_time >= fim)
-        )
+        Booking.start_time < fim,
+        Booking.end_time > inicio
     )
     
     # Se estiver atualizando uma reserva, exclui ela mesma da verificação
     if reserva_id:
-        query = query.filter(Booking.id != reserva_id)
+        conflito = conflito.where(Booking.id != reserva_id)
     
-    reservas_conflitantes = query.count()
-    return reservas_conflitantes == 0
+    # EXISTS para o banco parar no primeiro conflito encontrado
+    existe_conflito = db.scalar(select(exists(conflito)))
+    return not existe_conflito
 
-def calcular_preco_reserva(espaco, inicio: datetime, fim: datetime):
-    """Calcula o preço total baseado na duração e preço por hora"""
-    duracao_horas = (fim - inicio).total_seconds() / 3600
-    return espaco.preco_por_hora * duracao_horas
+def calcular_preco_reserva(espaco, inicio: datetime, fim: datetime, tabela=None):
+    """
+    Calcula o preço total: pela tabela de preços do espaço (regras de faixa e
+    duração, ver crud/space_pricing.py) ou, sem regras, preço por hora × duração
+    """
+    return preco_intervalo(espaco.price_per_hour, inicio, fim, tabela)
 
 def criar_reserva(db: Session, reserva: ReservaCriar, usuario_id: int):
     """Cria uma nova reserva com todas as validações de negócio"""
+    db_reserva = _inserir_reserva(db, reserva, usuario_id)
+    db.commit()
+    db.refresh(db_reserva)
+    _reserva_criada(db_reserva)
+    return db_reserva
+
+def _inserir_reserva(db: Session, reserva: ReservaCriar, usuario_id: int):
+    """Valida e insere a reserva (flush, sem commit: a transação fica com o chamador)"""
     espaco = obter_espaco_por_id(db, reserva.space_id)
     
     if not espaco:
@@ -56,33 +96,382 @@ def criar_reserva(db: Session, reserva: ReservaCriar, usuario_id: int):
     if reserva.start_time < datetime.now():
         raise HTTPException(status_code=400, detail="Não é possível fazer reservas no passado")
     
-    # Verifica disponibilidade
-    if not verificar_disponibilidade(db, reserva.space_id, reserva.start_time, reserva.end_time):
-        raise HTTPException(status_code=400, detail="Espaço não disponível no horário selecionado")
+    # Com o motor ligado, conflitos óbvios são recusados sem tocar no banco
+    if motor_disponibilidade.ativo and not verificar_disponibilidade(db, reserva.space_id, reserva.start_time, reserva.end_time):
+        raise HTTPException(status_code=409, detail="Espaço não disponível no horário selecionado")
     
     # Calcula preço
-    preco_total = calcular_preco_reserva(espaco, reserva.start_time, reserva.end_time)
-    
-    # Cria a reserva
-    db_reserva = Booking(
-        **reserva.dict(),
-        user_id=usuario_id,
-        total_price=preco_total,
-        status=BookingStatus.PENDENTE
-    )
+    preco_total = calcular_preco_reserva(espaco, reserva.start_time, reserva.end_time, tabela_precos(db, espaco))
     
-    db.add(db_reserva)
-    db.commit()
-    db.refresh(db_reserva)
+    # Verificação e inserção acontecem com o espaço bloqueado, para que duas
+    # requisições concorrentes não passem ambas pela verificação
+    try:
+        bloquear_espaco(db, reserva.space_id)
+        
+        if not _consultar_disponibilidade(db, reserva.space_id, reserva.start_time, reserva.end_time):
+            raise HTTPException(status_code=409, detail="Espaço não disponível no horário selecionado")
+        
+        # Cria a reserva
+        db_reserva = Booking(
+            **reserva.dict(),
+            user_id=usuario_id,
+            total_price=preco_total,
+            status=BookingStatus.PENDENTE
+        )
+        
+        db.add(db_reserva)
+        marcar_ocupacao(db, [(reserva.space_id, reserva.start_time, reserva.end_time, BookingStatus.PENDENTE)])
+        db.flush()
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError as erro:
+        db.rollback()
+        if eh_conflito_de_horario(erro):
+            raise HTTPException(status_code=409, detail="Espaço não disponível no horário selecionado")
+        raise
     return db_reserva
 
-def obter_reservas_usuario(db: Session, usuario_id: int):
-    """Obtém todas as reservas de um usuário"""
-    return db.query(Booking).filter(Booking.user_id == usuario_id).order_by(Booking.start_time.desc()).all()
+def _reserva_criada(db_reserva: Booking):
+    """Efeitos de uma reserva já gravada: motor de disponibilidade e evento"""
+    motor_disponibilidade.sincronizar(db_reserva)
+    broker_eventos.publicar_reserva(db_reserva)
+
+def criar_reserva_idempotente(db: Session, reserva: ReservaCriar, usuario_id: int, chave: str):
+    """
+    `criar_reserva` com Idempotency-Key: (status, corpo JSON, repetida). Repetições
+    com a mesma chave recebem a resposta gravada, sem passar pelas validações.
+    A reserva e a resposta gravada entram no mesmo commit.
+    """
+    criadas = []
+
+    def executar():
+        criada = _inserir_reserva(db, reserva, usuario_id)
+        db.refresh(criada)
+        criadas.append(criada)
+        return 200, para_json(ReservaResposta.model_validate(criada).model_dump(mode="json"))
+
+    resultado = idempotencia.executar(db, f"{usuario_id}:POST /reservas/", chave, reserva.model_dump(mode="json"), executar)
+    if criadas:
+        _reserva_criada(criadas[0])
+    return resultado
+
+def criar_reservas_lote(db: Session, reservas: List[ReservaCriar], usuario_id: int, modo: str = "tudo_ou_nada"):
+    """
+    Cria várias reservas em uma única transação.
+    
+    Os itens são validados, ordenados por início dentro de cada espaço e varridos
+    em memória (conflitos dentro do próprio lote); depois cada espaço é conferido
+    contra as reservas existentes com uma única consulta, e os aprovados entram
+    com um só INSERT em lote. Retorna um resultado por item, na ordem recebida.
+    
+    No modo "tudo_ou_nada", qualquer item recusado desfaz o lote (HTTP 4xx com os
+    resultados no detail); no "melhor_esforco", grava os itens válidos.
+    """
+    resultados = [None] * len(reservas)
+    
+    def recusar(indice: int, status_code: int, erro: str):
+        resultados[indice] = {"indice": indice, "status_code": status_code, "erro": erro}
+    
+    espacos = {
+        espaco.id: espaco
+        for espaco in db.scalars(select(Space).where(Space.id.in_({r.space_id for r in reservas})))
+    }
+    tabelas = tabelas_precos(db, espacos.values())
+    agora = datetime.now()
+    
+    # Validações de negócio, item a item
+    por_espaco = defaultdict(list)
+    for indice, reserva in enumerate(reservas):
+        espaco = espacos.get(reserva.space_id)
+        if not espaco:
+            recusar(indice, 404, "Espaço não encontrado")
+        elif not espaco.is_available:
+            recusar(indice, 400, "Espaço não está disponível para reservas")
+        elif reserva.start_time >= reserva.end_time:
+            recusar(indice, 400, "Horário de início deve ser antes do horário de fim")
+        elif reserva.start_time < agora:
+            recusar(indice, 400, "Não é possível fazer reservas no passado")
+        else:
+            por_espaco[reserva.space_id].append(indice)
+    
+    # Conflitos dentro do lote: ordenados por início, cada item precisa começar
+    # depois do fim do último aceito no mesmo espaço
+    for espaco_id, indices in por_espaco.items():
+        indices.sort(key=lambda i: (reservas[i].start_time, reservas[i].end_time))
+        aceitos = []
+        for indice in indices:
+            if aceitos and reservas[indice].start_time < reservas[aceitos[-1]].end_time:
+                recusar(indice, 409, f"Conflita com o item {aceitos[-1]} do lote")
+            else:
+                aceitos.append(indice)
+        por_espaco[espaco_id] = aceitos
+    
+    if modo == "tudo_ou_nada" and any(resultados):
+        _recusar_lote(resultados)
+    
+    try:
+        # Bloqueios sempre na mesma ordem, para dois lotes não se travarem
+        for espaco_id in sorted(por_espaco):
+            bloquear_espaco(db, espaco_id)
+        
+        for espaco_id, indices in por_espaco.items():
+            livres = sem_conflito_existente(db, espaco_id, [reservas[i] for i in indices])
+            for indice, livre in zip(indices, livres):
+                if not livre:
+                    recusar(indice, 409, "Espaço não disponível no horário selecionado")
+        
+        if modo == "tudo_ou_nada" and any(resultados):
+            db.rollback()
+            _recusar_lote(resultados)
+        
+        aprovados = [indice for indice, resultado in enumerate(resultados) if resultado is None]
+        linhas = []
+        if aprovados:
+            linhas = db.execute(
+                insert(Booking).returning(
+                    Booking.id, Booking.space_id, Booking.user_id, Booking.start_time,
+                    Booking.end_time, Booking.status, Booking.total_price, Booking.created_at,
+                    sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        **reservas[indice].dict(),
+                        "user_id": usuario_id,
+                        "total_price": calcular_preco_reserva(
+                            espacos[reservas[indice].space_id],
+                            reservas[indice].start_time,
+                            reservas[indice].end_time,
+                            tabelas.get(reservas[indice].space_id)
+                        ),
+                        "status": BookingStatus.PENDENTE,
+                    }
+                    for indice in aprovados
+                ]
+            ).all()
+            marcar_ocupacao(db, (
+                (linha.space_id, linha.start_time, linha.end_time, linha.status) for linha in linhas
+            ))
+        db.commit()
+    except IntegrityError as erro:
+        db.rollback()
+        if eh_conflito_de_horario(erro):
+            raise HTTPException(status_code=409, detail="Espaço não disponível no horário selecionado")
+        raise
+    
+    for indice, linha in zip(aprovados, linhas):
+        resultados[indice] = {"indice": indice, "status_code": 201, "reserva": linha._asdict()}
+        motor_disponibilidade.sincronizar(linha)
+        broker_eventos.publicar_reserva(linha)
+    
+    return {
+        "criadas": len(linhas),
+        "recusadas": len(reservas) - len(linhas),
+        "resultados": resultados
+    }
+
+def _recusar_lote(resultados: list):
+    """Recusa o lote inteiro (modo tudo_ou_nada), marcando os itens que seriam aceitos"""
+    recusados = [r for r in resultados if r is not None]
+    for indice, resultado in enumerate(resultados):
+        if resultado is None:
+            resultados[indice] = {"indice": indice, "status_code": 424, "erro": "Não criada: o lote foi recusado"}
+    raise HTTPException(
+        status_code=max(r["status_code"] for r in recusados),
+        detail={
+            "mensagem": "Lote recusado: nenhuma reserva foi criada",
+            "criadas": 0,
+            "recusadas": len(resultados),
+            "resultados": resultados
+        }
+    )
+
+def sem_conflito_existente(db: Session, espaco_id: int, candidatas: list) -> list:
+    """
+    Confere reservas candidatas (ordenadas e sem sobreposição entre si) contra as
+    reservas ativas do espaço com uma única consulta. As duas listas, ordenadas por
+    início, são varridas juntas: uma candidata conflita se alguma reserva existente
+    que começa antes do fim dela termina depois do início dela.
+    """
+    if not candidatas:
+        return []
+    existentes = db.execute(
+        select(Booking.start_time, Booking.end_time).where(
+            Booking.space_id == espaco_id,
+            Booking.status.in_([BookingStatus.PENDENTE, BookingStatus.CONFIRMADA]),
+            Booking.start_time < candidatas[-1].end_time,
+            Booking.end_time > candidatas[0].start_time
+        ).order_by(Booking.start_time)
+    ).all()
+    
+    livres = []
+    posicao, maior_fim = 0, None
+    for candidata in candidatas:
+        while posicao < len(existentes) and existentes[posicao].start_time < candidata.end_time:
+            fim = existentes[posicao].end_time
+            if maior_fim is None or fim > maior_fim:
+                maior_fim = fim
+            posicao += 1
+        livres.append(maior_fim is None or maior_fim <= candidata.start_time)
+    return livres
+
+def bloquear_espaco(db: Session, espaco_id: int):
+    """
+    Serializa as escritas de reservas de um espaço até o fim da transação.
+    
+    - PostgreSQL: SELECT ... FOR UPDATE na linha do espaço (bloqueio por espaço;
+      a constraint de exclusão da migração 0003 é a última barreira)
+    - SQLite: BEGIN IMMEDIATE, que reserva a escrita do banco inteiro; é o menor
+      grão que o SQLite oferece, e a transação dura apenas verificação + inserção
+    """
+    conexao = db.connection()
+    dialeto = conexao.dialect.name
+    if dialeto == "sqlite":
+        conexao_driver = conexao.connection.driver_connection
+        if not conexao_driver.in_transaction:
+            conexao.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        db.execute(select(Space.id).where(Space.id == espaco_id).with_for_update())
+
+def eh_conflito_de_horario(erro: IntegrityError) -> bool:
+    """Identifica violação da constraint de exclusão de horários (PostgreSQL)"""
+    codigo = getattr(erro.orig, "pgcode", None) or getattr(erro.orig, "sqlstate", None)
+    return codigo == "23P01"
+
+# Período máximo de uma busca de janelas livres
+BUSCA_MAX_DIAS = 92
+
+def validar_busca_janelas(inicio: datetime, fim: datetime, duracao_minutos: int) -> datetime:
+    """Valida o período da busca e devolve o início efetivo (nunca no passado)"""
+    if inicio >= fim:
+        raise HTTPException(status_code=400, detail="Horário de início deve ser antes do horário de fim")
+    if fim - inicio > timedelta(days=BUSCA_MAX_DIAS):
+        raise HTTPException(status_code=400, detail=f"O período da busca deve ter no máximo {BUSCA_MAX_DIAS} dias")
+    if timedelta(minutes=duracao_minutos) > fim - inicio:
+        raise HTTPException(status_code=400, detail="Duração maior que o período da busca")
+    return max(inicio, datetime.now().replace(microsecond=0))
+
+def consulta_ocupacao(consulta_espacos, inicio: datetime, fim: datetime):
+    """Reservas ativas dos espaços da consulta que tocam [inicio, fim), por espaço e início"""
+    return select(Booking.space_id, Booking.start_time, Booking.end_time).where(
+        Booking.space_id.in_(consulta_espacos.with_only_columns(Space.id)),
+        Booking.status.in_([BookingStatus.PENDENTE, BookingStatus.CONFIRMADA]),
+        Booking.start_time < fim,
+        Booking.end_time > inicio
+    ).order_by(Booking.space_id, Booking.start_time)
+
+def agrupar_ocupacao(linhas) -> dict:
+    return {
+        espaco_id: [(linha.start_time, linha.end_time) for linha in grupo]
+        for espaco_id, grupo in groupby(linhas, key=lambda linha: linha.space_id)
+    }
+
+def buscar_janelas_livres(
+    db: Session,
+    inicio: datetime,
+    fim: datetime,
+    duracao_minutos: int,
+    capacidade_min: int = None,
+    preco_max: float = None,
+    horario_comercial: bool = False,
+    limite: int = 10
+):
+    """
+    Primeiras janelas livres entre os espaços disponíveis que atendem aos filtros.
+    Três consultas: os espaços, as reservas de todos eles no período e as regras de preço.
+    """
+    inicio = validar_busca_janelas(inicio, fim, duracao_minutos)
+    consulta = consulta_espacos(limit=None, capacidade_min=capacidade_min, preco_max=preco_max)
+    espacos = db.scalars(consulta).all()
+    ocupados = agrupar_ocupacao(db.execute(consulta_ocupacao(consulta, inicio, fim)))
+    return primeiras_janelas(
+        espacos, ocupados, inicio, fim, timedelta(minutes=duracao_minutos), limite, horario_comercial,
+        tabelas_precos(db, espacos)
+    )
+
+def _filtros_reservas_usuario(tabela, usuario_id: int, apos: tuple, status, inicio, fim) -> list:
+    condicoes = [tabela.user_id == usuario_id]
+    if apos is not None:
+        condicoes.append(tuple_(tabela.start_time, tabela.id) < tuple_(*apos))
+    if status is not None:
+        condicoes.append(tabela.status == status)
+    if inicio is not None:
+        condicoes.append(tabela.start_time >= inicio)
+    if fim is not None:
+        condicoes.append(tabela.start_time < fim)
+    return condicoes
+
+def consulta_reservas_usuario(
+    usuario_id: int,
+    limit: int = 100,
+    apos: tuple = None,
+    status: BookingStatus = None,
+    inicio: datetime = None,
+    fim: datetime = None,
+    historico: bool = False,
+    inclusoes=(),
+    campos: dict = None
+):
+    """
+    Reservas de um usuário da mais recente para a mais antiga, em ordem de
+    (start_time, id), continuando depois da chave `apos` (paginação keyset).
+    Com `historico`, inclui as reservas arquivadas (UNION ALL com os filtros
+    aplicados em cada tabela). Com `campos`, seleciona só essas colunas.
+    """
+    filtros = (usuario_id, apos, status, inicio, fim)
+    if historico:
+        nomes = [coluna.name for coluna in Booking.__table__.columns]
+        uniao = union_all(
+            select(*(Booking.__table__.c[nome] for nome in nomes))
+            .where(*_filtros_reservas_usuario(Booking, *filtros)),
+            select(*(BookingArchive.__table__.c[nome] for nome in nomes))
+            .where(*_filtros_reservas_usuario(BookingArchive, *filtros))
+        ).subquery("reservas_com_historico")
+        reserva = aliased(Booking, uniao)
+        consulta = select(reserva)
+    else:
+        reserva = Booking
+        consulta = select(Booking).where(*_filtros_reservas_usuario(Booking, *filtros))
+    if campos is not None:
+        consulta = consulta.with_only_columns(*colunas(campos, reserva))
+    consulta = consulta.options(*opcoes_inclusao(inclusoes, reserva))
+    return consulta.order_by(reserva.start_time.desc(), reserva.id.desc()).limit(limit)
+
+def interpretar_inclusoes(include: str = None) -> tuple:
+    """Relacionamentos pedidos em `include` ("space,user"), sem repetição e em ordem"""
+    if not include:
+        return ()
+    inclusoes = tuple(sorted({nome.strip() for nome in include.split(",") if nome.strip()}))
+    invalidas = [nome for nome in inclusoes if nome not in INCLUSOES_RESERVA]
+    if invalidas:
+        raise HTTPException(
+            status_code=400,
+            detail=f"include inválido: {', '.join(invalidas)} (use {', '.join(INCLUSOES_RESERVA)})"
+        )
+    return inclusoes
+
+def opcoes_inclusao(inclusoes=(), reserva=Booking) -> list:
+    """Carrega cada relacionamento pedido com uma consulta IN para todas as reservas"""
+    return [selectinload(getattr(reserva, nome)) for nome in inclusoes]
+
+def obter_reservas_usuario(db: Session, usuario_id: int, limit: int = 100, apos: tuple = None, inclusoes=(), **filtros):
+    """Obtém uma página das reservas de um usuário"""
+    return db.scalars(consulta_reservas_usuario(usuario_id, limit, apos, inclusoes=inclusoes, **filtros)).all()
+
+def obter_reservas_usuario_serializadas(db: Session, usuario_id: int, limit: int = 100, apos: tuple = None, inclusoes=(), **filtros) -> list:
+    """
+    Como `obter_reservas_usuario`, mas já como dicts no formato de ReservaResposta.
+    Sem inclusões, lê só as colunas da resposta (sem ORM); com elas, uma consulta
+    a mais por relacionamento pedido.
+    """
+    if inclusoes:
+        reservas = obter_reservas_usuario(db, usuario_id, limit, apos, inclusoes, **filtros)
+        return [reserva_com_inclusoes(reserva, inclusoes) for reserva in reservas]
+    return como_dicts(db.execute(consulta_reservas_usuario(usuario_id, limit, apos, campos=CAMPOS_RESERVA, **filtros)))
 
-def obter_reserva_por_id(db: Session, reserva_id: int):
+def obter_reserva_por_id(db: Session, reserva_id: int, inclusoes=()):
     """Obtém uma reserva específica"""
-    return db.query(Booking).filter(Booking.id == reserva_id).first()
+    return db.query(Booking).options(*opcoes_inclusao(inclusoes)).filter(Booking.id == reserva_id).first()
 
 def cancelar_reserva(db: Session, reserva_id: int, usuario_id: int):
     """Cancela uma reserva (apenas se for do usuário)"""
@@ -101,18 +490,26 @@ def cancelar_reserva(db: Session, reserva_id: int, usuario_id: int):
     if reserva.start_time < datetime.now():
         raise HTTPException(status_code=400, detail="Não é possível cancelar reservas que já começaram")
     
+    bloquear_espaco(db, reserva.space_id)
     reserva.status = BookingStatus.CANCELADA
+    recalcular_ocupacao(db, reserva.space_id, reserva.start_time, reserva.end_time)
     db.commit()
     db.refresh(reserva)
+    motor_disponibilidade.sincronizar(reserva)
+    broker_eventos.publicar_reserva(reserva)
     return reserva
 
 def confirmar_reserva(db: Session, reserva_id: int):
     """Confirma uma reserva (para admin)"""
     reserva = obter_reserva_por_id(db, reserva_id)
     if reserva:
+        bloquear_espaco(db, reserva.space_id)
         reserva.status = BookingStatus.CONFIRMADA
+        marcar_ocupacao(db, [(reserva.space_id, reserva.start_time, reserva.end_time, BookingStatus.CONFIRMADA)])
         db.commit()
         db.refresh(reserva)
+        motor_disponibilidade.sincronizar(reserva)
+        broker_eventos.publicar_reserva(reserva)
     return reserva
 
 def obter_reservas_por_espaco(db: Session, espaco_id: int, inicio: datetime, fim: datetime):
@@ -0,0 +1,76 @@
+"""
+Arquivo das reservas encerradas (concluídas e canceladas).
+
+Reservas nesses status que terminaram antes da janela de retenção saem de
+`bookings` para `bookings_archive`, em lotes: cada lote copia as linhas
+(INSERT ... SELECT) e as remove da tabela viva na mesma transação, então uma
+execução interrompida pode ser repetida e continua de onde parou. Status
+encerrados não mudam mais nem ocupam o espaço, então o arquivo não bloqueia
+espaços nem mexe no mapa de ocupação.
+
+Configuração (variáveis de ambiente):
+    ARQUIVO_RETENCAO_DIAS  dias após o fim que a reserva encerrada fica na tabela viva
+    ARQUIVO_LOTE           reservas movidas por lote (por transação)
+    ARQUIVO_MAX_LOTES      lotes por execução (0 = até acabar)
+"""
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatus
+from app.models.booking_archive import BookingArchive
+
+ARQUIVO_RETENCAO_DIAS = int(os.getenv("ARQUIVO_RETENCAO_DIAS", "365"))
+ARQUIVO_LOTE = int(os.getenv("ARQUIVO_LOTE", "1000"))
+ARQUIVO_MAX_LOTES = int(os.getenv("ARQUIVO_MAX_LOTES", "0"))
+
+STATUS_ENCERRADOS = [BookingStatus.CONCLUIDA, BookingStatus.CANCELADA]
+
+# Colunas copiadas: todas as de `bookings` (archived_at fica com o padrão do banco)
+COLUNAS_ARQUIVADAS = [coluna.name for coluna in Booking.__table__.columns]
+
+def arquivar_lote(db: Session, antes: datetime, lote: int = ARQUIVO_LOTE) -> int:
+    """Move até `lote` reservas encerradas que terminaram antes de `antes`; retorna quantas"""
+    ids = db.scalars(
+        select(Booking.id)
+        .where(Booking.status.in_(STATUS_ENCERRADOS), Booking.end_time < antes)
+        .limit(lote)
+    ).all()
+    if not ids:
+        db.rollback()
+        return 0
+
+    db.execute(
+        insert(BookingArchive).from_select(
+            COLUNAS_ARQUIVADAS,
+            select(*(Booking.__table__.c[nome] for nome in COLUNAS_ARQUIVADAS)).where(Booking.id.in_(ids))
+        )
+    )
+    db.execute(delete(Booking).where(Booking.id.in_(ids)).execution_options(synchronize_session=False))
+    db.commit()
+    return len(ids)
+
+def arquivar_reservas(
+    db: Session,
+    retencao_dias: int = ARQUIVO_RETENCAO_DIAS,
+    lote: int = ARQUIVO_LOTE,
+    max_lotes: int = ARQUIVO_MAX_LOTES
+) -> dict:
+    """Arquiva as reservas encerradas fora da retenção, em lotes"""
+    antes = datetime.now() - timedelta(days=retencao_dias)
+    arquivadas = lotes = 0
+    restam = False
+    while True:
+        if max_lotes and lotes >= max_lotes:
+            restam = True
+            break
+        movidas = arquivar_lote(db, antes, lote)
+        if not movidas:
+            break
+        arquivadas += movidas
+        lotes += 1
+        if movidas < lote:
+            break
+    return {"arquivadas": arquivadas, "lotes": lotes, "restam": restam, "antes": antes.isoformat()}
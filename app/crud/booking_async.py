@@ -0,0 +1,80 @@
+"""
+Versões assíncronas (AsyncSession) das operações de reserva.
+Leituras usam o driver assíncrono diretamente; escritas e a verificação de
+disponibilidade executam a implementação síncrona via run_sync, para que
+bloqueios, motor de disponibilidade e validações continuem em um só lugar.
+"""
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.booking import Booking, BookingStatus
+from app.schemas.booking import ReservaCriar
+from app.crud import booking
+from app.crud.space import consulta_espacos
+from app.crud.space_pricing_async import tabelas_precos
+from app.services.janelas import primeiras_janelas
+from app.services.serializacao import CAMPOS_RESERVA, como_dicts, reserva_com_inclusoes
+from app.crud.booking import calcular_preco_reserva, interpretar_inclusoes  # noqa: F401 - funções puras, sem I/O
+
+async def verificar_disponibilidade(db: AsyncSession, espaco_id: int, inicio: datetime, fim: datetime, reserva_id: int = None):
+    return await db.run_sync(booking.verificar_disponibilidade, espaco_id, inicio, fim, reserva_id)
+
+async def criar_reserva(db: AsyncSession, reserva: ReservaCriar, usuario_id: int):
+    return await db.run_sync(booking.criar_reserva, reserva, usuario_id)
+
+async def criar_reserva_idempotente(db: AsyncSession, reserva: ReservaCriar, usuario_id: int, chave: str):
+    return await db.run_sync(booking.criar_reserva_idempotente, reserva, usuario_id, chave)
+
+async def criar_reservas_lote(db: AsyncSession, reservas: List[ReservaCriar], usuario_id: int, modo: str = "tudo_ou_nada"):
+    return await db.run_sync(booking.criar_reservas_lote, reservas, usuario_id, modo)
+
+async def buscar_janelas_livres(
+    db: AsyncSession,
+    inicio: datetime,
+    fim: datetime,
+    duracao_minutos: int,
+    capacidade_min: int = None,
+    preco_max: float = None,
+    horario_comercial: bool = False,
+    limite: int = 10
+):
+    inicio = booking.validar_busca_janelas(inicio, fim, duracao_minutos)
+    consulta = consulta_espacos(limit=None, capacidade_min=capacidade_min, preco_max=preco_max)
+    espacos = (await db.scalars(consulta)).all()
+    ocupados = booking.agrupar_ocupacao(await db.execute(booking.consulta_ocupacao(consulta, inicio, fim)))
+    return primeiras_janelas(
+        espacos, ocupados, inicio, fim, timedelta(minutes=duracao_minutos), limite, horario_comercial,
+        await tabelas_precos(db, espacos)
+    )
+
+async def obter_reservas_usuario(db: AsyncSession, usuario_id: int, limit: int = 100, apos: tuple = None, inclusoes=(), **filtros):
+    consulta = booking.consulta_reservas_usuario(usuario_id, limit, apos, inclusoes=inclusoes, **filtros)
+    return (await db.scalars(consulta)).all()
+
+async def obter_reservas_usuario_serializadas(db: AsyncSession, usuario_id: int, limit: int = 100, apos: tuple = None, inclusoes=(), **filtros) -> list:
+    if inclusoes:
+        reservas = await obter_reservas_usuario(db, usuario_id, limit, apos, inclusoes, **filtros)
+        return [reserva_com_inclusoes(reserva, inclusoes) for reserva in reservas]
+    consulta = booking.consulta_reservas_usuario(usuario_id, limit, apos, campos=CAMPOS_RESERVA, **filtros)
+    return como_dicts(await db.execute(consulta))
+
+async def obter_reserva_por_id(db: AsyncSession, reserva_id: int, inclusoes=()):
+    return await db.get(Booking, reserva_id, options=booking.opcoes_inclusao(inclusoes))
+
+async def cancelar_reserva(db: AsyncSession, reserva_id: int, usuario_id: int):
+    return await db.run_sync(booking.cancelar_reserva, reserva_id, usuario_id)
+
+async def confirmar_reserva(db: AsyncSession, reserva_id: int):
+    return await db.run_sync(booking.confirmar_reserva, reserva_id)
+
+async def obter_reservas_por_espaco(db: AsyncSession, espaco_id: int, inicio: datetime, fim: datetime):
+    resultado = await db.scalars(
+        select(Booking).where(
+            Booking.space_id == espaco_id,
+            Booking.start_time >= inicio,
+            Booking.end_time <= fim,
+            Booking.status.in_([BookingStatus.PENDENTE, BookingStatus.CONFIRMADA])
+        )
+    )
+    return resultado.all()
@@ -0,0 +1,127 @@
+"""
+Transições automáticas do ciclo de vida das reservas.
+
+    PENDENTE   -> CANCELADA  pendentes criadas há mais de RESERVA_PENDENTE_TTL_MIN
+                             minutos (só com RESERVA_PENDENTE_TTL_MIN > 0)
+    PENDENTE   -> CANCELADA  pendentes que já terminaram sem confirmação
+    CONFIRMADA -> CONCLUIDA  confirmadas que já terminaram
+
+A API ainda não expõe a confirmação de reservas, então por padrão (TTL 0) uma
+pendente só sai do conjunto ativo quando termina: expirar pelo início ou pela
+criação cancelaria reservas que ainda vão acontecer. Com um fluxo de
+confirmação, ligue o TTL como prazo para confirmar.
+
+Cada transição roda em lotes: as reservas vencidas são encontradas pelos
+índices (status, created_at) / (status, end_time), os espaços do lote são
+bloqueados, um único UPDATE muda o status (conferindo que ainda é o de origem)
+e o mapa de ocupação é refeito nos dias afetados. Cada lote é uma transação
+curta, então os bloqueios nunca duram mais que um lote.
+
+Configuração (variáveis de ambiente):
+    CICLO_LOTE                reservas por lote (por transação)
+    CICLO_MAX_LOTES           lotes por transição em cada execução (o restante fica para a próxima)
+    RESERVA_PENDENTE_TTL_MIN  minutos para uma pendente expirar desde a criação (0 = nunca expiram)
+"""
+import os
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatus
+from app.crud.booking import bloquear_espaco
+from app.crud.space_occupancy import recalcular_ocupacao
+from app.services.disponibilidade import motor_disponibilidade
+from app.services.tempo_real import broker_eventos
+
+CICLO_LOTE = int(os.getenv("CICLO_LOTE", "500"))
+CICLO_MAX_LOTES = int(os.getenv("CICLO_MAX_LOTES", "20"))
+RESERVA_PENDENTE_TTL_MIN = int(os.getenv("RESERVA_PENDENTE_TTL_MIN", "0"))
+
+class Transicao(NamedTuple):
+    nome: str
+    origem: BookingStatus
+    destino: BookingStatus
+    # Coluna de tempo do índice (status, coluna): ordem em que as vencidas são processadas
+    coluna: object
+
+TRANSICOES = (
+    Transicao("pendentes_expiradas", BookingStatus.PENDENTE, BookingStatus.CANCELADA, Booking.created_at),
+    Transicao("pendentes_encerradas", BookingStatus.PENDENTE, BookingStatus.CANCELADA, Booking.end_time),
+    Transicao("concluidas", BookingStatus.CONFIRMADA, BookingStatus.CONCLUIDA, Booking.end_time),
+)
+
+def transicoes_ativas() -> tuple:
+    """Sem TTL, as pendentes não expiram pela criação (só ao terminar)"""
+    return tuple(
+        transicao for transicao in TRANSICOES
+        if transicao.coluna is not Booking.created_at or RESERVA_PENDENTE_TTL_MIN > 0
+    )
+
+def _vencidas(transicao: Transicao, agora: datetime):
+    if transicao.coluna is Booking.created_at:
+        # created_at é preenchido pelo banco (CURRENT_TIMESTAMP, em UTC)
+        return transicao.coluna <= datetime.utcnow() - timedelta(minutes=RESERVA_PENDENTE_TTL_MIN)
+    return transicao.coluna <= agora
+
+def aplicar_lote(db: Session, transicao: Transicao, agora: datetime, lote: int = CICLO_LOTE) -> tuple:
+    """
+    Aplica a transição em até `lote` reservas vencidas, em uma transação.
+    Retorna (candidatas, alteradas); menos candidatas que o lote significa que acabou.
+    """
+    candidatas = db.execute(
+        select(Booking.id, Booking.space_id)
+        .where(Booking.status == transicao.origem, _vencidas(transicao, agora))
+        .order_by(transicao.coluna)
+        .limit(lote)
+    ).all()
+    if not candidatas:
+        db.rollback()
+        return 0, 0
+
+    # Mesma ordem de bloqueio das outras escritas em vários espaços (sem deadlock)
+    for espaco_id in sorted({candidata.space_id for candidata in candidatas}):
+        bloquear_espaco(db, espaco_id)
+
+    # Reservas alteradas por outra transação desde a leitura ficam de fora
+    alteradas = db.execute(
+        update(Booking)
+        .where(Booking.id.in_([candidata.id for candidata in candidatas]), Booking.status == transicao.origem)
+        .values(status=transicao.destino)
+        .returning(Booking.space_id, Booking.start_time, Booking.end_time)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    periodos = {}
+    for espaco_id, inicio, fim in alteradas:
+        if espaco_id in periodos:
+            periodos[espaco_id] = (min(periodos[espaco_id][0], inicio), max(periodos[espaco_id][1], fim))
+        else:
+            periodos[espaco_id] = (inicio, fim)
+    for espaco_id, (inicio, fim) in periodos.items():
+        recalcular_ocupacao(db, espaco_id, inicio, fim)
+    db.commit()
+
+    for espaco_id in periodos:
+        motor_disponibilidade.invalidar(espaco_id)
+        broker_eventos.publicar_ressincronizacao(espaco_id)
+    return len(candidatas), len(alteradas)
+
+def aplicar_transicoes(db: Session, agora: datetime = None, lote: int = CICLO_LOTE, max_lotes: int = CICLO_MAX_LOTES) -> dict:
+    """Aplica todas as transições vencidas até `agora`, em lotes limitados"""
+    agora = agora or datetime.now()
+    resultado = {}
+    for transicao in transicoes_ativas():
+        alteradas = lotes = 0
+        pendente = False
+        while lotes < max_lotes:
+            candidatas, alteradas_lote = aplicar_lote(db, transicao, agora, lote)
+            lotes += 1 if candidatas else 0
+            alteradas += alteradas_lote
+            if candidatas < lote:
+                break
+        else:
+            pendente = True
+        resultado[transicao.nome] = {"alteradas": alteradas, "lotes": lotes, "restam": pendente}
+    return resultado
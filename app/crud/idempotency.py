@@ -0,0 +1,136 @@
+"""
+Armazém de Idempotency-Key no banco (tabela idempotency_keys) e varredura
+das chaves expiradas.
+
+Reservar uma chave é um INSERT: a restrição única (scope, key) decide, entre
+requisições concorrentes com a mesma chave, qual executa; as demais leem a
+linha existente. A retomada de uma chave expirada ou abandonada é um UPDATE
+condicionado ao created_at lido, então também só uma requisição a retoma.
+A resposta é gravada na mesma transação da escrita (um único commit), e
+tanto ela quanto a liberação só valem para a requisição dona da chave (o
+created_at que ela gravou). A varredura remove as expiradas em lotes pelo
+índice de expires_at.
+
+Configuração (variáveis de ambiente; demais em app/services/idempotencia.py):
+    IDEMPOTENCIA_LOTE       chaves expiradas removidas por lote (por transação)
+    IDEMPOTENCIA_MAX_LOTES  lotes por varredura (0 = até acabar)
+"""
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.idempotency_key import IdempotencyKey
+from app.services.idempotencia import (
+    IDEMPOTENCIA_BACKEND, IDEMPOTENCIA_MAX_ITENS, IDEMPOTENCIA_TTL_H,
+    ArmazemIdempotencia, ArmazemMemoria, Idempotencia, Registro, pode_substituir
+)
+
+IDEMPOTENCIA_LOTE = int(os.getenv("IDEMPOTENCIA_LOTE", "1000"))
+IDEMPOTENCIA_MAX_LOTES = int(os.getenv("IDEMPOTENCIA_MAX_LOTES", "0"))
+
+def _da_chave(escopo: str, chave: str) -> list:
+    return [IdempotencyKey.scope == escopo, IdempotencyKey.key == chave]
+
+class ArmazemBanco(ArmazemIdempotencia):
+    """Chaves na tabela idempotency_keys, visíveis a todos os workers"""
+
+    def reservar(self, db: Session, escopo, chave, request_hash, agora):
+        valores = {
+            "request_hash": request_hash,
+            "status_code": None,
+            "response": None,
+            "created_at": agora,
+            "expires_at": agora + timedelta(hours=IDEMPOTENCIA_TTL_H),
+        }
+        # Duas tentativas: a chave pode sumir ou ser retomada entre a leitura e a escrita
+        for _ in range(2):
+            linha = db.execute(
+                select(
+                    IdempotencyKey.id, IdempotencyKey.request_hash, IdempotencyKey.status_code,
+                    IdempotencyKey.response, IdempotencyKey.created_at, IdempotencyKey.expires_at
+                ).where(*_da_chave(escopo, chave))
+            ).first()
+            if linha is not None:
+                registro = Registro(*linha[1:])
+                if not pode_substituir(registro, agora):
+                    db.rollback()
+                    return registro
+                retomada = db.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.id == linha.id, IdempotencyKey.created_at == linha.created_at)
+                    .values(**valores)
+                )
+                db.commit()
+                if retomada.rowcount == 1:
+                    return None
+                continue
+            try:
+                db.execute(insert(IdempotencyKey).values(scope=escopo, key=chave, **valores))
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+        # Outra requisição levou a chave nas duas tentativas: ainda em processamento
+        return Registro(request_hash, None, None, agora, agora)
+
+    def concluir(self, db: Session, escopo, chave, criado_em, status_code, corpo):
+        # Na transação da escrita: as duas entram no mesmo commit
+        gravada = db.execute(
+            update(IdempotencyKey)
+            .where(*_da_chave(escopo, chave), IdempotencyKey.created_at == criado_em)
+            .values(status_code=status_code, response=corpo)
+        )
+        if gravada.rowcount != 1:
+            db.rollback()
+            return False
+        db.commit()
+        return True
+
+    def liberar(self, db: Session, escopo, chave, criado_em):
+        # Desfaz a escrita da execução que falhou
+        db.rollback()
+        db.execute(delete(IdempotencyKey).where(
+            *_da_chave(escopo, chave), IdempotencyKey.status_code.is_(None), IdempotencyKey.created_at == criado_em
+        ))
+        db.commit()
+
+    def varrer(self, db: Session, agora, lote):
+        ids = db.scalars(select(IdempotencyKey.id).where(IdempotencyKey.expires_at <= agora).limit(lote)).all()
+        if not ids:
+            db.rollback()
+            return 0
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)).execution_options(synchronize_session=False))
+        db.commit()
+        return len(ids)
+
+def criar_armazem(nome: str = IDEMPOTENCIA_BACKEND) -> ArmazemIdempotencia:
+    if nome == "banco":
+        return ArmazemBanco()
+    if nome == "memoria":
+        return ArmazemMemoria(IDEMPOTENCIA_MAX_ITENS)
+    raise ValueError(f"IDEMPOTENCIA_BACKEND inválido: {nome}")
+
+idempotencia = Idempotencia(criar_armazem())
+
+def varrer_chaves_expiradas(
+    db: Session, lote: int = IDEMPOTENCIA_LOTE, max_lotes: int = IDEMPOTENCIA_MAX_LOTES
+) -> dict:
+    """Remove as chaves expiradas em lotes"""
+    agora = datetime.now()
+    removidas = lotes = 0
+    restam = False
+    while True:
+        if max_lotes and lotes >= max_lotes:
+            restam = True
+            break
+        quantas = idempotencia.armazem.varrer(db, agora, lote)
+        if not quantas:
+            break
+        removidas += quantas
+        lotes += 1
+        if quantas < lote:
+            break
+    return {"removidas": removidas, "lotes": lotes, "restam": restam}
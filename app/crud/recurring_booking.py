@@ -0,0 +1,252 @@
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import List
+import logging
+
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatus
+from app.models.recurring_booking import RecurringBooking
+from app.schemas.booking import ReservaRecorrenteCriar
+from app.crud.space import obter_espaco_por_id
+from app.crud.booking import (
+    bloquear_espaco, calcular_preco_reserva, eh_conflito_de_horario, sem_conflito_existente
+)
+from app.crud.space_occupancy import marcar_ocupacao, recalcular_ocupacao
+from app.crud.space_pricing import tabela_precos
+from app.services.disponibilidade import motor_disponibilidade
+from app.services.tempo_real import broker_eventos
+from app.services.recorrencia import (
+    RegraRecorrencia, Ocorrencia, expandir, horizonte_materializacao, RECORRENCIA_MAX_OCORRENCIAS
+)
+
+logger = logging.getLogger(__name__)
+
+# Quantos conflitos são devolvidos no detail do 409
+MAX_CONFLITOS_RELATADOS = 50
+
+def criar_reserva_recorrente(db: Session, dados: ReservaRecorrenteCriar, usuario_id: int):
+    """
+    Cria uma série recorrente. Todas as ocorrências da regra são conferidas contra
+    as reservas existentes de uma vez (uma consulta e uma varredura); havendo
+    conflito, nada é gravado e o 409 lista as ocorrências em conflito.
+    As ocorrências até o horizonte de materialização viram reservas na mesma transação.
+    """
+    espaco = obter_espaco_por_id(db, dados.space_id)
+    
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    
+    if not espaco.is_available:
+        raise HTTPException(status_code=400, detail="Espaço não está disponível para reservas")
+    
+    if dados.start_time >= dados.end_time:
+        raise HTTPException(status_code=400, detail="Horário de início deve ser antes do horário de fim")
+    
+    if dados.start_time < datetime.now():
+        raise HTTPException(status_code=400, detail="Não é possível fazer reservas no passado")
+    
+    regra = RegraRecorrencia.interpretar(dados.regra)
+    if not regra.limitada:
+        raise HTTPException(status_code=400, detail="A regra precisa de COUNT ou UNTIL")
+    
+    duracao = dados.end_time - dados.start_time
+    ocorrencias = list(islice(expandir(regra, dados.start_time, duracao), RECORRENCIA_MAX_OCORRENCIAS + 1))
+    if len(ocorrencias) > RECORRENCIA_MAX_OCORRENCIAS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A regra gera mais de {RECORRENCIA_MAX_OCORRENCIAS} ocorrências"
+        )
+    
+    # Ocorrências em ordem de início: basta comparar cada uma com a anterior
+    for anterior, atual in zip(ocorrencias, ocorrencias[1:]):
+        if atual.start_time < anterior.end_time:
+            raise HTTPException(status_code=400, detail="As ocorrências da série se sobrepõem")
+    
+    horizonte = horizonte_materializacao()
+    
+    try:
+        bloquear_espaco(db, dados.space_id)
+        
+        livres = sem_conflito_existente(db, dados.space_id, ocorrencias)
+        conflitos = [ocorrencia for ocorrencia, livre in zip(ocorrencias, livres) if not livre]
+        if conflitos:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "mensagem": "Espaço não disponível em algumas ocorrências da série",
+                    "total_conflitos": len(conflitos),
+                    "conflitos": [
+                        {"start_time": o.start_time.isoformat(), "end_time": o.end_time.isoformat()}
+                        for o in conflitos[:MAX_CONFLITOS_RELATADOS]
+                    ]
+                }
+            )
+        
+        serie = RecurringBooking(
+            user_id=usuario_id,
+            space_id=dados.space_id,
+            rule=dados.regra,
+            start_time=dados.start_time,
+            duration_minutes=int(duracao.total_seconds() // 60),
+            is_active=True
+        )
+        db.add(serie)
+        db.flush()
+        
+        if horizonte is None:
+            materializar = ocorrencias
+            serie.materialized_until = ocorrencias[-1].end_time
+        else:
+            materializar = [o for o in ocorrencias if o.start_time < horizonte]
+            serie.materialized_until = horizonte
+        _inserir_ocorrencias(db, serie, espaco, materializar)
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError as erro:
+        db.rollback()
+        if eh_conflito_de_horario(erro):
+            raise HTTPException(status_code=409, detail="Espaço não disponível no horário selecionado")
+        raise
+    
+    db.refresh(serie)
+    motor_disponibilidade.invalidar(serie.space_id)
+    broker_eventos.publicar_ressincronizacao(serie.space_id)
+    return {"recorrencia": serie, "ocorrencias": len(ocorrencias), "materializadas": len(materializar)}
+
+def _inserir_ocorrencias(db: Session, serie: RecurringBooking, espaco, ocorrencias: List[Ocorrencia]):
+    """Grava as ocorrências como reservas com um único INSERT em lote"""
+    if not ocorrencias:
+        return
+    tabela = tabela_precos(db, espaco)
+    db.execute(insert(Booking), [
+        {
+            "user_id": serie.user_id,
+            "space_id": serie.space_id,
+            "start_time": ocorrencia.start_time,
+            "end_time": ocorrencia.end_time,
+            "status": BookingStatus.PENDENTE,
+            "total_price": calcular_preco_reserva(espaco, ocorrencia.start_time, ocorrencia.end_time, tabela),
+            "recurring_booking_id": serie.id,
+        }
+        for ocorrencia in ocorrencias
+    ])
+    marcar_ocupacao(db, (
+        (serie.space_id, ocorrencia.start_time, ocorrencia.end_time, BookingStatus.PENDENTE)
+        for ocorrencia in ocorrencias
+    ))
+
+def materializar_recorrencias(db: Session, ate: datetime = None):
+    """
+    Avança o horizonte das séries ativas até `ate` (padrão: o horizonte configurado),
+    gravando as ocorrências que entraram na janela. Uma transação por série.
+    
+    Ocorrências que colidem com reservas feitas depois da criação da série, ou de
+    espaços que ficaram indisponíveis, são puladas e contadas em `recusadas`.
+    """
+    ate = ate or horizonte_materializacao()
+    totais = {"series": 0, "criadas": 0, "recusadas": 0}
+    if ate is None:
+        # Séries são materializadas inteiras na criação
+        return totais
+    
+    ids = db.scalars(
+        select(RecurringBooking.id).where(
+            RecurringBooking.is_active == True,
+            or_(RecurringBooking.materialized_until == None, RecurringBooking.materialized_until < ate)
+        ).order_by(RecurringBooking.id)
+    ).all()
+    
+    for serie_id in ids:
+        criadas, recusadas = _materializar_serie(db, serie_id, ate)
+        totais["series"] += 1
+        totais["criadas"] += criadas
+        totais["recusadas"] += recusadas
+    return totais
+
+def _materializar_serie(db: Session, serie_id: int, ate: datetime):
+    try:
+        serie = db.get(RecurringBooking, serie_id)
+        bloquear_espaco(db, serie.space_id)
+        espaco = obter_espaco_por_id(db, serie.space_id)
+        
+        # Ocorrências que o horizonte deixou passar não são criadas no passado
+        desde = max(serie.materialized_until or serie.start_time, datetime.now())
+        ocorrencias = list(expandir(
+            RegraRecorrencia.interpretar(serie.rule),
+            serie.start_time,
+            timedelta(minutes=serie.duration_minutes),
+            desde=desde,
+            ate=ate
+        ))
+        
+        if espaco.is_available:
+            livres = sem_conflito_existente(db, serie.space_id, ocorrencias)
+            aceitas = [ocorrencia for ocorrencia, livre in zip(ocorrencias, livres) if livre]
+        else:
+            aceitas = []
+        
+        _inserir_ocorrencias(db, serie, espaco, aceitas)
+        serie.materialized_until = ate
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    recusadas = len(ocorrencias) - len(aceitas)
+    if recusadas:
+        logger.warning("Série %s: %s ocorrência(s) não materializada(s) por conflito ou indisponibilidade", serie_id, recusadas)
+    motor_disponibilidade.invalidar(serie.space_id)
+    broker_eventos.publicar_ressincronizacao(serie.space_id)
+    return len(aceitas), recusadas
+
+def obter_reserva_recorrente(db: Session, serie_id: int, usuario_id: int):
+    """Obtém uma série recorrente do usuário"""
+    return db.query(RecurringBooking).filter(
+        RecurringBooking.id == serie_id,
+        RecurringBooking.user_id == usuario_id
+    ).first()
+
+def listar_ocorrencias(serie: RecurringBooking, desde: datetime = None, limit: int = 100):
+    """Expande a regra da série sob demanda, sem consultar o banco"""
+    ocorrencias = expandir(
+        RegraRecorrencia.interpretar(serie.rule),
+        serie.start_time,
+        timedelta(minutes=serie.duration_minutes),
+        desde=desde
+    )
+    return list(islice(ocorrencias, limit))
+
+def cancelar_reserva_recorrente(db: Session, serie_id: int, usuario_id: int):
+    """Cancela a série e todas as ocorrências futuras ainda ativas"""
+    serie = obter_reserva_recorrente(db, serie_id, usuario_id)
+    
+    if not serie:
+        raise HTTPException(status_code=404, detail="Reserva recorrente não encontrada")
+    
+    if not serie.is_active:
+        raise HTTPException(status_code=400, detail="Reserva recorrente já está cancelada")
+    
+    agora = datetime.now()
+    bloquear_espaco(db, serie.space_id)
+    serie.is_active = False
+    ocorrencias_futuras = (
+        Booking.recurring_booking_id == serie_id,
+        Booking.status.in_([BookingStatus.PENDENTE, BookingStatus.CONFIRMADA]),
+        Booking.start_time > agora
+    )
+    ultimo_fim = db.scalar(select(func.max(Booking.end_time)).where(*ocorrencias_futuras))
+    resultado = db.execute(
+        update(Booking).where(*ocorrencias_futuras).values(status=BookingStatus.CANCELADA)
+    )
+    if ultimo_fim is not None:
+        recalcular_ocupacao(db, serie.space_id, agora, ultimo_fim)
+    db.commit()
+    motor_disponibilidade.invalidar(serie.space_id)
+    broker_eventos.publicar_ressincronizacao(serie.space_id)
+    return {"message": "Reserva recorrente cancelada com sucesso", "ocorrencias_canceladas": resultado.rowcount}
@@ -0,0 +1,28 @@
+"""
+Versões assíncronas (AsyncSession) das operações de reservas recorrentes.
+Escritas executam a implementação síncrona via run_sync, como em booking_async.
+"""
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.recurring_booking import RecurringBooking
+from app.schemas.booking import ReservaRecorrenteCriar
+from app.crud import recurring_booking
+from app.crud.recurring_booking import listar_ocorrencias  # noqa: F401 - expansão pura, sem I/O
+
+async def criar_reserva_recorrente(db: AsyncSession, dados: ReservaRecorrenteCriar, usuario_id: int):
+    return await db.run_sync(recurring_booking.criar_reserva_recorrente, dados, usuario_id)
+
+async def materializar_recorrencias(db: AsyncSession, ate: datetime = None):
+    return await db.run_sync(recurring_booking.materializar_recorrencias, ate)
+
+async def obter_reserva_recorrente(db: AsyncSession, serie_id: int, usuario_id: int):
+    return await db.scalar(
+        select(RecurringBooking).where(
+            RecurringBooking.id == serie_id,
+            RecurringBooking.user_id == usuario_id
+        )
+    )
+
+async def cancelar_reserva_recorrente(db: AsyncSession, serie_id: int, usuario_id: int):
+    return await db.run_sync(recurring_booking.cancelar_reserva_recorrente, serie_id, usuario_id)
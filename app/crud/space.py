@@ -1,17 +1,61 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.space import Space
 from app.schemas.space import EspacoCriar
+from app.services.cache import cache_catalogo
+from app.services.tempo_real import broker_eventos
+from app.services.serializacao import CAMPOS_ESPACO, colunas, como_dicts
 
-def obter_espacos(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Space).filter(Space.is_available == True).offset(skip).limit(limit).all()
+def consulta_espacos(
+    limit: int = 100,
+    apos_id: int = None,
+    capacidade_min: int = None,
+    preco_min: float = None,
+    preco_max: float = None
+):
+    """Espaços disponíveis em ordem de id, a partir de `apos_id` (paginação keyset)"""
+    consulta = select(Space).where(Space.is_available == True)
+    if apos_id is not None:
+        consulta = consulta.where(Space.id > apos_id)
+    if capacidade_min is not None:
+        consulta = consulta.where(Space.capacity >= capacidade_min)
+    if preco_min is not None:
+        consulta = consulta.where(Space.price_per_hour >= preco_min)
+    if preco_max is not None:
+        consulta = consulta.where(Space.price_per_hour <= preco_max)
+    return consulta.order_by(Space.id).limit(limit)
+
+def obter_espacos(db: Session, limit: int = 100, apos_id: int = None, **filtros):
+    return db.scalars(consulta_espacos(limit, apos_id, **filtros)).all()
+
+def consulta_espacos_serializados(limit: int = 100, apos_id: int = None, **filtros):
+    """Mesma consulta de `consulta_espacos`, só com as colunas de EspacoResposta"""
+    return consulta_espacos(limit, apos_id, **filtros).with_only_columns(*colunas(CAMPOS_ESPACO))
+
+def consulta_espaco_serializado(espaco_id: int):
+    return select(*colunas(CAMPOS_ESPACO)).where(Space.id == espaco_id)
+
+def obter_espacos_serializados(db: Session, limit: int = 100, apos_id: int = None, **filtros) -> list:
+    """Como `obter_espacos`, mas já como dicts no formato da resposta (sem ORM)"""
+    return como_dicts(db.execute(consulta_espacos_serializados(limit, apos_id, **filtros)))
+
+def obter_espaco_serializado(db: Session, espaco_id: int):
+    linhas = como_dicts(db.execute(consulta_espaco_serializado(espaco_id)))
+    return linhas[0] if linhas else None
 
 def obter_espaco_por_id(db: Session, espaco_id: int):
     return db.query(Space).filter(Space.id == espaco_id).first()
 
 def criar_espaco(db: Session, espaco: EspacoCriar):
-    db_espaco = Space(**espaco.dict())
+    db_espaco = Space(
+        name=espaco.nome,
+        description=espaco.descricao,
+        capacity=espaco.capacidade,
+        price_per_hour=espaco.preco_por_hora
+    )
     db.add(db_espaco)
     db.commit()
+    cache_catalogo.invalidar()
     db.refresh(db_espaco)
     return db_espaco
 
@@ -20,5 +64,7 @@ def atualizar_disponibilidade_espaco(db: Session, espaco_id: int, disponivel: bo
     if espaco:
         espaco.is_available = disponivel
         db.commit()
+        cache_catalogo.invalidar()
         db.refresh(espaco)
+        broker_eventos.publicar_espaco(espaco)
     return espaco
\ No newline at end of file
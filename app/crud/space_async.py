@@ -0,0 +1,30 @@
+"""
+Versões assíncronas (AsyncSession) das operações de espaço.
+Leituras usam o driver assíncrono diretamente; escritas executam a
+implementação síncrona via run_sync, mantendo as regras em um só lugar.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.space import Space
+from app.schemas.space import EspacoCriar
+from app.crud import space
+from app.services.serializacao import como_dicts
+
+async def obter_espacos(db: AsyncSession, limit: int = 100, apos_id: int = None, **filtros):
+    resultado = await db.scalars(space.consulta_espacos(limit, apos_id, **filtros))
+    return resultado.all()
+
+async def obter_espacos_serializados(db: AsyncSession, limit: int = 100, apos_id: int = None, **filtros) -> list:
+    return como_dicts(await db.execute(space.consulta_espacos_serializados(limit, apos_id, **filtros)))
+
+async def obter_espaco_serializado(db: AsyncSession, espaco_id: int):
+    linhas = como_dicts(await db.execute(space.consulta_espaco_serializado(espaco_id)))
+    return linhas[0] if linhas else None
+
+async def obter_espaco_por_id(db: AsyncSession, espaco_id: int):
+    return await db.get(Space, espaco_id)
+
+async def criar_espaco(db: AsyncSession, espaco: EspacoCriar):
+    return await db.run_sync(space.criar_espaco, espaco)
+
+async def atualizar_disponibilidade_espaco(db: AsyncSession, espaco_id: int, disponivel: bool):
+    return await db.run_sync(space.atualizar_disponibilidade_espaco, espaco_id, disponivel)
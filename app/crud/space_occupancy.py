@@ -0,0 +1,182 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+from fastapi import HTTPException
+from sqlalchemy import select, delete, insert, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatus
+from app.models.space import Space
+from app.models.space_occupancy import SpaceOccupancy
+from app.services.ocupacao import (
+    dias_do_intervalo, mascaras, para_bytes, de_bytes, faixas, fracao_ocupada, SLOT_MINUTOS
+)
+
+STATUS_ATIVOS = [BookingStatus.PENDENTE, BookingStatus.CONFIRMADA]
+
+# Reservas lidas por vez na reconstrução de um espaço
+LOTE_RECONSTRUCAO = 5000
+
+def _acumular(intervalos) -> dict:
+    """(space_id, dia) -> [bits ocupados, bits confirmados] dos intervalos (space_id, inicio, fim, status)"""
+    acumulado = defaultdict(lambda: [0, 0])
+    for espaco_id, inicio, fim, status in intervalos:
+        for dia, bits in mascaras(inicio, fim):
+            par = acumulado[(espaco_id, dia)]
+            par[0] |= bits
+            if status == BookingStatus.CONFIRMADA:
+                par[1] |= bits
+    return acumulado
+
+def _linhas(acumulado: dict) -> list:
+    return [
+        {"space_id": espaco_id, "day": dia, "occupied": para_bytes(ocupados), "confirmed": para_bytes(confirmados)}
+        for (espaco_id, dia), (ocupados, confirmados) in acumulado.items()
+    ]
+
+def marcar_ocupacao(db: Session, intervalos):
+    """
+    Marca no mapa os intervalos (space_id, inicio, fim, status) de reservas ativas.
+    Roda na transação da escrita da reserva, com o espaço já bloqueado.
+    """
+    acumulado = _acumular(intervalos)
+    if not acumulado:
+        return
+    existentes = {
+        (linha.space_id, linha.day): linha
+        for linha in db.scalars(
+            select(SpaceOccupancy).where(
+                tuple_(SpaceOccupancy.space_id, SpaceOccupancy.day).in_(list(acumulado))
+            )
+        )
+    }
+    novas = {}
+    for chave, (ocupados, confirmados) in acumulado.items():
+        linha = existentes.get(chave)
+        if linha is None:
+            novas[chave] = (ocupados, confirmados)
+        else:
+            linha.occupied = para_bytes(de_bytes(linha.occupied) | ocupados)
+            linha.confirmed = para_bytes(de_bytes(linha.confirmed) | confirmados)
+    if novas:
+        db.execute(insert(SpaceOccupancy), _linhas(novas))
+
+def recalcular_ocupacao(db: Session, espaco_id: int, inicio: datetime, fim: datetime):
+    """
+    Refaz, a partir das reservas, os dias do espaço tocados por [inicio, fim).
+    Usado quando reservas deixam de ser ativas (bits não podem ser só desligados).
+    """
+    dias = list(dias_do_intervalo(inicio, fim))
+    if not dias:
+        return
+    abertura = datetime.combine(dias[0], time())
+    fechamento = datetime.combine(dias[-1] + timedelta(days=1), time())
+    
+    db.flush()
+    reservas = db.execute(
+        select(Booking.space_id, Booking.start_time, Booking.end_time, Booking.status).where(
+            Booking.space_id == espaco_id,
+            Booking.status.in_(STATUS_ATIVOS),
+            Booking.start_time < fechamento,
+            Booking.end_time > abertura
+        )
+    )
+    # Reservas que atravessam as bordas só contam dentro dos dias recalculados
+    acumulado = {
+        chave: bits for chave, bits in _acumular(reservas).items()
+        if dias[0] <= chave[1] <= dias[-1]
+    }
+    db.execute(
+        delete(SpaceOccupancy).where(
+            SpaceOccupancy.space_id == espaco_id,
+            SpaceOccupancy.day >= dias[0],
+            SpaceOccupancy.day <= dias[-1]
+        )
+    )
+    if acumulado:
+        db.execute(insert(SpaceOccupancy), _linhas(acumulado))
+
+def reconstruir_ocupacao(db: Session, espaco_id: int = None):
+    """
+    Reconstrói o mapa a partir das reservas, um espaço por transação (com o
+    espaço bloqueado, para não disputar com escritas em andamento)
+    """
+    from app.crud.booking import bloquear_espaco
+    
+    if espaco_id is None:
+        ids = db.scalars(select(Space.id).order_by(Space.id)).all()
+    else:
+        ids = [espaco_id]
+    
+    dias = 0
+    for id_espaco in ids:
+        try:
+            bloquear_espaco(db, id_espaco)
+            db.execute(delete(SpaceOccupancy).where(SpaceOccupancy.space_id == id_espaco))
+            resultado = db.execute(
+                select(Booking.space_id, Booking.start_time, Booking.end_time, Booking.status)
+                .where(Booking.space_id == id_espaco, Booking.status.in_(STATUS_ATIVOS))
+                .execution_options(yield_per=LOTE_RECONSTRUCAO)
+            )
+            acumulado = defaultdict(lambda: [0, 0])
+            for lote in resultado.partitions():
+                for chave, (ocupados, confirmados) in _acumular(lote).items():
+                    acumulado[chave][0] |= ocupados
+                    acumulado[chave][1] |= confirmados
+            if acumulado:
+                db.execute(insert(SpaceOccupancy), _linhas(acumulado))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        dias += len(acumulado)
+    return {"espacos": len(ids), "dias": dias}
+
+# Período máximo de um calendário
+CALENDARIO_MAX_DIAS = 366
+
+def periodo_calendario(inicio: date = None, fim: date = None):
+    """Valida o período do calendário; sem datas, usa o mês corrente"""
+    hoje = date.today()
+    inicio = inicio or hoje.replace(day=1)
+    if fim is None:
+        proximo_mes = (inicio.replace(day=28) + timedelta(days=4)).replace(day=1)
+        fim = proximo_mes - timedelta(days=1)
+    if fim < inicio:
+        raise HTTPException(status_code=400, detail="Data final deve ser igual ou posterior à inicial")
+    if (fim - inicio).days >= CALENDARIO_MAX_DIAS:
+        raise HTTPException(status_code=400, detail=f"O calendário deve ter no máximo {CALENDARIO_MAX_DIAS} dias")
+    return inicio, fim
+
+def consulta_calendario(espaco_ids: List[int], inicio: date, fim: date):
+    """Leitura do mapa pela chave primária (space_id, day), sem tocar em bookings"""
+    return select(
+        SpaceOccupancy.space_id, SpaceOccupancy.day, SpaceOccupancy.occupied, SpaceOccupancy.confirmed
+    ).where(
+        SpaceOccupancy.space_id.in_(espaco_ids),
+        SpaceOccupancy.day >= inicio,
+        SpaceOccupancy.day <= fim
+    ).order_by(SpaceOccupancy.space_id, SpaceOccupancy.day)
+
+def montar_calendarios(espaco_ids: List[int], inicio: date, fim: date, linhas) -> list:
+    """Um calendário por espaço pedido; dias ausentes estão livres"""
+    dias_por_espaco = {espaco_id: [] for espaco_id in espaco_ids}
+    for linha in linhas:
+        ocupados = de_bytes(linha.occupied)
+        confirmados = de_bytes(linha.confirmed)
+        if not ocupados:
+            continue
+        dias_por_espaco[linha.space_id].append({
+            "dia": linha.day,
+            "ocupacao": fracao_ocupada(ocupados),
+            "faixas_ocupadas": faixas(ocupados),
+            "faixas_confirmadas": faixas(confirmados),
+        })
+    return [
+        {"space_id": espaco_id, "inicio": inicio, "fim": fim, "slot_minutos": SLOT_MINUTOS, "dias": dias}
+        for espaco_id, dias in dias_por_espaco.items()
+    ]
+
+def obter_calendarios(db: Session, espaco_ids: List[int], inicio: date, fim: date):
+    return montar_calendarios(espaco_ids, inicio, fim, db.execute(consulta_calendario(espaco_ids, inicio, fim)))
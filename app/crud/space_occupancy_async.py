@@ -0,0 +1,13 @@
+"""
+Versões assíncronas (AsyncSession) das leituras do mapa de ocupação.
+A manutenção do mapa acontece dentro das escritas de reservas (via run_sync).
+"""
+from datetime import date
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.space_occupancy import consulta_calendario, montar_calendarios
+from app.crud.space_occupancy import periodo_calendario  # noqa: F401 - validação pura, sem I/O
+
+async def obter_calendarios(db: AsyncSession, espaco_ids: List[int], inicio: date, fim: date):
+    linhas = await db.execute(consulta_calendario(espaco_ids, inicio, fim))
+    return montar_calendarios(espaco_ids, inicio, fim, linhas)
@@ -0,0 +1,124 @@
+"""
+Regras de preço dos espaços e cotação em lote.
+
+As regras são lidas do banco a cada uso, em uma consulta para todos os espaços
+envolvidos (índice por space_id); a compilação em tabela semanal fica em cache
+por (preço por hora, regras), então mudanças valem na hora em todos os workers
+sem invalidação. Espaços sem regras não têm tabela: preço por hora × duração.
+"""
+from collections import defaultdict
+from typing import List
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.space import Space
+from app.models.space_price_rule import SpacePriceRule
+from app.services.precos import (
+    DescontoDuracao, Faixa, TODOS_OS_DIAS, bits_para_dias, compilar, dias_para_bits,
+    hora_para_minutos, minutos_para_hora, preco_intervalo
+)
+
+def consulta_regras(espaco_ids):
+    return select(SpacePriceRule).where(SpacePriceRule.space_id.in_(list(espaco_ids))).order_by(SpacePriceRule.id)
+
+def montar_tabelas(espacos, regras) -> dict:
+    """{space_id: TabelaPrecos} dos espaços que têm regras"""
+    por_espaco = defaultdict(lambda: ([], []))
+    for regra in regras:
+        faixas, descontos = por_espaco[regra.space_id]
+        if regra.kind == "faixa":
+            faixas.append(Faixa(regra.weekdays or TODOS_OS_DIAS, regra.start_minute, regra.end_minute, regra.multiplier))
+        else:
+            descontos.append(DescontoDuracao(regra.min_duration_minutes, regra.multiplier))
+    return {
+        espaco.id: compilar(espaco.price_per_hour, tuple(por_espaco[espaco.id][0]), tuple(por_espaco[espaco.id][1]))
+        for espaco in espacos
+        if espaco.id in por_espaco
+    }
+
+def tabelas_precos(db: Session, espacos) -> dict:
+    """Tabelas de preço de vários espaços, com uma consulta"""
+    espacos = list(espacos)
+    if not espacos:
+        return {}
+    return montar_tabelas(espacos, db.scalars(consulta_regras(espaco.id for espaco in espacos)))
+
+def tabela_precos(db: Session, espaco):
+    """Tabela de preço de um espaço, ou None se ele não tem regras"""
+    return tabelas_precos(db, [espaco]).get(espaco.id)
+
+def regra_para_api(regra: SpacePriceRule) -> dict:
+    if regra.kind == "faixa":
+        return {
+            "tipo": "faixa",
+            "dias_semana": bits_para_dias(regra.weekdays or TODOS_OS_DIAS),
+            "inicio": minutos_para_hora(regra.start_minute),
+            "fim": minutos_para_hora(regra.end_minute),
+            "multiplicador": regra.multiplier,
+        }
+    return {"tipo": "duracao", "duracao_minima_minutos": regra.min_duration_minutes, "multiplicador": regra.multiplier}
+
+def regras_para_api(espaco, regras) -> dict:
+    return {
+        "space_id": espaco.id,
+        "preco_por_hora": espaco.price_per_hour,
+        "regras": [regra_para_api(regra) for regra in regras],
+    }
+
+def obter_regras_preco(db: Session, espaco_id: int) -> dict:
+    espaco = db.get(Space, espaco_id)
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    return regras_para_api(espaco, db.scalars(consulta_regras([espaco_id])).all())
+
+def substituir_regras_preco(db: Session, espaco_id: int, regras: list) -> dict:
+    """Troca todas as regras de preço do espaço (reservas já feitas mantêm o preço)"""
+    espaco = db.get(Space, espaco_id)
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    db.execute(delete(SpacePriceRule).where(SpacePriceRule.space_id == espaco_id))
+    novas = [
+        SpacePriceRule(
+            space_id=espaco_id,
+            kind=regra.tipo,
+            weekdays=dias_para_bits(regra.dias_semana) if regra.tipo == "faixa" else None,
+            start_minute=hora_para_minutos(regra.inicio) if regra.tipo == "faixa" else None,
+            end_minute=hora_para_minutos(regra.fim) if regra.tipo == "faixa" else None,
+            min_duration_minutes=regra.duracao_minima_minutos if regra.tipo == "duracao" else None,
+            multiplier=regra.multiplicador,
+        )
+        for regra in regras
+    ]
+    db.add_all(novas)
+    db.commit()
+    return regras_para_api(espaco, novas)
+
+def consulta_espacos_cotacao(espaco_ids):
+    return select(Space).where(Space.id.in_(list(espaco_ids)))
+
+def montar_cotacao(itens: List, espacos: dict, tabelas: dict) -> list:
+    """Preço de cada item (ou o motivo de não ter), na ordem do pedido"""
+    resultado = []
+    for item in itens:
+        cotado = {"space_id": item.space_id, "start_time": item.start_time, "end_time": item.end_time}
+        espaco = espacos.get(item.space_id)
+        if espaco is None:
+            cotado["erro"] = "Espaço não encontrado"
+        elif not espaco.is_available:
+            cotado["erro"] = "Espaço não está disponível para reservas"
+        elif item.start_time >= item.end_time:
+            cotado["erro"] = "Horário de início deve ser antes do horário de fim"
+        else:
+            cotado["total_price"] = preco_intervalo(
+                espaco.price_per_hour, item.start_time, item.end_time, tabelas.get(item.space_id)
+            )
+        resultado.append(cotado)
+    return resultado
+
+def cotar(db: Session, itens: List) -> list:
+    """Cota todos os itens com duas consultas (espaços e regras), qualquer que seja o tamanho do lote"""
+    espaco_ids = {item.space_id for item in itens}
+    espacos = {espaco.id: espaco for espaco in db.scalars(consulta_espacos_cotacao(espaco_ids))}
+    return montar_cotacao(itens, espacos, tabelas_precos(db, espacos.values()))
@@ -0,0 +1,36 @@
+"""
+Versões assíncronas (AsyncSession) das regras de preço e da cotação.
+Leituras usam o driver assíncrono com as mesmas consultas e montagem da
+versão síncrona; a troca de regras executa a implementação síncrona via run_sync.
+"""
+from typing import List
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.space import Space
+from app.crud import space_pricing
+from app.crud.space_pricing import regras_para_api, montar_cotacao, montar_tabelas  # noqa: F401 - funções puras, sem I/O
+
+async def tabelas_precos(db: AsyncSession, espacos) -> dict:
+    espacos = list(espacos)
+    if not espacos:
+        return {}
+    regras = await db.scalars(space_pricing.consulta_regras(espaco.id for espaco in espacos))
+    return montar_tabelas(espacos, regras)
+
+async def obter_regras_preco(db: AsyncSession, espaco_id: int) -> dict:
+    espaco = await db.get(Space, espaco_id)
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    regras = await db.scalars(space_pricing.consulta_regras([espaco_id]))
+    return regras_para_api(espaco, regras.all())
+
+async def substituir_regras_preco(db: AsyncSession, espaco_id: int, regras: list) -> dict:
+    return await db.run_sync(space_pricing.substituir_regras_preco, espaco_id, regras)
+
+async def cotar(db: AsyncSession, itens: List) -> list:
+    espaco_ids = {item.space_id for item in itens}
+    resultado = await db.scalars(space_pricing.consulta_espacos_cotacao(espaco_ids))
+    espacos = {espaco.id: espaco for espaco in resultado}
+    return montar_cotacao(itens, espacos, await tabelas_precos(db, espacos.values()))
@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.schemas.user import UsuarioCriar
-from app.auth.security import criptografar_senha, verificar_senha
+from app.schemas.user import UsuarioCriar, UsuarioAtualizar
+from app.auth.security import criptografar_senha, verificar_e_atualizar_senha
+from app.auth.cache import cache_tokens
 
 def obter_usuario_por_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+def obter_usuario_por_id(db: Session, usuario_id: int):
+    return db.get(User, usuario_id)
+
 def criar_usuario(db: Session, usuario: UsuarioCriar):
     senha_criptografada = criptografar_senha(usuario.senha)
     db_usuario = User(
@@ -22,6 +26,35 @@ def autenticar_usuario(db: Session, email: str, senha: str):
     usuario = obter_usuario_por_email(db, email)
     if not usuario:
         return False
-    if not verificar_senha(senha, usuario.hashed_password):
+    if not usuario.is_active:
+        return False
+    confere, novo_hash = verificar_e_atualizar_senha(senha, usuario.hashed_password)
+    if not confere:
         return False
-    return usuario
\ No newline at end of file
+    # Hash gerado com custo antigo: regrava com o custo atual (BCRYPT_ROUNDS)
+    if novo_hash:
+        usuario.hashed_password = novo_hash
+        db.commit()
+        db.refresh(usuario)
+    return usuario
+
+def atualizar_usuario(db: Session, usuario_id: int, dados: UsuarioAtualizar):
+    usuario = obter_usuario_por_id(db, usuario_id)
+    if usuario:
+        if dados.nome_completo is not None:
+            usuario.full_name = dados.nome_completo
+        if dados.senha is not None:
+            usuario.hashed_password = criptografar_senha(dados.senha)
+        db.commit()
+        db.refresh(usuario)
+        cache_tokens.invalidar_usuario(usuario_id)
+    return usuario
+
+def desativar_usuario(db: Session, usuario_id: int):
+    usuario = obter_usuario_por_id(db, usuario_id)
+    if usuario:
+        usuario.is_active = False
+        db.commit()
+        db.refresh(usuario)
+        cache_tokens.invalidar_usuario(usuario_id)
+    return usuario
@@ -0,0 +1,63 @@
+"""Versões assíncronas (AsyncSession) das operações de usuário"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.schemas.user import UsuarioAtualizar, UsuarioCriar
+from app.auth.cache import cache_tokens
+from app.auth.senhas import pool_senhas, _gerar_hash, _verificar_e_atualizar
+
+async def obter_usuario_por_email(db: AsyncSession, email: str):
+    return await db.scalar(select(User).where(User.email == email))
+
+async def obter_usuario_por_id(db: AsyncSession, usuario_id: int):
+    return await db.get(User, usuario_id)
+
+async def criar_usuario(db: AsyncSession, usuario: UsuarioCriar):
+    # bcrypt consome CPU: roda no pool de senhas, fora do event loop
+    senha_criptografada = await pool_senhas.executar_async(_gerar_hash, usuario.senha)
+    db_usuario = User(
+        email=usuario.email,
+        hashed_password=senha_criptografada,
+        full_name=usuario.nome_completo
+    )
+    db.add(db_usuario)
+    await db.commit()
+    await db.refresh(db_usuario)
+    return db_usuario
+
+async def autenticar_usuario(db: AsyncSession, email: str, senha: str):
+    usuario = await obter_usuario_por_email(db, email)
+    if not usuario:
+        return False
+    if not usuario.is_active:
+        return False
+    confere, novo_hash = await pool_senhas.executar_async(_verificar_e_atualizar, senha, usuario.hashed_password)
+    if not confere:
+        return False
+    # Hash gerado com custo antigo: regrava com o custo atual (BCRYPT_ROUNDS)
+    if novo_hash:
+        usuario.hashed_password = novo_hash
+        await db.commit()
+        await db.refresh(usuario)
+    return usuario
+
+async def atualizar_usuario(db: AsyncSession, usuario_id: int, dados: UsuarioAtualizar):
+    usuario = await obter_usuario_por_id(db, usuario_id)
+    if usuario:
+        if dados.nome_completo is not None:
+            usuario.full_name = dados.nome_completo
+        if dados.senha is not None:
+            usuario.hashed_password = await pool_senhas.executar_async(_gerar_hash, dados.senha)
+        await db.commit()
+        await db.refresh(usuario)
+        cache_tokens.invalidar_usuario(usuario_id)
+    return usuario
+
+async def desativar_usuario(db: AsyncSession, usuario_id: int):
+    usuario = await obter_usuario_por_id(db, usuario_id)
+    if usuario:
+        usuario.is_active = False
+        await db.commit()
+        await db.refresh(usuario)
+        cache_tokens.invalidar_usuario(usuario_id)
+    return usuario
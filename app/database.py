@@ -1,20 +1,206 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import os
-from dotenv import load_dotenv
+import threading
+import time
 
-load_dotenv()
+from app.metricas import instrumentar_engine
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./booking.db")
 
-engine = create_engine(DATABASE_URL)
+# Modo assíncrono: endpoints async def com AsyncSession (aiosqlite/asyncpg)
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "sim")
+
+# Pool de conexões
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "sim")
+
+# SQLite: WAL permite leitores concorrentes com um escritor; busy_timeout faz
+# escritas concorrentes esperarem em vez de falhar com "database is locked"
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+def _url_async(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono equivalente"""
+    driver, _, resto = url.partition("://")
+    dialeto = driver.split("+")[0]
+    if dialeto == "sqlite":
+        return f"sqlite+aiosqlite://{resto}"
+    if dialeto in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{resto}"
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _url_async(DATABASE_URL))
+
+class _MedicaoEspera:
+    """Mede quanto tempo as requisições esperam por uma conexão do pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_medicao = threading.Lock()
+        self.checkouts = 0
+        self.espera_total_s = 0.0
+        self.espera_max_s = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._lock_medicao:
+                self.timeouts += 1
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._lock_medicao:
+                self.checkouts += 1
+                self.espera_total_s += espera
+                self.espera_max_s = max(self.espera_max_s, espera)
+
+class PoolMedido(_MedicaoEspera, QueuePool):
+    pass
+
+class PoolMedidoAsync(_MedicaoEspera, AsyncAdaptedQueuePool):
+    pass
+
+def _eh_sqlite_memoria(url: str) -> bool:
+    caminho = url.partition("://")[2]
+    return caminho in ("", "/", "/:memory:") or "mode=memory" in caminho
+
+def _configurar_sqlite(dbapi_connection, connection_record):
+    """PRAGMAs aplicados a cada nova conexão SQLite"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    cursor.close()
+
+def _opcoes_engine(url: str, poolclass):
+    opcoes = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        # A mesma conexão é usada por threads diferentes do threadpool (nunca ao mesmo tempo)
+        opcoes["connect_args"] = {"check_same_thread": False}
+    if not (url.startswith("sqlite") and _eh_sqlite_memoria(url)):
+        opcoes.update(
+            poolclass=poolclass,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_POOL_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return opcoes
+
+def criar_engine(url: str = DATABASE_URL):
+    """Cria a engine síncrona com o pool e os PRAGMAs configurados por ambiente"""
+    engine = create_engine(url, **_opcoes_engine(url, PoolMedido))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _configurar_sqlite)
+    instrumentar_engine(engine)
+    return engine
+
+def estatisticas_pool(engine):
+    """Estado atual do pool de conexões de uma engine (síncrona ou assíncrona)"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    estatisticas = {"tipo": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        estatisticas.update(
+            tamanho=pool.size(),
+            em_uso=pool.checkedout(),
+            ociosas=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, _MedicaoEspera):
+        with pool._lock_medicao:
+            estatisticas.update(
+                checkouts=pool.checkouts,
+                espera_media_ms=round(pool.espera_total_s / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+                espera_max_ms=round(pool.espera_max_s * 1000, 3),
+                timeouts=pool.timeouts,
+            )
+    return estatisticas
+
+engine = criar_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+# Criados sob demanda: o driver assíncrono só é exigido com DB_ASYNC ligado
+async_engine = None
+AsyncSessionLocal = None
+
+class LimiteSessoes:
+    """
+    Limita as sessões abertas ao mesmo tempo à capacidade do pool.
+    
+    Endpoints síncronos usam o threadpool duas vezes (execução e validação da
+    resposta) segurando a conexão entre elas. Sem limite, todas as threads podem
+    ficar esperando conexões presas em requisições que esperam uma thread.
+    Com o limite, a espera acontece no event loop, antes de ocupar uma thread.
+    """
+
+    def __init__(self, capacidade: int):
+        self.capacidade = capacidade
+        self.aguardando = 0
+        self._semaforo = None
+        self._loop = None
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaforo = asyncio.Semaphore(self.capacidade)
+            self._loop = loop
+        self.aguardando += 1
+        try:
+            await self._semaforo.acquire()
+        finally:
+            self.aguardando -= 1
+
+    async def __aexit__(self, *erro):
+        self._semaforo.release()
+
+limite_sessoes = LimiteSessoes(
+    DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW if DB_POOL_MAX_OVERFLOW >= 0 else 10_000
+)
+
+async def get_db():
+    async with limite_sessoes:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            # close() devolve a conexão ao pool (rollback: ida e volta ao banco);
+            # no threadpool, para não parar o event loop
+            await run_in_threadpool(db.close)
+
+def obter_engine_async():
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, **_opcoes_engine(ASYNC_DATABASE_URL, PoolMedidoAsync))
+        if async_engine.dialect.name == "sqlite":
+            event.listen(async_engine.sync_engine, "connect", _configurar_sqlite)
+        instrumentar_engine(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return async_engine
+
+async def get_db_async():
+    obter_engine_async()
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+async def fechar_engine_async():
+    """Fecha as conexões do pool assíncrono (as do aiosqlite mantêm uma thread cada)"""
+    global async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+        AsyncSessionLocal = None
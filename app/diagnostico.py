@@ -0,0 +1,33 @@
+"""
+Estatísticas internas do processo, servidas em /diagnostico nos dois modos
+(síncrono e DB_ASYNC).
+"""
+from app import database
+from app.auth.cache import cache_tokens
+from app.auth.senhas import pool_senhas
+from app.crud.idempotency import idempotencia
+from app.services.agendador import agendador
+from app.services.cache import cache_catalogo
+from app.services.disponibilidade import motor_disponibilidade
+from app.services.limites import limite_taxa
+from app.services.tempo_real import broker_eventos
+
+def estatisticas_processo() -> dict:
+    """Pool de conexões, motor de disponibilidade, caches, idempotência e limite de taxa"""
+    dados = {
+        "pool": {
+            **database.estatisticas_pool(database.engine),
+            "sessoes_aguardando": database.limite_sessoes.aguardando
+        },
+        "motor_disponibilidade": motor_disponibilidade.estatisticas(),
+        "cache_tokens": cache_tokens.estatisticas(),
+        "cache_catalogo": cache_catalogo.estatisticas(),
+        "senhas": pool_senhas.estatisticas(),
+        "agendador": agendador.estatisticas(),
+        "idempotencia": idempotencia.estatisticas(),
+        "tempo_real": broker_eventos.estatisticas(),
+        "limite_taxa": limite_taxa.estatisticas()
+    }
+    if database.async_engine is not None:
+        dados["pool_async"] = database.estatisticas_pool(database.async_engine)
+    return dados
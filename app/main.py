@@ -1,16 +1,32 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import date, datetime
+from typing import List, Optional
 
-from app.database import get_db, engine, Base
+from app import database
+from app.database import get_db, engine, DB_ASYNC
 from app.models import user, space, booking
+from app.models.booking import BookingStatus
 from app.schemas import user as user_schemas, space as space_schemas, booking as booking_schemas
 from app.crud import user as user_crud, space as space_crud, booking as booking_crud
-from app.auth.security import obter_usuario_atual, criar_token_acesso, verificar_token
-
-# Criar tabelas no banco
-Base.metadata.create_all(bind=engine)
+from app.crud import recurring_booking as recorrencia_crud, space_occupancy as ocupacao_crud
+from app.crud import space_pricing as precos_crud
+from app.auth.security import security, criar_token_acesso, verificar_token
+from app.auth.cache import cache_tokens, UsuarioSessao
+from app.auth.senhas import pool_senhas
+from app.diagnostico import estatisticas_processo
+from app.metricas import METRICAS_ATIVAS, MiddlewareMetricas, metricas
+from app.services.agendador import AGENDADOR_ATIVO, agendador
+from app.services.cache import cache_catalogo, resposta_em_cache
+from app.services.serializacao import RespostaJSON, para_json, reserva_com_inclusoes
+from app.services.limites import LIMITE_TAXA_ATIVO, MiddlewareLimiteTaxa
+from app.services.exportacao import FORMATOS, consulta_exportacao, exportar_reservas, usuario_da_exportacao, validar_filtros
+from app.utils.paginacao import decodificar_cursor, montar_pagina
+from app.rotas_tempo_real import router as rotas_tempo_real
 
 app = FastAPI(
     title="Booking System API",
@@ -18,6 +34,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Antes do CORS (fica dentro dele): o 429 também leva os cabeçalhos de CORS e entra nas métricas
+if LIMITE_TAXA_ATIVO:
+    app.add_middleware(MiddlewareLimiteTaxa)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -26,26 +46,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Por último: o middleware mais externo mede a requisição inteira
+if METRICAS_ATIVAS:
+    app.add_middleware(MiddlewareMetricas)
+
 # Dependência para obter usuário atual (AGORA CORRIGIDA)
 def obter_usuario_logado(
-    token_data: dict = Depends(obter_usuario_atual),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
     """
-    Obtém o usuário atual a partir do token JWT
+    Obtém o usuário atual a partir do token JWT.
+    Tokens já verificados vêm do cache, sem decodificar o JWT nem consultar o banco.
     """
-    user_email = token_data.get("sub")
-    if not user_email:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido"
-        )
+    token = credentials.credentials
+    verificado = cache_tokens.obter(token)
+    if verificado is None:
+        token_data = verificar_token(token)
+        usuario_id = token_data.get("uid")
+        user_email = token_data.get("sub")
+        if not user_email:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido"
+            )
+        
+        # Antes da consulta: uma invalidação durante ela impede guardar o retrato
+        geracao = cache_tokens.geracao(usuario_id)
+        # Tokens antigos só têm o email; os novos trazem o id
+        if usuario_id:
+            db_usuario = user_crud.obter_usuario_por_id(db, usuario_id)
+        else:
+            db_usuario = user_crud.obter_usuario_por_email(db, user_email)
+        if not db_usuario:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuário não encontrado"
+            )
+        
+        usuario = UsuarioSessao(db_usuario.id, db_usuario.email, db_usuario.is_active)
+        cache_tokens.guardar(token, token_data, usuario, geracao)
+    else:
+        usuario = verificado.usuario
     
-    usuario = user_crud.obter_usuario_por_email(db, user_email)
-    if not usuario:
+    if not usuario.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário não encontrado"
+            detail="Usuário inativo"
         )
     
     return usuario
@@ -62,6 +109,21 @@ def read_root():
 def health_check():
     return {"status": "healthy", "service": "booking-system"}
 
+@app.get("/diagnostico")
+def diagnostico(usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)):
+    """
+    Estatísticas internas do processo: pool de conexões, motor de disponibilidade, caches, idempotência e limite de taxa
+    """
+    return estatisticas_processo()
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def exportar_metricas():
+    """
+    Métricas por rota no formato do Prometheus: latência, consultas SQL,
+    tempo no banco, consultas lentas e suspeitas de N+1
+    """
+    return PlainTextResponse(metricas.exportar(), media_type="text/plain; version=0.0.4")
+
 # ========== ENDPOINTS DE AUTENTICAÇÃO ==========
 
 @app.post("/auth/registrar", response_model=user_schemas.UsuarioResposta)
@@ -88,44 +150,117 @@ def login(login_data: user_schemas.UsuarioLogin, db: Session = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas"
         )
-    access_token = criar_token_acesso(data={"sub": usuario.email})
+    access_token = criar_token_acesso({"sub": usuario.email, "uid": usuario.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/auth/me", response_model=user_schemas.UsuarioResposta)
-def obter_usuario_logado_endpoint(usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)):
+def obter_usuario_logado_endpoint(
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
     """
     Obter informações do usuário logado
     """
-    return usuario_atual
+    return user_crud.obter_usuario_por_id(db, usuario_atual.id)
+
+@app.put("/auth/me", response_model=user_schemas.UsuarioResposta)
+def atualizar_usuario_logado(
+    dados: user_schemas.UsuarioAtualizar,
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Atualizar nome e/ou senha do usuário logado
+    """
+    return user_crud.atualizar_usuario(db, usuario_atual.id, dados)
+
+@app.delete("/auth/me")
+def desativar_usuario_logado(
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Desativar a conta do usuário logado (os tokens deixam de valer)
+    """
+    user_crud.desativar_usuario(db, usuario_atual.id)
+    return {"message": "Conta desativada com sucesso"}
 
 # ========== ENDPOINTS DE ESPAÇOS ==========
 
-@app.get("/espacos/", response_model=List[space_schemas.EspacoResposta])
+@app.get("/espacos/", response_model=space_schemas.PaginaEspacos)
 def listar_espacos(
-    skip: int = 0, 
-    limit: int = 100, 
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    capacidade_min: Optional[int] = Query(None, ge=1),
+    preco_min: Optional[float] = Query(None, ge=0),
+    preco_max: Optional[float] = Query(None, ge=0),
     db: Session = Depends(get_db)
 ):
     """
-    Listar todos os espaços disponíveis
+    Listar os espaços disponíveis, paginados por cursor (use `next_cursor`).
+    Resposta em cache com ETag: If-None-Match com o ETag atual devolve 304
     """
-    return space_crud.obter_espacos(db, skip=skip, limit=limit)
+    apos_id = decodificar_cursor(cursor, int)[0] if cursor else None
+
+    def calcular():
+        espacos = space_crud.obter_espacos_serializados(
+            db, limit=limit + 1, apos_id=apos_id,
+            capacidade_min=capacidade_min, preco_min=preco_min, preco_max=preco_max
+        )
+        return para_json(montar_pagina(espacos, limit, lambda e: (e["id"],)))
+
+    return resposta_em_cache(cache_catalogo, request, calcular)
 
 @app.get("/espacos/{espaco_id}", response_model=space_schemas.EspacoResposta)
-def obter_espaco(espaco_id: int, db: Session = Depends(get_db)):
+def obter_espaco(espaco_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Obter detalhes de um espaço específico (em cache, com ETag)
+    """
+    def calcular():
+        espaco = space_crud.obter_espaco_serializado(db, espaco_id)
+        if not espaco:
+            raise HTTPException(status_code=404, detail="Espaço não encontrado")
+        return para_json(espaco)
+
+    return resposta_em_cache(cache_catalogo, request, calcular)
+
+@app.get("/espacos/{espaco_id}/calendario", response_model=space_schemas.CalendarioEspaco)
+def obter_calendario_espaco(
+    espaco_id: int,
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
     """
-    Obter detalhes de um espaço específico
+    Ocupação diária do espaço em slots de 15 minutos (padrão: mês corrente)
     """
     espaco = space_crud.obter_espaco_por_id(db, espaco_id)
     if not espaco:
         raise HTTPException(status_code=404, detail="Espaço não encontrado")
-    return espaco
+    inicio, fim = ocupacao_crud.periodo_calendario(inicio, fim)
+    return (ocupacao_crud.obter_calendarios(db, [espaco_id], inicio, fim))[0]
+
+@app.get("/calendario", response_model=List[space_schemas.CalendarioEspaco])
+def obter_calendarios(
+    espaco_ids: Optional[List[int]] = Query(None, max_length=500),
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Ocupação diária de vários espaços em uma única leitura (padrão: mês corrente)
+    """
+    if not espaco_ids:
+        raise HTTPException(status_code=400, detail="Informe ao menos um espaco_ids")
+    inicio, fim = ocupacao_crud.periodo_calendario(inicio, fim)
+    return ocupacao_crud.obter_calendarios(db, list(dict.fromkeys(espaco_ids)), inicio, fim)
 
 @app.post("/espacos/", response_model=space_schemas.EspacoResposta)
 def criar_espaco(
     espaco_data: space_schemas.EspacoCriar,
     db: Session = Depends(get_db),
-    usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
 ):
     """
     Criar novo espaço (requer autenticação)
@@ -137,7 +272,7 @@ def atualizar_disponibilidade_espaco(
     espaco_id: int,
     disponivel: bool,
     db: Session = Depends(get_db),
-    usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
 ):
     """
     Atualizar disponibilidade de um espaço (requer autenticação)
@@ -147,20 +282,49 @@ def atualizar_disponibilidade_espaco(
         raise HTTPException(status_code=404, detail="Espaço não encontrado")
     
     status_msg = "disponível" if disponivel else "indisponível"
-    return {"message": f"Espaço {espaco.nome} agora está {status_msg}"}
+    return {"message": f"Espaço {espaco.name} agora está {status_msg}"}
+
+@app.get("/espacos/{espaco_id}/precos", response_model=space_schemas.RegrasPrecoResposta)
+def obter_regras_preco(espaco_id: int, db: Session = Depends(get_db)):
+    """
+    Regras de preço do espaço (faixas de horário e descontos por duração)
+    """
+    return precos_crud.obter_regras_preco(db, espaco_id)
+
+@app.put("/espacos/{espaco_id}/precos", response_model=space_schemas.RegrasPrecoResposta)
+def substituir_regras_preco(
+    espaco_id: int,
+    regras: space_schemas.RegrasPreco,
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Substituir as regras de preço do espaço (requer autenticação; vale para novas reservas)
+    """
+    return precos_crud.substituir_regras_preco(db, espaco_id, regras.regras)
 
 # ========== ENDPOINTS DE RESERVAS ==========
 
 @app.post("/reservas/", response_model=booking_schemas.ReservaResposta)
 def criar_reserva(
     reserva_data: booking_schemas.ReservaCriar,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     db: Session = Depends(get_db),
-    usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
 ):
     """
-    Criar nova reserva
+    Criar nova reserva. Com o cabeçalho Idempotency-Key, repetir a requisição
+    devolve a mesma resposta sem criar outra reserva (Idempotent-Replayed: true)
     """
     try:
+        if idempotency_key:
+            status_code, corpo, repetida = booking_crud.criar_reserva_idempotente(
+                db, reserva_data, usuario_atual.id, idempotency_key
+            )
+            return Response(
+                content=corpo, status_code=status_code, media_type="application/json",
+                headers={"Idempotent-Replayed": "true" if repetida else "false"}
+            )
         return booking_crud.criar_reserva(db, reserva_data, usuario_atual.id)
     except HTTPException as e:
         raise e
@@ -170,26 +334,132 @@ def criar_reserva(
             detail=str(e)
         )
 
-@app.get("/reservas/minhas", response_model=List[booking_schemas.ReservaResposta])
+@app.post("/reservas/lote", response_model=booking_schemas.RespostaLote)
+def criar_reservas_lote(
+    lote: booking_schemas.ReservaLote,
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Criar várias reservas em uma única transação, com um resultado por item
+    """
+    return booking_crud.criar_reservas_lote(db, lote.reservas, usuario_atual.id, lote.modo)
+
+@app.post("/reservas/recorrentes", response_model=booking_schemas.ResultadoRecorrencia)
+def criar_reserva_recorrente(
+    dados: booking_schemas.ReservaRecorrenteCriar,
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Criar reserva recorrente (regra no estilo RRULE, ex.: FREQ=WEEKLY;BYDAY=MO;COUNT=10)
+    """
+    return recorrencia_crud.criar_reserva_recorrente(db, dados, usuario_atual.id)
+
+@app.get("/reservas/recorrentes/{serie_id}", response_model=booking_schemas.ReservaRecorrenteResposta)
+def obter_reserva_recorrente(
+    serie_id: int,
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Obter detalhes de uma reserva recorrente
+    """
+    serie = recorrencia_crud.obter_reserva_recorrente(db, serie_id, usuario_atual.id)
+    if not serie:
+        raise HTTPException(status_code=404, detail="Reserva recorrente não encontrada")
+    return serie
+
+@app.get("/reservas/recorrentes/{serie_id}/ocorrencias", response_model=List[booking_schemas.OcorrenciaResposta])
+def listar_ocorrencias(
+    serie_id: int,
+    desde: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Listar as ocorrências da série, calculadas a partir da regra
+    """
+    serie = recorrencia_crud.obter_reserva_recorrente(db, serie_id, usuario_atual.id)
+    if not serie:
+        raise HTTPException(status_code=404, detail="Reserva recorrente não encontrada")
+    return recorrencia_crud.listar_ocorrencias(serie, desde, limit)
+
+@app.post("/reservas/recorrentes/{serie_id}/cancelar")
+def cancelar_reserva_recorrente(
+    serie_id: int,
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Cancelar reserva recorrente e suas ocorrências futuras
+    """
+    return recorrencia_crud.cancelar_reserva_recorrente(db, serie_id, usuario_atual.id)
+
+@app.get("/reservas/minhas", response_model=booking_schemas.PaginaReservas)
 def listar_minhas_reservas(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_reserva: Optional[BookingStatus] = Query(None, alias="status"),
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None,
+    include: Optional[str] = Query(None, description="Relacionados aninhados na resposta: space, user"),
+    historico: bool = Query(False, description="Inclui as reservas encerradas já arquivadas"),
     db: Session = Depends(get_db),
-    usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
 ):
     """
-    Listar todas as reservas do usuário logado
+    Listar as reservas do usuário logado, da mais recente para a mais antiga,
+    paginadas por cursor (use `next_cursor`). Com `include=space,user`, cada
+    reserva traz o espaço e/ou o usuário, com uma consulta a mais por relacionamento.
+    Reservas concluídas/canceladas antigas ficam no arquivo e só aparecem com `historico=true`
     """
-    return booking_crud.obter_reservas_usuario(db, usuario_atual.id)
+    apos = decodificar_cursor(cursor, datetime, int) if cursor else None
+    reservas = booking_crud.obter_reservas_usuario_serializadas(
+        db, usuario_atual.id, limit=limit + 1, apos=apos,
+        inclusoes=booking_crud.interpretar_inclusoes(include),
+        status=status_reserva, inicio=inicio, fim=fim, historico=historico
+    )
+    return RespostaJSON(montar_pagina(reservas, limit, lambda r: (r["start_time"], r["id"])))
 
-@app.get("/reservas/{reserva_id}", response_model=booking_schemas.ReservaResposta)
+@app.get("/reservas/exportar")
+def exportar_reservas_endpoint(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    espaco_id: Optional[int] = None,
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Exportar as suas reservas de um espaço e/ou que se sobrepõem a um período
+    (inicio e fim, até EXPORTACAO_MAX_DIAS) em NDJSON ou CSV, transmitidas em
+    streaming (requer autenticação)
+    """
+    validar_filtros(espaco_id, inicio, fim)
+    if espaco_id is not None and not space_crud.obter_espaco_por_id(db, espaco_id):
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    
+    consulta = consulta_exportacao(espaco_id, inicio, fim, usuario_da_exportacao(usuario_atual))
+    return StreamingResponse(
+        exportar_reservas(engine, consulta, formato),
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="reservas.{formato}"'}
+    )
+
+@app.get("/reservas/{reserva_id}", response_model=booking_schemas.ReservaDetalhada)
 def obter_reserva(
     reserva_id: int,
+    include: Optional[str] = Query(None, description="Relacionados aninhados na resposta: space, user"),
     db: Session = Depends(get_db),
-    usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
 ):
     """
-    Obter detalhes de uma reserva específica
+    Obter detalhes de uma reserva específica (`include=space,user` para aninhar os relacionados)
     """
-    reserva = booking_crud.obter_reserva_por_id(db, reserva_id)
+    inclusoes = booking_crud.interpretar_inclusoes(include)
+    reserva = booking_crud.obter_reserva_por_id(db, reserva_id, inclusoes)
     if not reserva:
         raise HTTPException(status_code=404, detail="Reserva não encontrada")
     
@@ -200,13 +470,13 @@ def obter_reserva(
             detail="Não autorizado a acessar esta reserva"
         )
     
-    return reserva
+    return RespostaJSON(reserva_com_inclusoes(reserva, inclusoes))
 
 @app.post("/reservas/{reserva_id}/cancelar")
 def cancelar_reserva(
     reserva_id: int,
     db: Session = Depends(get_db),
-    usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
 ):
     """
     Cancelar uma reserva
@@ -222,6 +492,13 @@ def cancelar_reserva(
             detail=str(e)
         )
 
+@app.post("/reservas/cotacao", response_model=booking_schemas.RespostaCotacao)
+def cotar_reservas(pedido: booking_schemas.PedidoCotacao, db: Session = Depends(get_db)):
+    """
+    Preço de até 1000 intervalos (sem reservar), com as regras de preço de cada espaço
+    """
+    return RespostaJSON({"itens": precos_crud.cotar(db, pedido.itens)})
+
 @app.post("/reservas/verificar-disponibilidade")
 def verificar_disponibilidade(
     disponibilidade: booking_schemas.VerificarDisponibilidade,
@@ -244,18 +521,38 @@ def verificar_disponibilidade(
     return {
         "disponivel": esta_disponivel,
         "espaco_id": disponibilidade.space_id,
-        "espaco_nome": espaco.nome,
+        "espaco_nome": espaco.name,
         "inicio": disponibilidade.start_time,
         "fim": disponibilidade.end_time
     }
 
+@app.get("/disponibilidade/buscar", response_model=List[booking_schemas.JanelaLivre])
+def buscar_disponibilidade(
+    inicio: datetime,
+    fim: datetime,
+    duracao_minutos: int = Query(..., ge=1),
+    capacidade_min: Optional[int] = Query(None, ge=1),
+    preco_max: Optional[float] = Query(None, ge=0),
+    horario_comercial: bool = False,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Buscar as primeiras janelas livres, entre todos os espaços que atendem aos filtros
+    """
+    return booking_crud.buscar_janelas_livres(
+        db, inicio, fim, duracao_minutos,
+        capacidade_min=capacidade_min, preco_max=preco_max,
+        horario_comercial=horario_comercial, limite=limit
+    )
+
 @app.get("/espacos/{espaco_id}/reservas")
 def listar_reservas_espaco(
     espaco_id: int,
     inicio: str = None,
     fim: str = None,
     db: Session = Depends(get_db),
-    usuario_atual: user_schemas.UsuarioResposta = Depends(obter_usuario_logado)
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
 ):
     """
     Listar reservas de um espaço em um período (requer autenticação)
@@ -278,4 +575,70 @@ def listar_reservas_espaco(
         fim = datetime.fromisoformat(fim)
     
     reservas = booking_crud.obter_reservas_por_espaco(db, espaco_id, inicio, fim)
-    return reservas
\ No newline at end of file
+    return reservas
+
+# ========== TEMPO REAL ==========
+
+# WebSocket/SSE não usam o banco: as mesmas rotas nos dois modos
+app.include_router(rotas_tempo_real)
+
+# ========== MODO ASSÍNCRONO ==========
+
+def _usa_dependencia(dependant, dependencia) -> bool:
+    return any(
+        sub.call is dependencia or _usa_dependencia(sub, dependencia)
+        for sub in dependant.dependencies
+    )
+
+def substituir_rotas(app: FastAPI, router: APIRouter):
+    """
+    Troca as rotas síncronas pelas equivalentes do router (mesmo caminho e método),
+    mantendo a ordem original de resolução das rotas. Rotas sem banco (/, /health,
+    /metrics) ficam as mesmas; uma rota que usa a sessão síncrona (get_db) sem
+    equivalente no router é um erro, em vez de ficar silenciosamente no modo síncrono.
+    """
+    quantidade_antes = len(app.router.routes)
+    app.include_router(router)
+    novas = {
+        (rota.path, metodo): rota
+        for rota in app.router.routes[quantidade_antes:]
+        for metodo in rota.methods
+    }
+    
+    rotas = []
+    usadas = set()
+    for rota in app.router.routes[:quantidade_antes]:
+        if isinstance(rota, APIRoute):
+            substituta = next((novas[(rota.path, m)] for m in rota.methods if (rota.path, m) in novas), None)
+            if substituta is not None:
+                if id(substituta) not in usadas:
+                    rotas.append(substituta)
+                    usadas.add(id(substituta))
+                continue
+        rotas.append(rota)
+    rotas.extend(rota for rota in app.router.routes[quantidade_antes:] if id(rota) not in usadas)
+    app.router.routes[:] = rotas
+    
+    sem_versao_async = sorted(
+        f"{metodo} {rota.path}"
+        for rota in rotas
+        if isinstance(rota, APIRoute) and id(rota) not in usadas and _usa_dependencia(rota.dependant, get_db)
+        for metodo in rota.methods
+    )
+    if sem_versao_async:
+        raise RuntimeError(f"Rotas sem versão assíncrona (DB_ASYNC): {', '.join(sem_versao_async)}")
+
+if DB_ASYNC:
+    from app.rotas_async import router as rotas_async
+    substituir_rotas(app, rotas_async)
+
+@app.on_event("startup")
+async def iniciar_agendador():
+    if AGENDADOR_ATIVO:
+        agendador.iniciar()
+
+@app.on_event("shutdown")
+async def fechar_conexoes():
+    await agendador.parar()
+    await database.fechar_engine_async()
+    pool_senhas.encerrar()
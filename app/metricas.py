@@ -0,0 +1,231 @@
+"""
+Métricas de desempenho por rota, no formato de texto do Prometheus (/metrics).
+
+Um middleware ASGI mede cada requisição (latência e status) e abre uma medição
+em uma ContextVar; os eventos before/after_cursor_execute das engines (ligados
+em app/database.py) somam nela as consultas SQL e o tempo no banco. A ContextVar
+acompanha a requisição no threadpool dos endpoints síncronos e nos greenlets
+do modo assíncrono. Consultas fora de requisições entram com rota "-".
+
+Além dos totais, cada consulta acima do limite vai para o log com os parâmetros,
+e uma requisição que repete a mesma consulta muitas vezes é registrada como
+suspeita de N+1.
+
+Configuração (variáveis de ambiente):
+    METRICAS_ATIVAS           liga o middleware e os eventos de SQL
+    METRICAS_SQL_LENTA_MS     consultas acima deste tempo vão para o log
+    METRICAS_N_MAIS_1_LIMITE  repetições da mesma consulta em uma requisição para acusar N+1
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+METRICAS_ATIVAS = os.getenv("METRICAS_ATIVAS", "true").lower() in ("1", "true", "sim")
+METRICAS_SQL_LENTA_MS = float(os.getenv("METRICAS_SQL_LENTA_MS", "200"))
+METRICAS_N_MAIS_1_LIMITE = int(os.getenv("METRICAS_N_MAIS_1_LIMITE", "10"))
+
+LIMITES_LATENCIA_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_CONSULTAS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+# Rótulo das consultas feitas fora de uma requisição (CLI, benchmarks, tarefas)
+SEM_ROTA = "-"
+
+logger = logging.getLogger(__name__)
+
+class MedicaoRequisicao:
+    """Consultas SQL de uma requisição em andamento"""
+    __slots__ = ("scope", "consultas", "tempo_sql_s", "repeticoes")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.consultas = 0
+        self.tempo_sql_s = 0.0
+        self.repeticoes = defaultdict(int)
+
+    @property
+    def rota(self) -> str:
+        """Caminho da rota (o modelo, não a URL, para não multiplicar as séries)"""
+        rota = self.scope.get("route")
+        if rota is not None:
+            return rota.path
+        # Rotas do Starlette (ex.: /docs) só preenchem o endpoint
+        return "outras" if "endpoint" in self.scope else "nao_encontrada"
+
+_medicao_atual: ContextVar[Optional[MedicaoRequisicao]] = ContextVar("medicao_requisicao", default=None)
+
+class _Histograma:
+    __slots__ = ("contagens", "soma", "total")
+
+    def __init__(self, quantidade_limites: int):
+        self.contagens = [0] * (quantidade_limites + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, limites: tuple, valor: float):
+        self.contagens[bisect_left(limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _rotulos(**rotulos) -> str:
+    return ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos.items())
+
+class Metricas:
+    """Registro das métricas do processo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requisicoes = defaultdict(int)          # (metodo, rota, status) -> n
+        self.latencia = {}                           # (metodo, rota) -> _Histograma
+        self.consultas_por_requisicao = {}           # (metodo, rota) -> _Histograma
+        self.consultas = defaultdict(int)            # rota -> n
+        self.tempo_sql_s = defaultdict(float)        # rota -> s
+        self.consultas_lentas = defaultdict(int)     # rota -> n
+        self.n_mais_1 = defaultdict(int)             # rota -> n
+
+    def registrar_consulta(self, statement: str, parametros, duracao_s: float):
+        medicao = _medicao_atual.get()
+        if medicao is not None:
+            medicao.consultas += 1
+            medicao.tempo_sql_s += duracao_s
+            medicao.repeticoes[statement] += 1
+            rota = None
+        else:
+            rota = SEM_ROTA
+            with self._lock:
+                self.consultas[rota] += 1
+                self.tempo_sql_s[rota] += duracao_s
+
+        if duracao_s * 1000 >= METRICAS_SQL_LENTA_MS:
+            rota = rota or medicao.rota
+            with self._lock:
+                self.consultas_lentas[rota] += 1
+            logger.warning(
+                "Consulta lenta (%.1f ms) em %s: %s | parâmetros: %.500r",
+                duracao_s * 1000, rota, " ".join(statement.split()), parametros
+            )
+
+    def registrar_requisicao(self, metodo: str, status: int, duracao_s: float, medicao: MedicaoRequisicao):
+        rota = medicao.rota
+        repetida, repeticoes = max(medicao.repeticoes.items(), key=lambda item: item[1], default=(None, 0))
+        chave = (metodo, rota)
+        with self._lock:
+            self.requisicoes[(metodo, rota, status)] += 1
+            if chave not in self.latencia:
+                self.latencia[chave] = _Histograma(len(LIMITES_LATENCIA_S))
+                self.consultas_por_requisicao[chave] = _Histograma(len(LIMITES_CONSULTAS))
+            self.latencia[chave].observar(LIMITES_LATENCIA_S, duracao_s)
+            self.consultas_por_requisicao[chave].observar(LIMITES_CONSULTAS, medicao.consultas)
+            self.consultas[rota] += medicao.consultas
+            self.tempo_sql_s[rota] += medicao.tempo_sql_s
+            if repeticoes >= METRICAS_N_MAIS_1_LIMITE:
+                self.n_mais_1[rota] += 1
+        if repeticoes >= METRICAS_N_MAIS_1_LIMITE:
+            logger.warning(
+                "Possível N+1 em %s %s: a mesma consulta executada %s vezes: %s",
+                metodo, rota, repeticoes, " ".join(repetida.split())
+            )
+
+    def _linhas_histograma(self, nome: str, limites: tuple, histogramas: dict):
+        for (metodo, rota), histograma in sorted(histogramas.items()):
+            acumulado = 0
+            for limite, contagem in zip(limites + ("+Inf",), histograma.contagens):
+                acumulado += contagem
+                yield f"{nome}_bucket{{{_rotulos(metodo=metodo, rota=rota, le=limite)}}} {acumulado}"
+            yield f"{nome}_sum{{{_rotulos(metodo=metodo, rota=rota)}}} {histograma.soma}"
+            yield f"{nome}_count{{{_rotulos(metodo=metodo, rota=rota)}}} {histograma.total}"
+
+    def exportar(self) -> str:
+        """Todas as métricas no formato de exposição em texto do Prometheus"""
+        linhas = []
+
+        def metrica(nome: str, tipo: str, ajuda: str):
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+
+        with self._lock:
+            metrica("booking_requisicoes_total", "counter", "Requisições por rota e status")
+            for (metodo, rota, status), total in sorted(self.requisicoes.items()):
+                linhas.append(f"booking_requisicoes_total{{{_rotulos(metodo=metodo, rota=rota, status=status)}}} {total}")
+
+            metrica("booking_requisicao_duracao_segundos", "histogram", "Latência das requisições por rota")
+            linhas.extend(self._linhas_histograma(
+                "booking_requisicao_duracao_segundos", LIMITES_LATENCIA_S, self.latencia
+            ))
+
+            metrica("booking_requisicao_consultas_sql", "histogram", "Consultas SQL por requisição, por rota")
+            linhas.extend(self._linhas_histograma(
+                "booking_requisicao_consultas_sql", LIMITES_CONSULTAS, self.consultas_por_requisicao
+            ))
+
+            for nome, tipo, ajuda, valores in (
+                ("booking_sql_consultas_total", "counter", "Consultas SQL executadas por rota", self.consultas),
+                ("booking_sql_duracao_segundos_total", "counter", "Tempo total no banco por rota", self.tempo_sql_s),
+                ("booking_sql_lentas_total", "counter", f"Consultas acima de {METRICAS_SQL_LENTA_MS:g} ms por rota", self.consultas_lentas),
+                ("booking_sql_n_mais_1_total", "counter", "Requisições com a mesma consulta repetida (possível N+1)", self.n_mais_1),
+            ):
+                metrica(nome, tipo, ajuda)
+                for rota, valor in sorted(valores.items()):
+                    linhas.append(f"{nome}{{{_rotulos(rota=rota)}}} {valor}")
+        return "\n".join(linhas) + "\n"
+
+metricas = Metricas()
+
+class MiddlewareMetricas:
+    """Middleware ASGI que mede cada requisição HTTP, inclusive o envio do corpo"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        medicao = MedicaoRequisicao(scope)
+        token = _medicao_atual.set(medicao)
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _medicao_atual.reset(token)
+            metricas.registrar_requisicao(scope["method"], status, time.perf_counter() - inicio, medicao)
+
+def _antes_da_consulta(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+def _depois_da_consulta(conn, cursor, statement, parameters, context, executemany):
+    duracao = time.perf_counter() - conn.info["inicio_consultas"].pop()
+    metricas.registrar_consulta(statement, parameters, duracao)
+
+def _erro_na_consulta(contexto):
+    # Sem after_cursor_execute, o início da consulta que falhou ficaria na pilha
+    # (ExceptionContext nem sempre tem `cursor`; o execution_context existe quando a consulta foi montada)
+    if contexto.connection is not None and contexto.execution_context is not None:
+        inicios = contexto.connection.info.get("inicio_consultas")
+        if inicios:
+            inicios.pop()
+
+def instrumentar_engine(engine):
+    """Liga a contagem de consultas a uma engine síncrona (ou à sync_engine da assíncrona)"""
+    if METRICAS_ATIVAS:
+        event.listen(engine, "before_cursor_execute", _antes_da_consulta)
+        event.listen(engine, "after_cursor_execute", _depois_da_consulta)
+        event.listen(engine, "handle_error", _erro_na_consulta)
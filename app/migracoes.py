@@ -0,0 +1,40 @@
+"""
+Esquema do banco pelas migrações do Alembic, como passo explícito.
+
+A aplicação não cria nem altera tabelas ao ser importada: cada worker que sobe
+(e cada reinício do reload) só importa o código. Aplique as migrações no
+deploy, antes de iniciar os workers:
+
+    python gerenciar.py migrar
+
+`python run.py` (desenvolvimento) aplica antes de subir o servidor.
+"""
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+def configuracao_alembic():
+    """Config do alembic.ini do projeto, independente do diretório atual"""
+    from alembic.config import Config
+    config = Config(str(RAIZ / "alembic.ini"))
+    config.set_main_option("script_location", str(RAIZ / "alembic"))
+    return config
+
+def migrar(revisao: str = "head") -> str:
+    """Aplica as migrações até `revisao` e retorna a revisão atual do banco"""
+    from alembic import command
+    from alembic.runtime.migration import MigrationContext
+    from sqlalchemy import inspect
+    from app.database import engine
+
+    with engine.connect() as conexao:
+        tabelas = set(inspect(conexao).get_table_names())
+    if "bookings" in tabelas and "alembic_version" not in tabelas:
+        raise RuntimeError(
+            "Banco criado antes das migrações (via create_all): marque a revisão "
+            "inicial com `alembic stamp 0001` e rode de novo"
+        )
+
+    command.upgrade(configuracao_alembic(), revisao)
+    with engine.connect() as conexao:
+        return MigrationContext.configure(conexao).get_current_revision()
@@ -1,5 +1,10 @@
 from app.models.user import User
 from app.models.space import Space
 from app.models.booking import Booking, BookingStatus
+from app.models.booking_archive import BookingArchive
+from app.models.recurring_booking import RecurringBooking
+from app.models.space_occupancy import SpaceOccupancy
+from app.models.space_price_rule import SpacePriceRule
+from app.models.idempotency_key import IdempotencyKey
 
-__all__ = ["User", "Space", "Booking", "BookingStatus"]
\ No newline at end of file
+__all__ = ["User", "Space", "Booking", "BookingStatus", "BookingArchive", "RecurringBooking", "SpaceOccupancy", "SpacePriceRule", "IdempotencyKey"]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base  # ✅ IMPORTANTE: Importar Base
@@ -12,6 +12,22 @@ class BookingStatus(str, enum.Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Índice de intervalo para a verificação de conflitos: end_time vem antes de
+        # start_time para que a varredura percorra apenas reservas que terminam depois
+        # do início solicitado (o histórico passado do espaço fica fora do range scan)
+        Index("ix_bookings_space_status_intervalo", "space_id", "status", "end_time", "start_time"),
+        # Listagem de reservas do usuário ordenada por início
+        Index("ix_bookings_user_inicio", "user_id", "start_time"),
+        # Listagem filtrada por status, na mesma ordem da paginação
+        Index("ix_bookings_user_status_inicio", "user_id", "status", "start_time"),
+        # Exportação em ordem de início, por espaço ou geral, sem ordenação em memória
+        Index("ix_bookings_space_inicio", "space_id", "start_time"),
+        Index("ix_bookings_inicio", "start_time"),
+        # Transições automáticas: pendentes pela criação (TTL), pendentes e confirmadas pelo fim
+        Index("ix_bookings_status_criacao", "status", "created_at"),
+        Index("ix_bookings_status_fim", "status", "end_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -21,7 +37,10 @@ class Booking(Base):
     status = Column(Enum(BookingStatus), default=BookingStatus.PENDENTE)
     total_price = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Série de origem, quando a reserva é ocorrência de uma reserva recorrente
+    recurring_booking_id = Column(Integer, ForeignKey("recurring_bookings.id"), nullable=True, index=True)
     
-    # Relacionamentos
-    user = relationship("User")
-    space = relationship("Space")
\ No newline at end of file
+    # Relacionamentos: sem carga preguiçosa, que faria uma consulta por reserva
+    # em listagens (N+1). Quem precisa deles pede com selectinload/joinedload.
+    user = relationship("User", lazy="raise_on_sql")
+    space = relationship("Space", lazy="raise_on_sql")
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Enum, Float, Index
+from sqlalchemy.sql import func
+from app.database import Base  # ✅ IMPORTANTE: Importar Base
+from app.models.booking import BookingStatus
+
+class BookingArchive(Base):
+    """
+    Reservas concluídas e canceladas fora da janela de retenção, movidas de
+    `bookings` em lotes (app/crud/booking_archive.py). Mesmas colunas e ids;
+    só entram nas leituras quando o histórico é pedido.
+    """
+    __tablename__ = "bookings_archive"
+    __table_args__ = (
+        # Histórico do usuário, na mesma ordem da paginação de /reservas/minhas
+        Index("ix_bookings_archive_user_inicio", "user_id", "start_time"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    space_id = Column(Integer, ForeignKey("spaces.id"), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    status = Column(Enum(BookingStatus), nullable=False)
+    total_price = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    recurring_booking_id = Column(Integer, ForeignKey("recurring_bookings.id"), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, UniqueConstraint
+from app.database import Base  # ✅ IMPORTANTE: Importar Base
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Key recebida em uma escrita (app/crud/idempotency.py): o hash do
+    pedido e a resposta gravada, devolvida nas repetições até `expires_at`.
+    Sem status_code, a primeira requisição ainda está em processamento.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # Usuário e rota: a mesma chave em usuários ou rotas diferentes não colide
+    scope = Column(String(100), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    # Varredura das expiradas em lotes
+    expires_at = Column(DateTime, nullable=False, index=True)
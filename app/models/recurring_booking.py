@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.database import Base  # ✅ IMPORTANTE: Importar Base
+
+class RecurringBooking(Base):
+    """
+    Série de reservas recorrentes. As ocorrências viram linhas em `bookings`
+    (com recurring_booking_id) até `materialized_until`; as seguintes são
+    calculadas a partir da regra e materializadas conforme o horizonte avança.
+    """
+    __tablename__ = "recurring_bookings"
+    __table_args__ = (
+        # Materialização periódica percorre apenas as séries ativas atrasadas
+        Index("ix_recurring_bookings_ativa_materializada", "is_active", "materialized_until"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    space_id = Column(Integer, ForeignKey("spaces.id"), nullable=False)
+    # Regra no estilo RRULE, ex.: "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=20"
+    rule = Column(String, nullable=False)
+    # Início da primeira ocorrência e duração de cada uma
+    start_time = Column(DateTime, nullable=False)
+    duration_minutes = Column(Integer, nullable=False)
+    materialized_until = Column(DateTime, nullable=True)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relacionamentos
+    user = relationship("User")
+    space = relationship("Space")
@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base  # ✅ IMPORTANTE: Importar Base
 
 class Space(Base):
     __tablename__ = "spaces"
+    __table_args__ = (
+        # Catálogo paginado por id (keyset) e filtros por capacidade e preço,
+        # sempre restritos aos espaços disponíveis
+        Index("ix_spaces_disponivel_id", "is_available", "id"),
+        Index("ix_spaces_disponivel_capacidade", "is_available", "capacity"),
+        Index("ix_spaces_disponivel_preco", "is_available", "price_per_hour"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
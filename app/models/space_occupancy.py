@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Date, LargeBinary, ForeignKey
+from app.database import Base  # ✅ IMPORTANTE: Importar Base
+
+class SpaceOccupancy(Base):
+    """
+    Ocupação de um espaço em um dia, em slots de 15 minutos (ver app/services/ocupacao.py).
+    Dias sem linha estão livres. Mantida pelo CRUD de reservas; pode ser reconstruída
+    com `python gerenciar.py reconstruir-ocupacao`.
+    """
+    __tablename__ = "space_occupancy"
+
+    space_id = Column(Integer, ForeignKey("spaces.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    # Slots com reserva ativa (pendente ou confirmada) e só com reserva confirmada
+    occupied = Column(LargeBinary, nullable=False)
+    confirmed = Column(LargeBinary, nullable=False)
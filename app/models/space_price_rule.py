@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from app.database import Base  # ✅ IMPORTANTE: Importar Base
+
+class SpacePriceRule(Base):
+    """
+    Regra de preço de um espaço (ver app/services/precos.py):
+    kind "faixa" usa weekdays/start_minute/end_minute; "duracao" usa min_duration_minutes.
+    O multiplicador incide sobre price_per_hour (faixa) ou sobre o total (duracao).
+    """
+    __tablename__ = "space_price_rules"
+
+    id = Column(Integer, primary_key=True)
+    space_id = Column(Integer, ForeignKey("spaces.id"), nullable=False, index=True)
+    kind = Column(String(10), nullable=False)
+    # Dias da semana como bits (bit 0 = segunda ... bit 6 = domingo)
+    weekdays = Column(Integer, nullable=True)
+    start_minute = Column(Integer, nullable=True)
+    end_minute = Column(Integer, nullable=True)
+    min_duration_minutes = Column(Integer, nullable=True)
+    multiplier = Column(Float, nullable=False)
@@ -0,0 +1,532 @@
+"""
+Endpoints assíncronos (DB_ASYNC=true).
+
+Mesmas rotas e contratos de app/main.py, servidas com async def e AsyncSession:
+cada requisição aguardando o banco não ocupa uma thread do threadpool.
+"""
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db_async, obter_engine_async
+from app.diagnostico import estatisticas_processo
+from app.models.booking import BookingStatus
+from app.schemas import user as user_schemas, space as space_schemas, booking as booking_schemas
+from app.crud import user_async as user_crud, space_async as space_crud, booking_async as booking_crud
+from app.crud import recurring_booking_async as recorrencia_crud, space_occupancy_async as ocupacao_crud
+from app.crud import space_pricing_async as precos_crud
+from app.auth.security import security, criar_token_acesso, verificar_token
+from app.auth.cache import cache_tokens, UsuarioSessao
+from app.services.cache import cache_catalogo, resposta_em_cache_async
+from app.services.serializacao import RespostaJSON, para_json, reserva_com_inclusoes
+from app.services.exportacao import FORMATOS, consulta_exportacao, exportar_reservas_async, usuario_da_exportacao, validar_filtros
+from app.utils.paginacao import decodificar_cursor, montar_pagina
+
+router = APIRouter()
+
+async def obter_usuario_logado(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Obtém o usuário atual a partir do token JWT.
+    Tokens já verificados vêm do cache, sem decodificar o JWT nem consultar o banco.
+    """
+    token = credentials.credentials
+    verificado = cache_tokens.obter(token)
+    if verificado is None:
+        token_data = verificar_token(token)
+        usuario_id = token_data.get("uid")
+        user_email = token_data.get("sub")
+        if not user_email:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido"
+            )
+        
+        # Antes da consulta: uma invalidação durante ela impede guardar o retrato
+        geracao = cache_tokens.geracao(usuario_id)
+        # Tokens antigos só têm o email; os novos trazem o id
+        if usuario_id:
+            db_usuario = await user_crud.obter_usuario_por_id(db, usuario_id)
+        else:
+            db_usuario = await user_crud.obter_usuario_por_email(db, user_email)
+        if not db_usuario:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuário não encontrado"
+            )
+        
+        usuario = UsuarioSessao(db_usuario.id, db_usuario.email, db_usuario.is_active)
+        cache_tokens.guardar(token, token_data, usuario, geracao)
+    else:
+        usuario = verificado.usuario
+    
+    if not usuario.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuário inativo"
+        )
+    
+    return usuario
+
+@router.get("/diagnostico")
+async def diagnostico(usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)):
+    """
+    Estatísticas internas do processo: pool de conexões, motor de disponibilidade, caches, idempotência e limite de taxa
+    """
+    return estatisticas_processo()
+
+# ========== ENDPOINTS DE AUTENTICAÇÃO ==========
+
+@router.post("/auth/registrar", response_model=user_schemas.UsuarioResposta)
+async def registrar(usuario_data: user_schemas.UsuarioCriar, db: AsyncSession = Depends(get_db_async)):
+    """
+    Registrar novo usuário no sistema
+    """
+    usuario_existente = await user_crud.obter_usuario_por_email(db, usuario_data.email)
+    if usuario_existente:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email já cadastrado"
+        )
+    return await user_crud.criar_usuario(db, usuario_data)
+
+@router.post("/auth/login")
+async def login(login_data: user_schemas.UsuarioLogin, db: AsyncSession = Depends(get_db_async)):
+    """
+    Fazer login e obter token de acesso
+    """
+    usuario = await user_crud.autenticar_usuario(db, login_data.email, login_data.senha)
+    if not usuario:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Credenciais inválidas"
+        )
+    access_token = criar_token_acesso({"sub": usuario.email, "uid": usuario.id})
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/auth/me", response_model=user_schemas.UsuarioResposta)
+async def obter_usuario_logado_endpoint(
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Obter informações do usuário logado
+    """
+    return await user_crud.obter_usuario_por_id(db, usuario_atual.id)
+
+@router.put("/auth/me", response_model=user_schemas.UsuarioResposta)
+async def atualizar_usuario_logado(
+    dados: user_schemas.UsuarioAtualizar,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Atualizar nome e/ou senha do usuário logado
+    """
+    return await user_crud.atualizar_usuario(db, usuario_atual.id, dados)
+
+@router.delete("/auth/me")
+async def desativar_usuario_logado(
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Desativar a conta do usuário logado (os tokens deixam de valer)
+    """
+    await user_crud.desativar_usuario(db, usuario_atual.id)
+    return {"message": "Conta desativada com sucesso"}
+
+# ========== ENDPOINTS DE ESPAÇOS ==========
+
+@router.get("/espacos/", response_model=space_schemas.PaginaEspacos)
+async def listar_espacos(
+    request: Request,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    capacidade_min: Optional[int] = Query(None, ge=1),
+    preco_min: Optional[float] = Query(None, ge=0),
+    preco_max: Optional[float] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Listar os espaços disponíveis, paginados por cursor (use `next_cursor`).
+    Resposta em cache com ETag: If-None-Match com o ETag atual devolve 304
+    """
+    apos_id = decodificar_cursor(cursor, int)[0] if cursor else None
+
+    async def calcular():
+        espacos = await space_crud.obter_espacos_serializados(
+            db, limit=limit + 1, apos_id=apos_id,
+            capacidade_min=capacidade_min, preco_min=preco_min, preco_max=preco_max
+        )
+        return para_json(montar_pagina(espacos, limit, lambda e: (e["id"],)))
+
+    return await resposta_em_cache_async(cache_catalogo, request, calcular)
+
+@router.get("/espacos/{espaco_id}", response_model=space_schemas.EspacoResposta)
+async def obter_espaco(espaco_id: int, request: Request, db: AsyncSession = Depends(get_db_async)):
+    """
+    Obter detalhes de um espaço específico (em cache, com ETag)
+    """
+    async def calcular():
+        espaco = await space_crud.obter_espaco_serializado(db, espaco_id)
+        if not espaco:
+            raise HTTPException(status_code=404, detail="Espaço não encontrado")
+        return para_json(espaco)
+
+    return await resposta_em_cache_async(cache_catalogo, request, calcular)
+
+@router.get("/espacos/{espaco_id}/calendario", response_model=space_schemas.CalendarioEspaco)
+async def obter_calendario_espaco(
+    espaco_id: int,
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Ocupação diária do espaço em slots de 15 minutos (padrão: mês corrente)
+    """
+    espaco = await space_crud.obter_espaco_por_id(db, espaco_id)
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    inicio, fim = ocupacao_crud.periodo_calendario(inicio, fim)
+    return (await ocupacao_crud.obter_calendarios(db, [espaco_id], inicio, fim))[0]
+
+@router.get("/calendario", response_model=List[space_schemas.CalendarioEspaco])
+async def obter_calendarios(
+    espaco_ids: Optional[List[int]] = Query(None, max_length=500),
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Ocupação diária de vários espaços em uma única leitura (padrão: mês corrente)
+    """
+    if not espaco_ids:
+        raise HTTPException(status_code=400, detail="Informe ao menos um espaco_ids")
+    inicio, fim = ocupacao_crud.periodo_calendario(inicio, fim)
+    return await ocupacao_crud.obter_calendarios(db, list(dict.fromkeys(espaco_ids)), inicio, fim)
+
+@router.post("/espacos/", response_model=space_schemas.EspacoResposta)
+async def criar_espaco(
+    espaco_data: space_schemas.EspacoCriar,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Criar novo espaço (requer autenticação)
+    """
+    return await space_crud.criar_espaco(db, espaco_data)
+
+@router.put("/espacos/{espaco_id}/disponibilidade")
+async def atualizar_disponibilidade_espaco(
+    espaco_id: int,
+    disponivel: bool,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Atualizar disponibilidade de um espaço (requer autenticação)
+    """
+    espaco = await space_crud.atualizar_disponibilidade_espaco(db, espaco_id, disponivel)
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    
+    status_msg = "disponível" if disponivel else "indisponível"
+    return {"message": f"Espaço {espaco.name} agora está {status_msg}"}
+
+@router.get("/espacos/{espaco_id}/precos", response_model=space_schemas.RegrasPrecoResposta)
+async def obter_regras_preco(espaco_id: int, db: AsyncSession = Depends(get_db_async)):
+    """
+    Regras de preço do espaço (faixas de horário e descontos por duração)
+    """
+    return await precos_crud.obter_regras_preco(db, espaco_id)
+
+@router.put("/espacos/{espaco_id}/precos", response_model=space_schemas.RegrasPrecoResposta)
+async def substituir_regras_preco(
+    espaco_id: int,
+    regras: space_schemas.RegrasPreco,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Substituir as regras de preço do espaço (requer autenticação; vale para novas reservas)
+    """
+    return await precos_crud.substituir_regras_preco(db, espaco_id, regras.regras)
+
+# ========== ENDPOINTS DE RESERVAS ==========
+
+@router.post("/reservas/", response_model=booking_schemas.ReservaResposta)
+async def criar_reserva(
+    reserva_data: booking_schemas.ReservaCriar,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Criar nova reserva. Com o cabeçalho Idempotency-Key, repetir a requisição
+    devolve a mesma resposta sem criar outra reserva (Idempotent-Replayed: true)
+    """
+    try:
+        if idempotency_key:
+            status_code, corpo, repetida = await booking_crud.criar_reserva_idempotente(
+                db, reserva_data, usuario_atual.id, idempotency_key
+            )
+            return Response(
+                content=corpo, status_code=status_code, media_type="application/json",
+                headers={"Idempotent-Replayed": "true" if repetida else "false"}
+            )
+        return await booking_crud.criar_reserva(db, reserva_data, usuario_atual.id)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/reservas/lote", response_model=booking_schemas.RespostaLote)
+async def criar_reservas_lote(
+    lote: booking_schemas.ReservaLote,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Criar várias reservas em uma única transação, com um resultado por item
+    """
+    return await booking_crud.criar_reservas_lote(db, lote.reservas, usuario_atual.id, lote.modo)
+
+@router.post("/reservas/recorrentes", response_model=booking_schemas.ResultadoRecorrencia)
+async def criar_reserva_recorrente(
+    dados: booking_schemas.ReservaRecorrenteCriar,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Criar reserva recorrente (regra no estilo RRULE, ex.: FREQ=WEEKLY;BYDAY=MO;COUNT=10)
+    """
+    return await recorrencia_crud.criar_reserva_recorrente(db, dados, usuario_atual.id)
+
+@router.get("/reservas/recorrentes/{serie_id}", response_model=booking_schemas.ReservaRecorrenteResposta)
+async def obter_reserva_recorrente(
+    serie_id: int,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Obter detalhes de uma reserva recorrente
+    """
+    serie = await recorrencia_crud.obter_reserva_recorrente(db, serie_id, usuario_atual.id)
+    if not serie:
+        raise HTTPException(status_code=404, detail="Reserva recorrente não encontrada")
+    return serie
+
+@router.get("/reservas/recorrentes/{serie_id}/ocorrencias", response_model=List[booking_schemas.OcorrenciaResposta])
+async def listar_ocorrencias(
+    serie_id: int,
+    desde: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Listar as ocorrências da série, calculadas a partir da regra
+    """
+    serie = await recorrencia_crud.obter_reserva_recorrente(db, serie_id, usuario_atual.id)
+    if not serie:
+        raise HTTPException(status_code=404, detail="Reserva recorrente não encontrada")
+    return recorrencia_crud.listar_ocorrencias(serie, desde, limit)
+
+@router.post("/reservas/recorrentes/{serie_id}/cancelar")
+async def cancelar_reserva_recorrente(
+    serie_id: int,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Cancelar reserva recorrente e suas ocorrências futuras
+    """
+    return await recorrencia_crud.cancelar_reserva_recorrente(db, serie_id, usuario_atual.id)
+
+@router.get("/reservas/minhas", response_model=booking_schemas.PaginaReservas)
+async def listar_minhas_reservas(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status_reserva: Optional[BookingStatus] = Query(None, alias="status"),
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None,
+    include: Optional[str] = Query(None, description="Relacionados aninhados na resposta: space, user"),
+    historico: bool = Query(False, description="Inclui as reservas encerradas já arquivadas"),
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Listar as reservas do usuário logado, da mais recente para a mais antiga,
+    paginadas por cursor (use `next_cursor`). Com `include=space,user`, cada
+    reserva traz o espaço e/ou o usuário, com uma consulta a mais por relacionamento.
+    Reservas concluídas/canceladas antigas ficam no arquivo e só aparecem com `historico=true`
+    """
+    apos = decodificar_cursor(cursor, datetime, int) if cursor else None
+    reservas = await booking_crud.obter_reservas_usuario_serializadas(
+        db, usuario_atual.id, limit=limit + 1, apos=apos,
+        inclusoes=booking_crud.interpretar_inclusoes(include),
+        status=status_reserva, inicio=inicio, fim=fim, historico=historico
+    )
+    return RespostaJSON(montar_pagina(reservas, limit, lambda r: (r["start_time"], r["id"])))
+
+@router.get("/reservas/exportar")
+async def exportar_reservas_endpoint(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    espaco_id: Optional[int] = None,
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Exportar as suas reservas de um espaço e/ou que se sobrepõem a um período
+    (inicio e fim, até EXPORTACAO_MAX_DIAS) em NDJSON ou CSV, transmitidas em
+    streaming (requer autenticação)
+    """
+    validar_filtros(espaco_id, inicio, fim)
+    if espaco_id is not None and not await space_crud.obter_espaco_por_id(db, espaco_id):
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    
+    consulta = consulta_exportacao(espaco_id, inicio, fim, usuario_da_exportacao(usuario_atual))
+    return StreamingResponse(
+        exportar_reservas_async(obter_engine_async(), consulta, formato),
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="reservas.{formato}"'}
+    )
+
+@router.get("/reservas/{reserva_id}", response_model=booking_schemas.ReservaDetalhada)
+async def obter_reserva(
+    reserva_id: int,
+    include: Optional[str] = Query(None, description="Relacionados aninhados na resposta: space, user"),
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Obter detalhes de uma reserva específica (`include=space,user` para aninhar os relacionados)
+    """
+    inclusoes = booking_crud.interpretar_inclusoes(include)
+    reserva = await booking_crud.obter_reserva_por_id(db, reserva_id, inclusoes)
+    if not reserva:
+        raise HTTPException(status_code=404, detail="Reserva não encontrada")
+    
+    # Verificar se a reserva pertence ao usuário
+    if reserva.user_id != usuario_atual.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Não autorizado a acessar esta reserva"
+        )
+    
+    return RespostaJSON(reserva_com_inclusoes(reserva, inclusoes))
+
+@router.post("/reservas/{reserva_id}/cancelar")
+async def cancelar_reserva(
+    reserva_id: int,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Cancelar uma reserva
+    """
+    try:
+        await booking_crud.cancelar_reserva(db, reserva_id, usuario_atual.id)
+        return {"message": "Reserva cancelada com sucesso", "reserva_id": reserva_id}
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/reservas/cotacao", response_model=booking_schemas.RespostaCotacao)
+async def cotar_reservas(pedido: booking_schemas.PedidoCotacao, db: AsyncSession = Depends(get_db_async)):
+    """
+    Preço de até 1000 intervalos (sem reservar), com as regras de preço de cada espaço
+    """
+    return RespostaJSON({"itens": await precos_crud.cotar(db, pedido.itens)})
+
+@router.post("/reservas/verificar-disponibilidade")
+async def verificar_disponibilidade(
+    disponibilidade: booking_schemas.VerificarDisponibilidade,
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Verificar disponibilidade de um espaço em um horário específico
+    """
+    esta_disponivel = await booking_crud.verificar_disponibilidade(
+        db, 
+        disponibilidade.space_id, 
+        disponibilidade.start_time, 
+        disponibilidade.end_time
+    )
+    
+    espaco = await space_crud.obter_espaco_por_id(db, disponibilidade.space_id)
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    
+    return {
+        "disponivel": esta_disponivel,
+        "espaco_id": disponibilidade.space_id,
+        "espaco_nome": espaco.name,
+        "inicio": disponibilidade.start_time,
+        "fim": disponibilidade.end_time
+    }
+
+@router.get("/disponibilidade/buscar", response_model=List[booking_schemas.JanelaLivre])
+async def buscar_disponibilidade(
+    inicio: datetime,
+    fim: datetime,
+    duracao_minutos: int = Query(..., ge=1),
+    capacidade_min: Optional[int] = Query(None, ge=1),
+    preco_max: Optional[float] = Query(None, ge=0),
+    horario_comercial: bool = False,
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db_async)
+):
+    """
+    Buscar as primeiras janelas livres, entre todos os espaços que atendem aos filtros
+    """
+    return await booking_crud.buscar_janelas_livres(
+        db, inicio, fim, duracao_minutos,
+        capacidade_min=capacidade_min, preco_max=preco_max,
+        horario_comercial=horario_comercial, limite=limit
+    )
+
+@router.get("/espacos/{espaco_id}/reservas")
+async def listar_reservas_espaco(
+    espaco_id: int,
+    inicio: str = None,
+    fim: str = None,
+    db: AsyncSession = Depends(get_db_async),
+    usuario_atual: UsuarioSessao = Depends(obter_usuario_logado)
+):
+    """
+    Listar reservas de um espaço em um período (requer autenticação)
+    """
+    espaco = await space_crud.obter_espaco_por_id(db, espaco_id)
+    if not espaco:
+        raise HTTPException(status_code=404, detail="Espaço não encontrado")
+    
+    # Se não forem fornecidas datas, usa padrão (próximos 7 dias)
+    if not inicio:
+        inicio = datetime.now()
+    else:
+        inicio = datetime.fromisoformat(inicio)
+        
+    if not fim:
+        fim = datetime.now().replace(hour=23, minute=59, second=59)
+    else:
+        fim = datetime.fromisoformat(fim)
+    
+    return await booking_crud.obter_reservas_por_espaco(db, espaco_id, inicio, fim)
@@ -0,0 +1,112 @@
+"""
+Eventos de ocupação por espaço em tempo real (ver app/services/tempo_real.py),
+por WebSocket ou Server-Sent Events. Não usam o banco: valem nos dois modos.
+
+WebSocket /ws/espacos?espaco_ids=1&espaco_ids=2 (ou /ws/espacos/{espaco_id}):
+    servidor -> cliente: um evento JSON por mensagem
+    cliente -> servidor: {"assinar": [3]} / {"cancelar": [1]} para mudar os espaços
+SSE GET /eventos/espacos?espaco_ids=1&espaco_ids=2:
+    `event: <tipo>` + `data: <json>`; comentários `: ping` nas conexões ociosas
+"""
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.services.serializacao import para_json
+from app.services.tempo_real import TEMPO_REAL_MAX_ESPACOS, TEMPO_REAL_PING_S, broker_eventos
+
+router = APIRouter()
+
+PING = {"tipo": "ping"}
+
+async def _eventos(assinante):
+    """Lotes de eventos pendentes, ou um ping depois de TEMPO_REAL_PING_S sem nenhum"""
+    while True:
+        try:
+            yield await asyncio.wait_for(assinante.proximos(), TEMPO_REAL_PING_S)
+        except asyncio.TimeoutError:
+            yield [PING]
+
+def _ids_validos(valor) -> bool:
+    return isinstance(valor, list) and all(isinstance(i, int) and not isinstance(i, bool) for i in valor)
+
+async def _receber_comandos(websocket: WebSocket, assinante):
+    while True:
+        mensagem = await websocket.receive_json()
+        assinar = mensagem.get("assinar", []) if isinstance(mensagem, dict) else None
+        cancelar = mensagem.get("cancelar", []) if isinstance(mensagem, dict) else None
+        if not _ids_validos(assinar) or not _ids_validos(cancelar):
+            assinante.entregar({"tipo": "erro", "detail": 'Use {"assinar": [ids]} ou {"cancelar": [ids]}'})
+        elif len(assinante.espacos.union(assinar).difference(cancelar)) > TEMPO_REAL_MAX_ESPACOS:
+            assinante.entregar({"tipo": "erro", "detail": f"Máximo de {TEMPO_REAL_MAX_ESPACOS} espaços por conexão"})
+        else:
+            broker_eventos.alterar(assinante, assinar=assinar, cancelar=cancelar)
+
+async def _enviar_eventos(websocket: WebSocket, assinante):
+    async for eventos in _eventos(assinante):
+        for evento in eventos:
+            await websocket.send_text(para_json(evento).decode())
+
+async def _atender(websocket: WebSocket, espaco_ids: List[int]):
+    await websocket.accept()
+    if len(set(espaco_ids)) > TEMPO_REAL_MAX_ESPACOS:
+        await websocket.close(code=1008, reason=f"Máximo de {TEMPO_REAL_MAX_ESPACOS} espaços por conexão")
+        return
+    assinante = broker_eventos.assinar(espaco_ids)
+    tarefas = [
+        asyncio.ensure_future(_receber_comandos(websocket, assinante)),
+        asyncio.ensure_future(_enviar_eventos(websocket, assinante)),
+    ]
+    try:
+        # Termina quando o cliente desconecta (recebimento) ou o envio falha
+        _, pendentes = await asyncio.wait(tarefas, return_when=asyncio.FIRST_COMPLETED)
+        for tarefa in pendentes:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+    finally:
+        broker_eventos.cancelar(assinante)
+
+@router.websocket("/ws/espacos")
+async def eventos_espacos_ws(websocket: WebSocket, espaco_ids: List[int] = Query([])):
+    try:
+        await _atender(websocket, espaco_ids)
+    except WebSocketDisconnect:
+        pass
+
+@router.websocket("/ws/espacos/{espaco_id}")
+async def eventos_espaco_ws(websocket: WebSocket, espaco_id: int):
+    try:
+        await _atender(websocket, [espaco_id])
+    except WebSocketDisconnect:
+        pass
+
+@router.get("/eventos/espacos")
+async def eventos_espacos_sse(espaco_ids: List[int] = Query(...)):
+    """
+    Eventos de ocupação dos espaços (Server-Sent Events), no lugar de consultar
+    a disponibilidade periodicamente
+    """
+    if len(set(espaco_ids)) > TEMPO_REAL_MAX_ESPACOS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {TEMPO_REAL_MAX_ESPACOS} espaços por conexão")
+
+    async def gerar():
+        # Assina só quando a transmissão começa: um cliente que desconecta
+        # antes da primeira leitura não deixa a assinatura para trás
+        assinante = broker_eventos.assinar(espaco_ids)
+        try:
+            async for eventos in _eventos(assinante):
+                for evento in eventos:
+                    if evento is PING:
+                        yield b": ping\n\n"
+                    else:
+                        yield b"event: " + evento["tipo"].encode() + b"\ndata: " + para_json(evento) + b"\n\n"
+        finally:
+            broker_eventos.cancelar(assinante)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,9 +1,21 @@
-from app.schemas.user import UsuarioBase, UsuarioCriar, UsuarioResposta, UsuarioLogin, Token
-from app.schemas.space import EspacoBase, EspacoCriar, EspacoResposta
-from app.schemas.booking import ReservaBase, ReservaCriar, ReservaResposta, VerificarDisponibilidade
+from app.schemas.user import UsuarioBase, UsuarioCriar, UsuarioAtualizar, UsuarioResposta, UsuarioResumo, UsuarioLogin, Token
+from app.schemas.space import (
+    EspacoBase, EspacoCriar, EspacoResposta, PaginaEspacos, DiaCalendario, CalendarioEspaco,
+    RegraPreco, RegrasPreco, RegrasPrecoResposta
+)
+from app.schemas.booking import (
+    ReservaBase, ReservaCriar, ReservaResposta, ReservaDetalhada, PaginaReservas,
+    ReservaLote, ResultadoItemLote, RespostaLote, PedidoCotacao, ItemCotado, RespostaCotacao,
+    ReservaRecorrenteCriar, ReservaRecorrenteResposta, ResultadoRecorrencia, OcorrenciaResposta,
+    JanelaLivre, VerificarDisponibilidade
+)
 
 __all__ = [
-    "UsuarioBase", "UsuarioCriar", "UsuarioResposta", "UsuarioLogin", "Token",
-    "EspacoBase", "EspacoCriar", "EspacoResposta",
-    "ReservaBase", "ReservaCriar", "ReservaResposta", "VerificarDisponibilidade"
+    "UsuarioBase", "UsuarioCriar", "UsuarioAtualizar", "UsuarioResposta", "UsuarioResumo", "UsuarioLogin", "Token",
+    "EspacoBase", "EspacoCriar", "EspacoResposta", "PaginaEspacos", "DiaCalendario", "CalendarioEspaco",
+    "RegraPreco", "RegrasPreco", "RegrasPrecoResposta",
+    "ReservaBase", "ReservaCriar", "ReservaResposta", "ReservaDetalhada", "PaginaReservas",
+    "ReservaLote", "ResultadoItemLote", "RespostaLote", "PedidoCotacao", "ItemCotado", "RespostaCotacao",
+    "ReservaRecorrenteCriar", "ReservaRecorrenteResposta", "ResultadoRecorrencia", "OcorrenciaResposta",
+    "JanelaLivre", "VerificarDisponibilidade"
 ]
\ No newline at end of file
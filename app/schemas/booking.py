@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, AliasChoices, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 from app.models.booking import BookingStatus
+from app.services.recorrencia import RegraRecorrencia
+from app.schemas.space import EspacoResposta
+from app.schemas.user import UsuarioResumo
 
 class ReservaBase(BaseModel):
     space_id: int
@@ -16,11 +19,90 @@ class ReservaResposta(ReservaBase):
     user_id: int
     status: BookingStatus
     total_price: float
-    criado_em: datetime
+    criado_em: datetime = Field(validation_alias=AliasChoices("criado_em", "created_at"))
 
     class Config:
         from_attributes = True
 
+class ReservaDetalhada(ReservaResposta):
+    # Presentes só quando pedidos em include=space,user
+    espaco: Optional[EspacoResposta] = None
+    usuario: Optional[UsuarioResumo] = None
+
+class PaginaReservas(BaseModel):
+    itens: List[ReservaDetalhada]
+    next_cursor: Optional[str] = None
+
+class ReservaLote(BaseModel):
+    reservas: List[ReservaCriar] = Field(min_length=1, max_length=1000)
+    # tudo_ou_nada: qualquer item recusado desfaz o lote inteiro
+    # melhor_esforco: grava os itens válidos e informa os recusados
+    modo: Literal["tudo_ou_nada", "melhor_esforco"] = "tudo_ou_nada"
+
+class ResultadoItemLote(BaseModel):
+    indice: int
+    status_code: int
+    reserva: Optional[ReservaResposta] = None
+    erro: Optional[str] = None
+
+class RespostaLote(BaseModel):
+    criadas: int
+    recusadas: int
+    resultados: List[ResultadoItemLote]
+
+class PedidoCotacao(BaseModel):
+    itens: List[ReservaBase] = Field(min_length=1, max_length=1000)
+
+class ItemCotado(ReservaBase):
+    # Sem preço quando o item é inválido (ver erro)
+    total_price: Optional[float] = None
+    erro: Optional[str] = None
+
+class RespostaCotacao(BaseModel):
+    itens: List[ItemCotado]
+
+class ReservaRecorrenteCriar(ReservaBase):
+    # start_time/end_time são os da primeira ocorrência
+    regra: str = Field(examples=["FREQ=WEEKLY;BYDAY=MO,WE;COUNT=20"])
+
+    @field_validator("regra")
+    @classmethod
+    def validar_regra(cls, valor: str) -> str:
+        RegraRecorrencia.interpretar(valor)
+        return valor
+
+class ReservaRecorrenteResposta(BaseModel):
+    id: int
+    user_id: int
+    space_id: int
+    regra: str = Field(validation_alias=AliasChoices("regra", "rule"))
+    start_time: datetime
+    duracao_minutos: int = Field(validation_alias=AliasChoices("duracao_minutos", "duration_minutes"))
+    materializada_ate: Optional[datetime] = Field(None, validation_alias=AliasChoices("materializada_ate", "materialized_until"))
+    ativa: bool = Field(validation_alias=AliasChoices("ativa", "is_active"))
+    criado_em: datetime = Field(validation_alias=AliasChoices("criado_em", "created_at"))
+
+    class Config:
+        from_attributes = True
+
+class ResultadoRecorrencia(BaseModel):
+    recorrencia: ReservaRecorrenteResposta
+    ocorrencias: int
+    materializadas: int
+
+class OcorrenciaResposta(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+class JanelaLivre(BaseModel):
+    space_id: int
+    espaco_nome: str
+    inicio: datetime
+    fim: datetime
+    # Fim do intervalo livre que contém a janela
+    livre_ate: datetime
+    preco_total: float
+
 class VerificarDisponibilidade(BaseModel):
     space_id: int
     start_time: datetime
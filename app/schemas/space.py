@@ -1,6 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, AliasChoices, model_validator
+from typing import List, Literal, Optional
+from datetime import date, datetime
+from app.services.ocupacao import SLOT_MINUTOS
+from app.services.precos import hora_para_minutos
 
 class EspacoBase(BaseModel):
     nome: str
@@ -12,9 +14,66 @@ class EspacoCriar(EspacoBase):
     pass
 
 class EspacoResposta(EspacoBase):
+    # Os campos da API estão em português; as colunas do modelo, em inglês
+    nome: str = Field(validation_alias=AliasChoices("nome", "name"))
+    descricao: Optional[str] = Field(None, validation_alias=AliasChoices("descricao", "description"))
+    capacidade: int = Field(validation_alias=AliasChoices("capacidade", "capacity"))
+    preco_por_hora: float = Field(validation_alias=AliasChoices("preco_por_hora", "price_per_hour"))
     id: int
-    esta_disponivel: bool
-    criado_em: datetime
+    esta_disponivel: bool = Field(validation_alias=AliasChoices("esta_disponivel", "is_available"))
+    criado_em: datetime = Field(validation_alias=AliasChoices("criado_em", "created_at"))
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PaginaEspacos(BaseModel):
+    itens: List[EspacoResposta]
+    next_cursor: Optional[str] = None
+
+class DiaCalendario(BaseModel):
+    dia: date
+    # Fração dos slots do dia com reserva ativa
+    ocupacao: float
+    faixas_ocupadas: List[str]
+    faixas_confirmadas: List[str]
+
+class CalendarioEspaco(BaseModel):
+    space_id: int
+    inicio: date
+    fim: date
+    slot_minutos: int
+    # Apenas dias com alguma ocupação; os demais estão livres
+    dias: List[DiaCalendario]
+
+class RegraPreco(BaseModel):
+    # faixa: multiplica o preço por hora nos dias/horário; duracao: multiplica o
+    # total de reservas a partir de duracao_minima_minutos
+    tipo: Literal["faixa", "duracao"]
+    dias_semana: List[int] = Field(default=[0, 1, 2, 3, 4, 5, 6], description="0 = segunda ... 6 = domingo")
+    inicio: Optional[str] = Field(None, examples=["18:00"])
+    fim: Optional[str] = Field(None, examples=["22:00"], description="Até 24:00")
+    duracao_minima_minutos: Optional[int] = Field(None, gt=0)
+    multiplicador: float = Field(gt=0)
+
+    @model_validator(mode="after")
+    def validar_tipo(self):
+        if self.tipo == "faixa":
+            if self.inicio is None or self.fim is None:
+                raise ValueError("Faixas precisam de inicio e fim")
+            inicio, fim = hora_para_minutos(self.inicio), hora_para_minutos(self.fim)
+            if inicio >= fim:
+                raise ValueError("inicio deve ser antes de fim (faixas que passam da meia-noite são duas)")
+            if inicio % SLOT_MINUTOS or fim % SLOT_MINUTOS:
+                raise ValueError(f"inicio e fim devem ser múltiplos de {SLOT_MINUTOS} minutos")
+            if not self.dias_semana or any(not 0 <= dia <= 6 for dia in self.dias_semana):
+                raise ValueError("dias_semana deve ter dias entre 0 (segunda) e 6 (domingo)")
+        elif self.duracao_minima_minutos is None:
+            raise ValueError("Descontos por duração precisam de duracao_minima_minutos")
+        return self
+
+class RegrasPreco(BaseModel):
+    regras: List[RegraPreco] = Field(max_length=100)
+
+class RegrasPrecoResposta(RegrasPreco):
+    space_id: int
+    preco_por_hora: float
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, AliasChoices
 from typing import Optional
 from datetime import datetime
 
@@ -9,14 +9,25 @@ class UsuarioBase(BaseModel):
 class UsuarioCriar(UsuarioBase):
     senha: str
 
+class UsuarioAtualizar(BaseModel):
+    nome_completo: Optional[str] = None
+    senha: Optional[str] = None
+
 class UsuarioResposta(UsuarioBase):
+    nome_completo: str = Field(validation_alias=AliasChoices("nome_completo", "full_name"))
     id: int
-    esta_ativo: bool
-    criado_em: datetime
+    esta_ativo: bool = Field(validation_alias=AliasChoices("esta_ativo", "is_active"))
+    criado_em: datetime = Field(validation_alias=AliasChoices("criado_em", "created_at"))
 
     class Config:
         from_attributes = True
 
+class UsuarioResumo(BaseModel):
+    # Dados do usuário aninhados em outras respostas (include=user)
+    id: int
+    email: EmailStr
+    nome_completo: str
+
 class UsuarioLogin(BaseModel):
     email: EmailStr
     senha: str
@@ -0,0 +1,17 @@
+from app.services.agendador import Agendador, agendador
+from app.services.cache import CacheRespostas, cache_catalogo
+from app.services.disponibilidade import MotorDisponibilidade, motor_disponibilidade
+from app.services.exportacao import consulta_exportacao, exportar_reservas, exportar_reservas_async
+from app.services.serializacao import RespostaJSON, para_json
+from app.services.tempo_real import BrokerEventos, broker_eventos
+from app.services.limites import LimiteTaxa, limite_taxa
+
+__all__ = [
+    "Agendador", "agendador",
+    "CacheRespostas", "cache_catalogo",
+    "MotorDisponibilidade", "motor_disponibilidade",
+    "consulta_exportacao", "exportar_reservas", "exportar_reservas_async",
+    "RespostaJSON", "para_json",
+    "BrokerEventos", "broker_eventos",
+    "LimiteTaxa", "limite_taxa"
+]
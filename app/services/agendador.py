@@ -0,0 +1,113 @@
+"""
+Agendador de tarefas periódicas do processo (asyncio): transições de status,
+arquivo das reservas encerradas e varredura das chaves de idempotência expiradas.
+
+Cada tarefa roda em um laço próprio no event loop, com o trabalho síncrono
+(sessão do banco) em uma thread, para não travar as requisições. Uma execução
+que falha vai para o log e a tarefa continua no próximo intervalo.
+
+Pode rodar dentro da API (AGENDADOR_ATIVO=true) ou em um processo separado
+(`python worker.py`); com várias instâncias da API, prefira o worker, para
+as transições não rodarem em todas.
+
+Configuração (variáveis de ambiente):
+    AGENDADOR_ATIVO           inicia o agendador junto com a API
+    CICLO_INTERVALO_S         intervalo entre execuções das transições de reservas
+    ARQUIVO_INTERVALO_S       intervalo entre execuções do arquivo de reservas encerradas
+    IDEMPOTENCIA_VARREDURA_S  intervalo entre varreduras das chaves de idempotência expiradas
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Callable
+
+from app.database import SessionLocal
+
+AGENDADOR_ATIVO = os.getenv("AGENDADOR_ATIVO", "false").lower() in ("1", "true", "sim")
+CICLO_INTERVALO_S = float(os.getenv("CICLO_INTERVALO_S", "60"))
+ARQUIVO_INTERVALO_S = float(os.getenv("ARQUIVO_INTERVALO_S", "86400"))
+IDEMPOTENCIA_VARREDURA_S = float(os.getenv("IDEMPOTENCIA_VARREDURA_S", "3600"))
+
+logger = logging.getLogger(__name__)
+
+def com_sessao(funcao: Callable) -> Callable:
+    """Tarefa que recebe uma sessão própria, fechada ao final de cada execução"""
+    def executar():
+        with SessionLocal() as db:
+            return funcao(db)
+    return executar
+
+class Agendador:
+    """Tarefas síncronas executadas a cada intervalo, uma execução por vez cada"""
+
+    def __init__(self):
+        self._tarefas = {}      # nome -> (intervalo_s, funcao)
+        self._lacos = {}        # nome -> asyncio.Task
+        self._estado = {}       # nome -> estatísticas da tarefa
+
+    def agendar(self, nome: str, intervalo_s: float, funcao: Callable):
+        self._tarefas[nome] = (intervalo_s, funcao)
+        self._estado[nome] = {
+            "intervalo_s": intervalo_s, "execucoes": 0, "falhas": 0,
+            "ultima_duracao_s": None, "ultimo_resultado": None, "ultimo_erro": None
+        }
+
+    async def executar(self, nome: str):
+        """Executa a tarefa uma vez (em uma thread) e registra o resultado"""
+        _, funcao = self._tarefas[nome]
+        estado = self._estado[nome]
+        inicio = time.perf_counter()
+        try:
+            resultado = await asyncio.to_thread(funcao)
+        except Exception as erro:
+            estado["falhas"] += 1
+            estado["ultimo_erro"] = repr(erro)
+            logger.exception("Tarefa %s falhou", nome)
+            resultado = None
+        else:
+            estado["ultimo_resultado"] = resultado
+        estado["execucoes"] += 1
+        estado["ultima_duracao_s"] = round(time.perf_counter() - inicio, 4)
+        return resultado
+
+    async def _laco(self, nome: str):
+        intervalo_s, _ = self._tarefas[nome]
+        while True:
+            await self.executar(nome)
+            await asyncio.sleep(intervalo_s)
+
+    def iniciar(self):
+        """Inicia os laços no event loop atual"""
+        for nome in self._tarefas:
+            if nome not in self._lacos:
+                self._lacos[nome] = asyncio.create_task(self._laco(nome), name=f"agendador:{nome}")
+
+    async def parar(self):
+        """Cancela os laços; uma execução em andamento termina na sua thread"""
+        lacos = list(self._lacos.values())
+        self._lacos.clear()
+        for laco in lacos:
+            laco.cancel()
+        await asyncio.gather(*lacos, return_exceptions=True)
+
+    def estatisticas(self) -> dict:
+        return {"ativo": bool(self._lacos), "tarefas": self._estado}
+
+def _transicoes_reservas(db):
+    # Import tardio: app.crud depende dos schemas, que dependem de app.services
+    from app.crud.booking_lifecycle import aplicar_transicoes
+    return aplicar_transicoes(db)
+
+def _arquivo_reservas(db):
+    from app.crud.booking_archive import arquivar_reservas
+    return arquivar_reservas(db)
+
+def _chaves_idempotencia(db):
+    from app.crud.idempotency import varrer_chaves_expiradas
+    return varrer_chaves_expiradas(db)
+
+agendador = Agendador()
+agendador.agendar("transicoes_reservas", CICLO_INTERVALO_S, com_sessao(_transicoes_reservas))
+agendador.agendar("arquivo_reservas", ARQUIVO_INTERVALO_S, com_sessao(_arquivo_reservas))
+agendador.agendar("chaves_idempotencia", IDEMPOTENCIA_VARREDURA_S, com_sessao(_chaves_idempotencia))
@@ -0,0 +1,265 @@
+"""
+Cache de respostas HTTP serializadas, com backend plugável.
+
+As respostas são guardadas já serializadas (bytes do JSON) junto com o ETag.
+Cada escrita no catálogo incrementa um contador de versão que faz parte da
+chave, de modo que invalidar é um único incremento: as entradas antigas
+deixam de ser encontradas e saem por LRU/TTL.
+
+Backends (CACHE_BACKEND):
+    lru      em memória, por processo (padrão). Com vários workers, um worker
+             só vê invalidações feitas nele; os demais, quando a entrada expira
+    memoria  substituto local de um backend compartilhado: mesma semântica do
+             Redis (TTL, sem LRU, contadores atômicos), para desenvolvimento e testes
+    redis    compartilhado entre workers (requer o pacote `redis` e CACHE_URL)
+
+Configuração (variáveis de ambiente):
+    CACHE_BACKEND             lru | memoria | redis
+    CACHE_URL                 URL do Redis (backend redis)
+    CACHE_MAX_ITENS           máximo de entradas (lru/memoria)
+    CACHE_TTL_S               validade das entradas
+    CACHE_CATALOGO_MAX_AGE_S  max-age do Cache-Control do catálogo (0: sempre revalidar via ETag)
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "lru")
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+CACHE_MAX_ITENS = int(os.getenv("CACHE_MAX_ITENS", "10000"))
+CACHE_TTL_S = float(os.getenv("CACHE_TTL_S", "300"))
+CACHE_CATALOGO_MAX_AGE_S = int(os.getenv("CACHE_CATALOGO_MAX_AGE_S", "0"))
+
+class BackendCache:
+    """Interface dos backends: valores em bytes com TTL e contadores sem expiração"""
+
+    def obter(self, chave: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def guardar(self, chave: str, valor: bytes, ttl_s: float):
+        raise NotImplementedError
+
+    def remover(self, chave: str):
+        raise NotImplementedError
+
+    def contador(self, chave: str) -> int:
+        raise NotImplementedError
+
+    def incrementar(self, chave: str) -> int:
+        raise NotImplementedError
+
+    def estatisticas(self) -> dict:
+        return {}
+
+class CacheLRU(BackendCache):
+    """LRU com TTL em memória. Os contadores ficam fora do LRU e nunca são despejados."""
+
+    def __init__(self, max_itens: int = 10_000):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()  # chave -> (expira_em, valor)
+        self._contadores = {}
+        self._lock = threading.Lock()
+        self.despejos = 0
+
+    def obter(self, chave: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, valor = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def guardar(self, chave: str, valor: bytes, ttl_s: float):
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + ttl_s, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self.despejos += 1
+
+    def remover(self, chave: str):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def contador(self, chave: str) -> int:
+        return self._contadores.get(chave, 0)
+
+    def incrementar(self, chave: str) -> int:
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + 1
+            return self._contadores[chave]
+
+    def estatisticas(self) -> dict:
+        return {"itens": len(self._itens), "max_itens": self.max_itens, "despejos": self.despejos}
+
+class CacheMemoria(BackendCache):
+    """
+    Substituto local de um backend compartilhado: guarda só bytes, expira por TTL
+    e não reordena entradas (como SETEX/GET/INCR do Redis). Ao passar de
+    `max_itens`, as entradas vencidas são descartadas e, se preciso, as mais antigas.
+    """
+
+    def __init__(self, max_itens: int = 10_000):
+        self.max_itens = max_itens
+        self._itens = {}
+        self._contadores = {}
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None or item[0] <= time.monotonic():
+                self._itens.pop(chave, None)
+                return None
+            return item[1]
+
+    def guardar(self, chave: str, valor: bytes, ttl_s: float):
+        with self._lock:
+            self._itens.pop(chave, None)
+            self._itens[chave] = (time.monotonic() + ttl_s, valor)
+            if len(self._itens) > self.max_itens:
+                agora = time.monotonic()
+                for vencida in [c for c, (expira_em, _) in self._itens.items() if expira_em <= agora]:
+                    del self._itens[vencida]
+                while len(self._itens) > self.max_itens:
+                    del self._itens[next(iter(self._itens))]
+
+    def remover(self, chave: str):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def contador(self, chave: str) -> int:
+        return self._contadores.get(chave, 0)
+
+    def incrementar(self, chave: str) -> int:
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + 1
+            return self._contadores[chave]
+
+    def estatisticas(self) -> dict:
+        return {"itens": len(self._itens), "max_itens": self.max_itens}
+
+class CacheRedis(BackendCache):
+    """Backend compartilhado entre workers e instâncias"""
+
+    def __init__(self, url: str):
+        import redis  # dependência opcional, só com CACHE_BACKEND=redis
+        self._cliente = redis.Redis.from_url(url)
+
+    def obter(self, chave: str) -> Optional[bytes]:
+        return self._cliente.get(chave)
+
+    def guardar(self, chave: str, valor: bytes, ttl_s: float):
+        self._cliente.set(chave, valor, px=int(ttl_s * 1000))
+
+    def remover(self, chave: str):
+        self._cliente.delete(chave)
+
+    def contador(self, chave: str) -> int:
+        return int(self._cliente.get(chave) or 0)
+
+    def incrementar(self, chave: str) -> int:
+        return self._cliente.incr(chave)
+
+def criar_backend(nome: str = CACHE_BACKEND) -> BackendCache:
+    if nome == "lru":
+        return CacheLRU(CACHE_MAX_ITENS)
+    if nome == "memoria":
+        return CacheMemoria(CACHE_MAX_ITENS)
+    if nome == "redis":
+        return CacheRedis(CACHE_URL)
+    raise ValueError(f"CACHE_BACKEND inválido: {nome}")
+
+class CacheRespostas:
+    """Respostas JSON serializadas de um grupo de rotas, com ETag e invalidação por versão"""
+
+    def __init__(self, backend: BackendCache, namespace: str, ttl_s: float = 300, max_age_s: int = 0):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_s = ttl_s
+        if max_age_s > 0:
+            self.cache_control = f"public, max-age={max_age_s}"
+        else:
+            self.cache_control = "public, max-age=0, must-revalidate"
+        self.acertos = 0
+        self.falhas = 0
+        self.nao_modificadas = 0
+        self.invalidacoes = 0
+
+    def chave(self, request: Request) -> str:
+        """Chave da requisição na versão atual (ler a versão antes de consultar o banco)"""
+        versao = self.backend.contador(f"{self.namespace}:versao")
+        consulta = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{self.namespace}:v{versao}:{request.url.path}?{consulta}"
+
+    def obter(self, chave: str) -> Optional[Tuple[str, bytes]]:
+        valor = self.backend.obter(chave)
+        if valor is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        etag, _, corpo = valor.partition(b"\n")
+        return etag.decode(), corpo
+
+    def guardar(self, chave: str, corpo: bytes) -> Tuple[str, bytes]:
+        etag = '"' + hashlib.blake2b(corpo, digest_size=16).hexdigest() + '"'
+        self.backend.guardar(chave, etag.encode() + b"\n" + corpo, self.ttl_s)
+        return etag, corpo
+
+    def invalidar(self):
+        self.backend.incrementar(f"{self.namespace}:versao")
+        self.invalidacoes += 1
+
+    def responder(self, request: Request, etag: str, corpo: bytes) -> Response:
+        """200 com o corpo, ou 304 se o cliente já tem essa versão (If-None-Match)"""
+        cabecalhos = {"ETag": etag, "Cache-Control": self.cache_control}
+        se_nenhum = request.headers.get("if-none-match")
+        if se_nenhum and (se_nenhum.strip() == "*" or etag in (t.strip().removeprefix("W/") for t in se_nenhum.split(","))):
+            self.nao_modificadas += 1
+            return Response(status_code=304, headers=cabecalhos)
+        return Response(content=corpo, media_type="application/json", headers=cabecalhos)
+
+    def estatisticas(self) -> dict:
+        total = self.acertos + self.falhas
+        return {
+            "backend": type(self.backend).__name__,
+            "versao": self.backend.contador(f"{self.namespace}:versao"),
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": round(self.acertos / total, 4) if total else None,
+            "nao_modificadas": self.nao_modificadas,
+            "invalidacoes": self.invalidacoes,
+            **self.backend.estatisticas(),
+        }
+
+def resposta_em_cache(cache: CacheRespostas, request: Request, calcular) -> Response:
+    """Responde do cache ou com `calcular()` (bytes do JSON), guardando o resultado"""
+    chave = cache.chave(request)
+    item = cache.obter(chave)
+    if item is None:
+        item = cache.guardar(chave, calcular())
+    return cache.responder(request, *item)
+
+async def resposta_em_cache_async(cache: CacheRespostas, request: Request, calcular) -> Response:
+    """Versão de `resposta_em_cache` para `calcular` assíncrono"""
+    chave = cache.chave(request)
+    item = cache.obter(chave)
+    if item is None:
+        item = cache.guardar(chave, await calcular())
+    return cache.responder(request, *item)
+
+cache_catalogo = CacheRespostas(
+    criar_backend(),
+    namespace="catalogo",
+    ttl_s=CACHE_TTL_S,
+    max_age_s=CACHE_CATALOGO_MAX_AGE_S
+)
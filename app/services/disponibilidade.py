@@ -0,0 +1,251 @@
+"""
+Motor de disponibilidade em memória.
+
+Mantém, por espaço, os intervalos das reservas ativas (PENDENTE/CONFIRMADA)
+ordenados por início, carregados do banco sob demanda. A verificação de
+conflito é uma busca binária, sem consulta ao banco.
+
+O estado é por processo: só deve ser ligado com um único worker, ou os
+processos enxergam escritas uns dos outros com atraso.
+
+Configuração (variáveis de ambiente):
+    MOTOR_DISPONIBILIDADE          desligado | ligado | verificar
+    MOTOR_DISPONIBILIDADE_ESPACOS  máximo de espaços em memória (LRU)
+    MOTOR_DISPONIBILIDADE_AMOSTRA  fração das consultas conferidas no banco (modo verificar)
+"""
+import logging
+import os
+import random
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatus
+
+logger = logging.getLogger(__name__)
+
+STATUS_ATIVOS = (BookingStatus.PENDENTE, BookingStatus.CONFIRMADA)
+
+class IntervalosEspaco:
+    """
+    Intervalos das reservas ativas de um espaço, ordenados por início.
+    `max_fins[i]` guarda o maior fim entre os intervalos 0..i, o que permite
+    responder se há sobreposição com uma única busca binária.
+    """
+    __slots__ = ("inicios", "fins", "ids", "max_fins", "presentes", "carregado_desde")
+
+    def __init__(self, carregado_desde: datetime):
+        self.inicios = []
+        self.fins = []
+        self.ids = []
+        self.max_fins = []
+        self.presentes = set()
+        # Reservas que terminaram antes deste instante não foram carregadas
+        self.carregado_desde = carregado_desde
+
+    @classmethod
+    def construir(cls, carregado_desde: datetime, linhas) -> "IntervalosEspaco":
+        """Monta a partir de (id, inicio, fim) em uma passada: ordena e calcula os máximos prefixados"""
+        intervalos = cls(carregado_desde)
+        maior = None
+        for reserva_id, inicio, fim in sorted(linhas, key=lambda linha: linha[1]):
+            if maior is None or fim > maior:
+                maior = fim
+            intervalos.inicios.append(inicio)
+            intervalos.fins.append(fim)
+            intervalos.ids.append(reserva_id)
+            intervalos.max_fins.append(maior)
+        intervalos.presentes.update(intervalos.ids)
+        return intervalos
+
+    def __len__(self):
+        return len(self.ids)
+
+    def adicionar(self, reserva_id: int, inicio: datetime, fim: datetime):
+        if reserva_id in self.presentes:
+            self.remover(reserva_id)
+        posicao = bisect_right(self.inicios, inicio)
+        self.inicios.insert(posicao, inicio)
+        self.fins.insert(posicao, fim)
+        self.ids.insert(posicao, reserva_id)
+        self.max_fins.insert(posicao, fim)
+        self.presentes.add(reserva_id)
+        self._recalcular_max_fins(posicao)
+
+    def remover(self, reserva_id: int):
+        if reserva_id not in self.presentes:
+            return
+        self.presentes.discard(reserva_id)
+        posicao = self.ids.index(reserva_id)
+        del self.inicios[posicao], self.fins[posicao], self.ids[posicao], self.max_fins[posicao]
+        self._recalcular_max_fins(posicao)
+
+    def tem_conflito(self, inicio: datetime, fim: datetime) -> bool:
+        # Candidatos são os intervalos que começam antes de `fim`; algum deles
+        # conflita se o maior fim entre eles passa de `inicio`
+        posicao = bisect_left(self.inicios, fim)
+        return posicao > 0 and self.max_fins[posicao - 1] > inicio
+
+    def _recalcular_max_fins(self, desde: int):
+        maior = self.max_fins[desde - 1] if desde > 0 else None
+        for i in range(desde, len(self.fins)):
+            if maior is None or self.fins[i] > maior:
+                maior = self.fins[i]
+            self.max_fins[i] = maior
+
+class MotorDisponibilidade:
+    """Cache LRU de IntervalosEspaco por espaço, sincronizado pelas escritas do CRUD"""
+
+    def __init__(self, modo: str = "desligado", max_espacos: int = 1000, amostra: float = 0.01):
+        self.modo = modo
+        self.max_espacos = max_espacos
+        self.amostra = amostra
+        self._espacos = OrderedDict()
+        # Cargas em andamento: espaco_id -> [cargas, escritas recebidas durante elas]
+        self._carregando = {}
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.carregamentos = 0
+        self.despejos = 0
+        self.divergencias = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.modo in ("ligado", "verificar")
+
+    def esta_disponivel(self, db: Session, espaco_id: int, inicio: datetime, fim: datetime):
+        """
+        Responde pela memória se o intervalo está livre.
+        Retorna None quando a pergunta cai fora do que foi carregado (passado).
+        """
+        with self._lock:
+            intervalos = self._espacos.get(espaco_id)
+            if intervalos is not None:
+                self._espacos.move_to_end(espaco_id)
+                self.acertos += 1
+                return self._responder(intervalos, inicio, fim)
+        intervalos = self._carregar(db, espaco_id)
+        with self._lock:
+            return self._responder(intervalos, inicio, fim)
+
+    @staticmethod
+    def _responder(intervalos: IntervalosEspaco, inicio: datetime, fim: datetime):
+        if inicio < intervalos.carregado_desde:
+            return None
+        return not intervalos.tem_conflito(inicio, fim)
+
+    def sincronizar(self, reserva: Booking):
+        """Aplica no motor o estado de uma reserva já gravada no banco"""
+        if not self.ativo:
+            return
+        escrita = (reserva.id, reserva.start_time, reserva.end_time, reserva.status in STATUS_ATIVOS)
+        with self._lock:
+            # Uma carga em andamento pode ter lido o banco antes desta escrita: ela a reaplica
+            carga = self._carregando.get(reserva.space_id)
+            if carga is not None:
+                carga[1].append(escrita)
+            intervalos = self._espacos.get(reserva.space_id)
+            # Espaços fora da memória serão lidos do banco quando consultados
+            if intervalos is not None:
+                self._aplicar(intervalos, *escrita)
+
+    @staticmethod
+    def _aplicar(intervalos: IntervalosEspaco, reserva_id: int, inicio: datetime, fim: datetime, ativa: bool):
+        if ativa:
+            intervalos.adicionar(reserva_id, inicio, fim)
+        else:
+            intervalos.remover(reserva_id)
+
+    def invalidar(self, espaco_id: int = None):
+        """Descarta um espaço (ou todos) para ser recarregado do banco"""
+        with self._lock:
+            if espaco_id is None:
+                self._espacos.clear()
+            else:
+                self._espacos.pop(espaco_id, None)
+
+    def deve_conferir(self) -> bool:
+        return self.modo == "verificar" and random.random() < self.amostra
+
+    def registrar_conferencia(self, espaco_id: int, inicio: datetime, fim: datetime, resposta_motor: bool, resposta_banco: bool):
+        """Registra o resultado de uma conferência motor x banco (modo verificar)"""
+        if resposta_motor == resposta_banco:
+            return
+        self.divergencias += 1
+        logger.warning(
+            "Motor de disponibilidade divergente do banco: espaco=%s intervalo=%s-%s motor=%s banco=%s",
+            espaco_id, inicio, fim, resposta_motor, resposta_banco
+        )
+        self.invalidar(espaco_id)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "modo": self.modo,
+                "espacos_carregados": len(self._espacos),
+                "intervalos": sum(len(i) for i in self._espacos.values()),
+                "acertos": self.acertos,
+                "carregamentos": self.carregamentos,
+                "despejos": self.despejos,
+                "divergencias": self.divergencias,
+            }
+
+    def _carregar(self, db: Session, espaco_id: int) -> IntervalosEspaco:
+        """
+        Lê o espaço do banco sem o lock (consultas aos demais espaços seguem
+        respondendo). As escritas no espaço durante a leitura ficam registradas
+        e são reaplicadas sobre o resultado, na ordem, sem perder atualizações.
+        """
+        with self._lock:
+            carga = self._carregando.setdefault(espaco_id, [0, []])
+            carga[0] += 1
+        try:
+            agora = datetime.now()
+            linhas = self._consultar(db, espaco_id, agora)
+        except BaseException:
+            with self._lock:
+                self._encerrar_carga(espaco_id, carga)
+            raise
+
+        # Encerrar a carga e guardar o resultado no mesmo lock: nenhuma escrita fica entre os dois
+        with self._lock:
+            self._encerrar_carga(espaco_id, carga)
+            # Outra requisição pode ter carregado o espaço enquanto esta lia o banco
+            intervalos = self._espacos.get(espaco_id)
+            if intervalos is not None:
+                return intervalos
+            intervalos = IntervalosEspaco.construir(agora, linhas)
+            for escrita in carga[1]:
+                self._aplicar(intervalos, *escrita)
+            self._espacos[espaco_id] = intervalos
+            self.carregamentos += 1
+            while len(self._espacos) > self.max_espacos:
+                self._espacos.popitem(last=False)
+                self.despejos += 1
+            return intervalos
+
+    def _encerrar_carga(self, espaco_id: int, carga: list):
+        # Chamado com o lock adquirido
+        carga[0] -= 1
+        if carga[0] == 0:
+            del self._carregando[espaco_id]
+
+    @staticmethod
+    def _consultar(db: Session, espaco_id: int, desde: datetime):
+        return db.execute(
+            select(Booking.id, Booking.start_time, Booking.end_time).where(
+                Booking.space_id == espaco_id,
+                Booking.status.in_(STATUS_ATIVOS),
+                Booking.end_time > desde
+            )
+        ).all()
+
+motor_disponibilidade = MotorDisponibilidade(
+    modo=os.getenv("MOTOR_DISPONIBILIDADE", "desligado"),
+    max_espacos=int(os.getenv("MOTOR_DISPONIBILIDADE_ESPACOS", 1000)),
+    amostra=float(os.getenv("MOTOR_DISPONIBILIDADE_AMOSTRA", 0.01)),
+)
@@ -0,0 +1,130 @@
+"""
+Exportação de reservas em streaming (NDJSON e CSV).
+
+As linhas são lidas como tuplas de colunas (sem hidratar objetos do ORM) com
+`yield_per`, que no PostgreSQL usa cursor do lado do servidor, e cada lote é
+serializado e enviado antes do próximo ser buscado: a memória fica limitada
+ao tamanho do lote, independente do total de reservas exportadas.
+
+A exportação abre uma conexão própria, que vive enquanto o corpo da resposta
+é transmitido, em vez de usar a sessão da requisição.
+
+Cada exportação é de um espaço ou de um período limitado, e só das reservas
+do próprio usuário; os emails de EXPORTACAO_AUTORIZADOS exportam as de todos.
+
+Configuração (variáveis de ambiente):
+    EXPORTACAO_LOTE           linhas buscadas por vez no cursor
+    EXPORTACAO_MAX_DIAS       período máximo de uma exportação (inicio..fim)
+    EXPORTACAO_AUTORIZADOS    emails, separados por vírgula, que exportam reservas de todos os usuários
+"""
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta
+from enum import Enum
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.booking import Booking
+
+EXPORTACAO_LOTE = int(os.getenv("EXPORTACAO_LOTE", "1000"))
+EXPORTACAO_MAX_DIAS = int(os.getenv("EXPORTACAO_MAX_DIAS", "366"))
+EXPORTACAO_AUTORIZADOS = frozenset(
+    email.strip().lower() for email in os.getenv("EXPORTACAO_AUTORIZADOS", "").split(",") if email.strip()
+)
+
+COLUNAS = (
+    Booking.id,
+    Booking.space_id,
+    Booking.user_id,
+    Booking.start_time,
+    Booking.end_time,
+    Booking.status,
+    Booking.total_price,
+    Booking.created_at,
+)
+CAMPOS = tuple(coluna.key for coluna in COLUNAS)
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def validar_filtros(espaco_id: int = None, inicio: datetime = None, fim: datetime = None):
+    """Exige um espaço ou um período (inicio e fim) de até EXPORTACAO_MAX_DIAS"""
+    if inicio is None and fim is None:
+        if espaco_id is None:
+            raise HTTPException(status_code=400, detail="Informe espaco_id ou o período (inicio e fim)")
+        return
+    if inicio is None or fim is None:
+        raise HTTPException(status_code=400, detail="Informe inicio e fim do período")
+    if inicio >= fim:
+        raise HTTPException(status_code=400, detail="Horário de início deve ser antes do horário de fim")
+    if fim - inicio > timedelta(days=EXPORTACAO_MAX_DIAS):
+        raise HTTPException(status_code=400, detail=f"O período da exportação é limitado a {EXPORTACAO_MAX_DIAS} dias")
+
+def usuario_da_exportacao(usuario) -> int:
+    """Id cujas reservas o usuário pode exportar, ou None se ele exporta as de todos"""
+    return None if usuario.email.lower() in EXPORTACAO_AUTORIZADOS else usuario.id
+
+def consulta_exportacao(espaco_id: int = None, inicio: datetime = None, fim: datetime = None, usuario_id: int = None):
+    """Reservas que se sobrepõem ao período, em ordem de início, só com as colunas exportadas"""
+    consulta = select(*COLUNAS)
+    if usuario_id is not None:
+        consulta = consulta.where(Booking.user_id == usuario_id)
+    if espaco_id is not None:
+        consulta = consulta.where(Booking.space_id == espaco_id)
+    if inicio is not None:
+        consulta = consulta.where(Booking.end_time > inicio)
+    if fim is not None:
+        consulta = consulta.where(Booking.start_time < fim)
+    return consulta.order_by(Booking.start_time, Booking.id)
+
+def _valor(valor):
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, Enum):
+        return valor.value
+    return valor
+
+def _lote_ndjson(linhas) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(CAMPOS, map(_valor, linha))), ensure_ascii=False) + "\n"
+        for linha in linhas
+    ).encode()
+
+def _lote_csv(linhas) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([tuple(map(_valor, linha)) for linha in linhas])
+    return buffer.getvalue().encode()
+
+def _cabecalho_csv() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CAMPOS)
+    return buffer.getvalue().encode()
+
+SERIALIZADORES = {"ndjson": _lote_ndjson, "csv": _lote_csv}
+
+def exportar_reservas(engine: Engine, consulta, formato: str):
+    """Gerador síncrono dos bytes da exportação, um bloco por lote do cursor"""
+    serializar = SERIALIZADORES[formato]
+    if formato == "csv":
+        yield _cabecalho_csv()
+    with engine.connect() as conexao:
+        resultado = conexao.execution_options(yield_per=EXPORTACAO_LOTE).execute(consulta)
+        for lote in resultado.partitions():
+            yield serializar(lote)
+
+async def exportar_reservas_async(engine: AsyncEngine, consulta, formato: str):
+    """Versão assíncrona de `exportar_reservas`, usando AsyncConnection.stream"""
+    serializar = SERIALIZADORES[formato]
+    if formato == "csv":
+        yield _cabecalho_csv()
+    async with engine.connect() as conexao:
+        resultado = await conexao.stream(consulta.execution_options(yield_per=EXPORTACAO_LOTE))
+        async for lote in resultado.partitions():
+            yield serializar(lote)
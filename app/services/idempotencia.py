@@ -0,0 +1,200 @@
+"""
+Idempotency-Key nas escritas: repetir a requisição com a mesma chave devolve
+a resposta gravada da primeira vez, sem executar a operação de novo.
+
+Com uma chave (escopo: usuário + rota), a requisição:
+    - chave nova: reserva a chave, executa e grava status e corpo da resposta
+    - chave concluída, mesmo pedido: devolve a resposta gravada
+    - chave concluída, outro pedido (hash diferente): 422
+    - chave em processamento (a primeira ainda não terminou): 409 + Retry-After
+Se a execução falha (HTTPException ou erro), a chave é liberada e a repetição
+executa de novo. Uma chave em processamento há mais de
+IDEMPOTENCIA_PROCESSAMENTO_S (processo que caiu no meio) pode ser retomada.
+
+A execução deixa a escrita pendente na transação da sessão, sem commit; o
+armazém grava a resposta e faz um único commit com as duas (no banco, na
+mesma transação). Um processo que cai no meio não deixa a escrita feita sem a
+resposta, e a retomada da chave não a repete. A chave é de quem a reservou
+(created_at): uma requisição lenta cuja chave foi retomada desfaz a escrita.
+
+Armazéns (IDEMPOTENCIA_BACKEND; o do banco fica em app/crud/idempotency.py):
+    banco    tabela idempotency_keys, vale entre workers e instâncias (padrão)
+    memoria  por processo, até IDEMPOTENCIA_MAX_ITENS chaves (um único worker)
+
+Configuração (variáveis de ambiente):
+    IDEMPOTENCIA_BACKEND          banco | memoria
+    IDEMPOTENCIA_TTL_H            horas que a resposta fica gravada
+    IDEMPOTENCIA_PROCESSAMENTO_S  tempo após o qual uma chave em processamento pode ser retomada
+    IDEMPOTENCIA_MAX_ITENS        máximo de chaves no armazém em memória
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+
+IDEMPOTENCIA_BACKEND = os.getenv("IDEMPOTENCIA_BACKEND", "banco")
+IDEMPOTENCIA_TTL_H = float(os.getenv("IDEMPOTENCIA_TTL_H", "24"))
+IDEMPOTENCIA_PROCESSAMENTO_S = float(os.getenv("IDEMPOTENCIA_PROCESSAMENTO_S", "60"))
+IDEMPOTENCIA_MAX_ITENS = int(os.getenv("IDEMPOTENCIA_MAX_ITENS", "10000"))
+
+class Registro(NamedTuple):
+    request_hash: str
+    status_code: Optional[int]  # None: em processamento
+    corpo: Optional[bytes]
+    criado_em: datetime
+    expira_em: datetime
+
+def hash_pedido(pedido) -> str:
+    """Hash do corpo do pedido (JSON canônico)"""
+    return hashlib.sha256(json.dumps(pedido, sort_keys=True, default=str).encode()).hexdigest()
+
+def pode_substituir(registro: Registro, agora: datetime) -> bool:
+    """Expirada, ou em processamento há tempo demais"""
+    return registro.expira_em <= agora or (
+        registro.status_code is None
+        and registro.criado_em <= agora - timedelta(seconds=IDEMPOTENCIA_PROCESSAMENTO_S)
+    )
+
+class ArmazemIdempotencia:
+    """Interface dos armazéns; `db` é a sessão da requisição (ignorada pelos que não usam o banco)"""
+
+    def reservar(self, db, escopo: str, chave: str, request_hash: str, agora: datetime) -> Optional[Registro]:
+        """Marca a chave como em processamento e retorna None; se ela já existe e vale, retorna o registro"""
+        raise NotImplementedError
+
+    def concluir(self, db, escopo: str, chave: str, criado_em: datetime, status_code: int, corpo: bytes) -> bool:
+        """
+        Grava a resposta e faz o commit da escrita pendente na sessão. Se a chave
+        não é mais desta requisição (`criado_em`), desfaz a escrita e retorna False
+        """
+        raise NotImplementedError
+
+    def liberar(self, db, escopo: str, chave: str, criado_em: datetime):
+        """Desfaz a escrita pendente e remove a chave em processamento (a execução falhou)"""
+        raise NotImplementedError
+
+    def varrer(self, db, agora: datetime, lote: int) -> int:
+        """Remove até `lote` chaves expiradas; retorna quantas"""
+        raise NotImplementedError
+
+    def estatisticas(self) -> dict:
+        return {}
+
+class ArmazemMemoria(ArmazemIdempotencia):
+    """Chaves em memória, na ordem de chegada; acima de `max_itens` saem as mais antigas"""
+
+    def __init__(self, max_itens: int = 10_000):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()  # (escopo, chave) -> Registro
+        self._lock = threading.Lock()
+        self.despejos = 0
+
+    def reservar(self, db, escopo, chave, request_hash, agora):
+        with self._lock:
+            existente = self._itens.get((escopo, chave))
+            if existente is not None and not pode_substituir(existente, agora):
+                return existente
+            self._itens.pop((escopo, chave), None)
+            self._itens[(escopo, chave)] = Registro(
+                request_hash, None, None, agora, agora + timedelta(hours=IDEMPOTENCIA_TTL_H)
+            )
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self.despejos += 1
+            return None
+
+    def concluir(self, db, escopo, chave, criado_em, status_code, corpo):
+        # Sem transação em comum com o banco: commit da escrita, depois a resposta
+        # (um único processo; entre os dois, a chave segue em processamento)
+        with self._lock:
+            registro = self._itens.get((escopo, chave))
+            if registro is None or registro.criado_em != criado_em:
+                db.rollback()
+                return False
+        db.commit()
+        with self._lock:
+            registro = self._itens.get((escopo, chave))
+            if registro is not None and registro.criado_em == criado_em:
+                self._itens[(escopo, chave)] = registro._replace(status_code=status_code, corpo=corpo)
+        return True
+
+    def liberar(self, db, escopo, chave, criado_em):
+        db.rollback()
+        with self._lock:
+            registro = self._itens.get((escopo, chave))
+            if registro is not None and registro.status_code is None and registro.criado_em == criado_em:
+                del self._itens[(escopo, chave)]
+
+    def varrer(self, db, agora, lote):
+        with self._lock:
+            expiradas = [item for item, registro in self._itens.items() if registro.expira_em <= agora][:lote]
+            for item in expiradas:
+                del self._itens[item]
+            return len(expiradas)
+
+    def estatisticas(self) -> dict:
+        return {"itens": len(self._itens), "max_itens": self.max_itens, "despejos": self.despejos}
+
+class Idempotencia:
+    """Executa escritas com Idempotency-Key sobre um armazém"""
+
+    def __init__(self, armazem: ArmazemIdempotencia):
+        self.armazem = armazem
+        self.executadas = 0
+        self.repetidas = 0
+        self.conflitos = 0
+
+    def executar(
+        self, db, escopo: str, chave: str, pedido, executar: Callable[[], Tuple[int, bytes]]
+    ) -> Tuple[int, bytes, bool]:
+        """
+        (status, corpo, repetida): a resposta de `executar()` ou a gravada para a chave.
+        `executar()` deixa a escrita na sessão sem commit; o commit é feito aqui
+        """
+        request_hash = hash_pedido(pedido)
+        agora = datetime.now()
+        existente = self.armazem.reservar(db, escopo, chave, request_hash, agora)
+        if existente is not None:
+            if existente.request_hash != request_hash:
+                self.conflitos += 1
+                raise HTTPException(status_code=422, detail="Idempotency-Key já usada com outro pedido")
+            if existente.status_code is None:
+                self.conflitos += 1
+                raise HTTPException(
+                    status_code=409,
+                    detail="Requisição com esta Idempotency-Key ainda em processamento",
+                    headers={"Retry-After": "1"}
+                )
+            self.repetidas += 1
+            return existente.status_code, existente.corpo, True
+
+        try:
+            status_code, corpo = executar()
+            concluida = self.armazem.concluir(db, escopo, chave, agora, status_code, corpo)
+        except BaseException:
+            self.armazem.liberar(db, escopo, chave, agora)
+            raise
+        if not concluida:
+            # A chave foi retomada por outra requisição enquanto esta executava
+            self.conflitos += 1
+            raise HTTPException(
+                status_code=409,
+                detail="Requisição com esta Idempotency-Key retomada por outra requisição",
+                headers={"Retry-After": "1"}
+            )
+        self.executadas += 1
+        return status_code, corpo, False
+
+    def estatisticas(self) -> dict:
+        return {
+            "backend": type(self.armazem).__name__,
+            "executadas": self.executadas,
+            "repetidas": self.repetidas,
+            "conflitos": self.conflitos,
+            **self.armazem.estatisticas(),
+        }
@@ -0,0 +1,95 @@
+"""
+Busca de janelas livres em vários espaços.
+
+Cada espaço vira um gerador das suas janelas livres, em ordem de início,
+obtido varrendo as reservas ativas do período (já ordenadas por início).
+Os geradores são intercalados com um heap (heapq.merge), de modo que as
+primeiras N janelas entre todos os espaços saem sem calcular o resto.
+"""
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
+
+from app.services.precos import preco_intervalo
+from app.utils.validators import HORARIO_ABERTURA, HORARIO_FECHAMENTO, validar_horario_comercial
+
+def _trechos_comerciais(inicio: datetime, fim: datetime):
+    """Recorta [inicio, fim) no horário comercial de cada dia"""
+    dia = inicio.date()
+    while dia <= fim.date():
+        abertura = max(inicio, datetime.combine(dia, HORARIO_ABERTURA))
+        fechamento = min(fim, datetime.combine(dia, HORARIO_FECHAMENTO))
+        if abertura < fechamento:
+            yield abertura, fechamento
+        dia += timedelta(days=1)
+
+def janelas_livres_espaco(
+    ocupados,
+    inicio: datetime,
+    fim: datetime,
+    duracao: timedelta,
+    horario_comercial: bool = False
+):
+    """
+    Gera (inicio, livre_ate) de cada intervalo livre de pelo menos `duracao`
+    dentro de [inicio, fim). `ocupados` são pares (inicio, fim) ordenados por início.
+    """
+    def lacunas():
+        cursor = inicio
+        for ocupado_inicio, ocupado_fim in ocupados:
+            if ocupado_inicio > cursor:
+                yield cursor, min(ocupado_inicio, fim)
+            if ocupado_fim > cursor:
+                cursor = ocupado_fim
+            if cursor >= fim:
+                return
+        if cursor < fim:
+            yield cursor, fim
+
+    for lacuna_inicio, lacuna_fim in lacunas():
+        trechos = (
+            _trechos_comerciais(lacuna_inicio, lacuna_fim)
+            if horario_comercial else ((lacuna_inicio, lacuna_fim),)
+        )
+        for trecho_inicio, trecho_fim in trechos:
+            if trecho_fim - trecho_inicio < duracao:
+                continue
+            if horario_comercial and not validar_horario_comercial(trecho_inicio, trecho_inicio + duracao):
+                continue
+            yield trecho_inicio, trecho_fim
+
+def primeiras_janelas(
+    espacos,
+    ocupados_por_espaco: dict,
+    inicio: datetime,
+    fim: datetime,
+    duracao: timedelta,
+    limite: int,
+    horario_comercial: bool = False,
+    tabelas: dict = None
+) -> list:
+    """
+    As `limite` janelas livres mais cedo entre todos os espaços (empate: menor id).
+    `tabelas` ({space_id: TabelaPrecos}) precifica como a cotação e a reserva
+    """
+    tabelas = tabelas or {}
+    def janelas(espaco):
+        for janela_inicio, livre_ate in janelas_livres_espaco(
+            ocupados_por_espaco.get(espaco.id, ()), inicio, fim, duracao, horario_comercial
+        ):
+            yield janela_inicio, espaco.id, livre_ate, espaco
+
+    intercaladas = heapq.merge(*(janelas(espaco) for espaco in espacos), key=lambda j: (j[0], j[1]))
+    return [
+        {
+            "space_id": espaco_id,
+            "espaco_nome": espaco.name,
+            "inicio": janela_inicio,
+            "fim": janela_inicio + duracao,
+            "livre_ate": livre_ate,
+            "preco_total": preco_intervalo(
+                espaco.price_per_hour, janela_inicio, janela_inicio + duracao, tabelas.get(espaco_id)
+            ),
+        }
+        for janela_inicio, espaco_id, livre_ate, espaco in islice(intercaladas, limite)
+    ]
@@ -0,0 +1,317 @@
+"""
+Limite de taxa por usuário ou IP (token bucket), aplicado por um middleware
+ASGI antes de qualquer consulta ao banco ou bcrypt.
+
+Cada requisição cai em um grupo de rotas, e cada grupo tem um balde por
+chave com capacidade C que se recompõe C fichas a cada S segundos ("C/S"):
+    login            POST /auth/login e /auth/registrar, sempre por IP
+                     (credential stuffing troca de usuário, não de IP)
+    disponibilidade  verificar-disponibilidade, cotação e busca de janelas livres
+    escrita          demais POST/PUT/PATCH/DELETE
+    leitura          demais GET
+/health e /metrics ficam fora. A chave é o id do usuário quando o token
+Bearer já está no cache de tokens (foi verificado por um endpoint); senão,
+o IP do cliente. Atrás de um proxy, o IP real vem do uvicorn/gunicorn com
+FORWARDED_ALLOW_IPS apontando para o proxy. Acima do limite: 429 com
+Retry-After.
+
+O balde é guardado como um único número por chave (GCRA): o instante em que
+ele volta a estar cheio. Chaves com esse instante no passado equivalem a um
+balde cheio e podem ser descartadas sem mudar nada, o que mantém a estrutura
+pequena; só sob muitas chaves ativas saem as usadas há mais tempo (que
+ganham um balde novo), nunca as de um cliente que continua mandando requisições.
+
+Backends (LIMITE_TAXA_BACKEND):
+    local  por processo, dicionários em fatias com um lock cada (padrão; com
+           vários workers, cada um aplica o limite à parte)
+    redis  compartilhado entre workers e instâncias, um script Lua por
+           requisição (requer o pacote `redis`); se o Redis falha, a requisição passa
+
+Configuração (variáveis de ambiente):
+    LIMITE_TAXA_ATIVO            liga o middleware
+    LIMITE_TAXA_BACKEND          local | redis
+    LIMITE_TAXA_URL              URL do Redis (backend redis)
+    LIMITE_TAXA_MAX_CHAVES       máximo de chaves no backend local
+    LIMITE_TAXA_LOGIN            "C/S" de cada grupo (0 desliga o grupo)
+    LIMITE_TAXA_DISPONIBILIDADE
+    LIMITE_TAXA_ESCRITA
+    LIMITE_TAXA_LEITURA
+"""
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from starlette.routing import Match
+
+from app.auth.cache import cache_tokens
+from app.services.serializacao import para_json
+
+LIMITE_TAXA_ATIVO = os.getenv("LIMITE_TAXA_ATIVO", "true").lower() in ("1", "true", "sim")
+LIMITE_TAXA_BACKEND = os.getenv("LIMITE_TAXA_BACKEND", "local")
+LIMITE_TAXA_URL = os.getenv("LIMITE_TAXA_URL", "redis://localhost:6379/0")
+LIMITE_TAXA_MAX_CHAVES = int(os.getenv("LIMITE_TAXA_MAX_CHAVES", "100000"))
+
+PADROES = {
+    "login": "10/60",
+    "disponibilidade": "120/60",
+    "escrita": "60/60",
+    "leitura": "1200/60",
+}
+
+ISENTAS = frozenset({"/health", "/metrics"})
+ROTAS_LOGIN = frozenset({"/auth/login", "/auth/registrar"})
+ROTAS_DISPONIBILIDADE = frozenset({
+    "/reservas/verificar-disponibilidade", "/reservas/cotacao", "/disponibilidade/buscar"
+})
+METODOS_LEITURA = frozenset({"GET", "HEAD", "OPTIONS"})
+
+logger = logging.getLogger(__name__)
+
+class Regra(NamedTuple):
+    capacidade: int
+    periodo_s: float
+    intervalo_s: float  # tempo para recompor uma ficha (periodo_s / capacidade)
+
+    @classmethod
+    def criar(cls, capacidade: int, periodo_s: float) -> "Regra":
+        return cls(capacidade, periodo_s, periodo_s / capacidade)
+
+def interpretar_regra(valor: str) -> Optional[Regra]:
+    """"C/S" -> Regra(C, S); "0" ou vazio -> None (grupo sem limite)"""
+    valor = valor.strip()
+    if valor in ("", "0"):
+        return None
+    capacidade, _, periodo = valor.partition("/")
+    capacidade, periodo = int(capacidade), float(periodo or 1)
+    if capacidade <= 0 or periodo <= 0:
+        return None
+    return Regra.criar(capacidade, periodo)
+
+def regras_do_ambiente() -> Dict[str, Regra]:
+    regras = {}
+    for grupo, padrao in PADROES.items():
+        regra = interpretar_regra(os.getenv(f"LIMITE_TAXA_{grupo.upper()}", padrao))
+        if regra is not None:
+            regras[grupo] = regra
+    return regras
+
+def grupo_da_rota(metodo: str, caminho: str) -> Optional[str]:
+    if caminho in ISENTAS:
+        return None
+    if caminho in ROTAS_LOGIN and metodo == "POST":
+        return "login"
+    if caminho in ROTAS_DISPONIBILIDADE:
+        return "disponibilidade"
+    if metodo in METODOS_LEITURA:
+        return "leitura"
+    return "escrita"
+
+class ArmazemLimites:
+    """Interface dos backends: consome uma ficha do balde da chave"""
+
+    async def consumir(self, chave: str, regra: Regra) -> float:
+        """0 se a requisição passa; senão, os segundos até haver uma ficha"""
+        raise NotImplementedError
+
+    def estatisticas(self) -> dict:
+        return {}
+
+class ArmazemLocal(ArmazemLimites):
+    """
+    Baldes por processo em `fatias` dicionários (chave -> instante de balde
+    cheio), na ordem do uso mais recente, cada um com seu lock: threads
+    diferentes raramente disputam o mesmo
+    """
+
+    def __init__(self, max_chaves: int = 100_000, fatias: int = 16):
+        self.max_por_fatia = max(1, max_chaves // fatias)
+        self._fatias = [({}, threading.Lock()) for _ in range(fatias)]
+        self.despejos = 0
+
+    def tomar(self, chave: str, regra: Regra, agora: float) -> float:
+        _, periodo_s, intervalo_s = regra
+        baldes, lock = self._fatias[hash(chave) % len(self._fatias)]
+        # acquire/release em vez de `with`: metade do custo neste caminho quente
+        lock.acquire()
+        try:
+            # pop + set: a chave vai para o fim, e a ordem do dicionário é a do uso mais recente
+            anterior = baldes.pop(chave, None)
+            cheio_em = agora if anterior is None or anterior < agora else anterior
+            novo = cheio_em + intervalo_s
+            espera = novo - agora - periodo_s
+            if espera > 0:
+                # Recusada: não consome, mas conta como uso
+                baldes[chave] = anterior
+                return espera
+            baldes[chave] = novo
+            if len(baldes) > self.max_por_fatia:
+                self._despejar(baldes, agora)
+            return 0.0
+        finally:
+            lock.release()
+
+    def _despejar(self, baldes: dict, agora: float):
+        # Chamado com o lock da fatia: primeiro os baldes já cheios (sem efeito no
+        # limite); se não bastar, os usados há mais tempo (início do dicionário)
+        # até sobrar um oitavo de folga
+        cheios = [chave for chave, cheio_em in baldes.items() if cheio_em <= agora]
+        for chave in cheios:
+            del baldes[chave]
+        alvo = self.max_por_fatia - self.max_por_fatia // 8
+        while len(baldes) > alvo:
+            del baldes[next(iter(baldes))]
+            self.despejos += 1
+
+    async def consumir(self, chave, regra):
+        return self.tomar(chave, regra, time.monotonic())
+
+    def estatisticas(self) -> dict:
+        return {
+            "chaves": sum(len(baldes) for baldes, _ in self._fatias),
+            "max_chaves": self.max_por_fatia * len(self._fatias),
+            "despejos": self.despejos,
+        }
+
+# GCRA no Redis com o relógio do próprio Redis (iguais para todos os workers)
+_SCRIPT_GCRA = """
+local t = redis.call('TIME')
+local agora = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local intervalo = tonumber(ARGV[1])
+local periodo = tonumber(ARGV[2])
+local cheio_em = tonumber(redis.call('GET', KEYS[1]) or '0')
+if cheio_em < agora then cheio_em = agora end
+local novo = cheio_em + intervalo
+local espera = novo - agora - periodo
+if espera > 0 then return tostring(espera) end
+redis.call('SET', KEYS[1], tostring(novo), 'PX', math.ceil((novo - agora) * 1000))
+return '0'
+"""
+
+class ArmazemRedis(ArmazemLimites):
+    """Baldes no Redis; cada chave expira quando o balde volta a estar cheio"""
+
+    def __init__(self, url: str, prefixo: str = "booking:limite:"):
+        import redis.asyncio  # dependência opcional, só com LIMITE_TAXA_BACKEND=redis
+        self._cliente = redis.asyncio.Redis.from_url(url)
+        self._script = self._cliente.register_script(_SCRIPT_GCRA)
+        self.prefixo = prefixo
+        self.erros = 0
+
+    async def consumir(self, chave, regra):
+        try:
+            espera = await self._script(keys=[self.prefixo + chave], args=[regra.intervalo_s, regra.periodo_s])
+        except Exception:
+            # Sem o Redis, não derruba a API: a requisição passa sem limite
+            self.erros += 1
+            logger.warning("Falha no Redis do limite de taxa", exc_info=self.erros == 1)
+            return 0.0
+        return float(espera)
+
+    def estatisticas(self) -> dict:
+        return {"erros": self.erros}
+
+def criar_armazem(nome: str = LIMITE_TAXA_BACKEND) -> ArmazemLimites:
+    if nome == "local":
+        return ArmazemLocal(LIMITE_TAXA_MAX_CHAVES)
+    if nome == "redis":
+        return ArmazemRedis(LIMITE_TAXA_URL)
+    raise ValueError(f"LIMITE_TAXA_BACKEND inválido: {nome}")
+
+class LimiteTaxa:
+    """Regras por grupo de rotas sobre um armazém de baldes, com contadores por grupo"""
+
+    def __init__(self, armazem: ArmazemLimites, regras: Dict[str, Regra]):
+        self.armazem = armazem
+        self.regras = regras
+        self.permitidas = dict.fromkeys(regras, 0)
+        self.recusadas = dict.fromkeys(regras, 0)
+
+    async def verificar(self, grupo: str, chave: str) -> float:
+        """0 se a requisição passa; senão, os segundos de espera"""
+        espera = await self.armazem.consumir(f"{grupo}:{chave}", self.regras[grupo])
+        if espera > 0:
+            self.recusadas[grupo] += 1
+        else:
+            self.permitidas[grupo] += 1
+        return espera
+
+    def estatisticas(self) -> dict:
+        return {
+            "backend": type(self.armazem).__name__,
+            "grupos": {
+                grupo: {
+                    "limite": f"{regra.capacidade}/{regra.periodo_s:g}s",
+                    "permitidas": self.permitidas[grupo],
+                    "recusadas": self.recusadas[grupo],
+                }
+                for grupo, regra in self.regras.items()
+            },
+            **self.armazem.estatisticas(),
+        }
+
+limite_taxa = LimiteTaxa(criar_armazem(), regras_do_ambiente())
+
+def _token_bearer(scope) -> Optional[str]:
+    for nome, valor in scope["headers"]:
+        if nome == b"authorization":
+            esquema, _, token = valor.decode("latin-1").partition(" ")
+            return token.strip() if esquema.lower() == "bearer" else None
+    return None
+
+def chave_cliente(scope, grupo: str) -> str:
+    """u:<id> para tokens já verificados (no cache); ip:<endereço> nos demais casos"""
+    if grupo != "login":
+        token = _token_bearer(scope)
+        if token:
+            usuario_id = cache_tokens.usuario_id(token)
+            if usuario_id is not None:
+                return f"u:{usuario_id}"
+    cliente = scope.get("client")
+    return f"ip:{cliente[0] if cliente else '-'}"
+
+def _marcar_rota(scope):
+    # Só nas recusas, para as métricas rotularem o 429 com a rota: a requisição não chega ao roteador
+    roteador = getattr(scope.get("app"), "router", None)
+    for rota in getattr(roteador, "routes", ()):
+        correspondencia, filho = rota.matches(scope)
+        if correspondencia == Match.FULL:
+            scope.update(filho)
+            return
+
+class MiddlewareLimiteTaxa:
+    """Middleware ASGI que recusa com 429 as requisições HTTP acima do limite do grupo"""
+
+    def __init__(self, app, limite: LimiteTaxa = limite_taxa):
+        self.app = app
+        self.limite = limite
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        grupo = grupo_da_rota(scope["method"], scope["path"])
+        if grupo is None or grupo not in self.limite.regras:
+            await self.app(scope, receive, send)
+            return
+
+        espera = await self.limite.verificar(grupo, chave_cliente(scope, grupo))
+        if espera <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        _marcar_rota(scope)
+        segundos = max(1, math.ceil(espera))
+        corpo = para_json({"detail": f"Muitas requisições; tente novamente em {segundos} s"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(corpo)).encode()),
+                (b"retry-after", str(segundos).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": corpo})
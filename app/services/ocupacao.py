@@ -0,0 +1,65 @@
+"""
+Mapa de ocupação diário por espaço: um bitset de slots de 15 minutos.
+
+Cada dia tem 96 slots (bit i = [i*15min, (i+1)*15min)), guardados em 12 bytes.
+Um slot fica marcado quando alguma reserva ativa toca nele, mesmo que só em
+parte. Marcar é um OR; desmarcar não é (duas reservas podem dividir um slot),
+então cancelamentos recalculam os dias afetados a partir das reservas.
+"""
+from datetime import date, datetime, time, timedelta
+
+SLOT_MINUTOS = 15
+SLOTS_POR_DIA = 24 * 60 // SLOT_MINUTOS
+BYTES_POR_DIA = SLOTS_POR_DIA // 8
+DIA_CHEIO = (1 << SLOTS_POR_DIA) - 1
+
+def dias_do_intervalo(inicio: datetime, fim: datetime):
+    """Dias tocados pelo intervalo [inicio, fim)"""
+    dia = inicio.date()
+    ultimo = (fim - timedelta(microseconds=1)).date()
+    while dia <= ultimo:
+        yield dia
+        dia += timedelta(days=1)
+
+def mascara_dia(inicio: datetime, fim: datetime, dia: date) -> int:
+    """Bits dos slots do `dia` tocados pelo intervalo [inicio, fim)"""
+    abertura = datetime.combine(dia, time())
+    inicio_minutos = max((inicio - abertura).total_seconds() / 60, 0)
+    fim_minutos = min((fim - abertura).total_seconds() / 60, 24 * 60)
+    if fim_minutos <= inicio_minutos:
+        return 0
+    primeiro = int(inicio_minutos // SLOT_MINUTOS)
+    # Arredonda para cima: um slot tocado em parte conta como ocupado
+    ultimo = -int(-fim_minutos // SLOT_MINUTOS)
+    return ((1 << (ultimo - primeiro)) - 1) << primeiro
+
+def mascaras(inicio: datetime, fim: datetime):
+    """Pares (dia, bits) de cada dia tocado pelo intervalo"""
+    for dia in dias_do_intervalo(inicio, fim):
+        yield dia, mascara_dia(inicio, fim, dia)
+
+def para_bytes(bits: int) -> bytes:
+    return bits.to_bytes(BYTES_POR_DIA, "little")
+
+def de_bytes(dados: bytes) -> int:
+    return int.from_bytes(dados or b"", "little")
+
+# Rótulo "HH:MM" do início de cada slot (o último, 24:00, é o fim do dia)
+HORAS_SLOTS = tuple(
+    f"{slot * SLOT_MINUTOS // 60:02d}:{slot * SLOT_MINUTOS % 60:02d}" for slot in range(SLOTS_POR_DIA + 1)
+)
+
+def faixas(bits: int) -> list:
+    """Sequências de slots marcados como faixas "HH:MM-HH:MM" (24:00 = fim do dia)"""
+    resultado = []
+    while bits:
+        # Primeiro bit ligado e tamanho da sequência a partir dele, sem percorrer slot a slot
+        inicio = (bits & -bits).bit_length() - 1
+        sequencia = bits >> inicio
+        comprimento = ((sequencia + 1) & ~sequencia).bit_length() - 1
+        resultado.append(f"{HORAS_SLOTS[inicio]}-{HORAS_SLOTS[inicio + comprimento]}")
+        bits &= ~(((1 << comprimento) - 1) << inicio)
+    return resultado
+
+def fracao_ocupada(bits: int) -> float:
+    return round(bin(bits).count("1") / SLOTS_POR_DIA, 4)
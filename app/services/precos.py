@@ -0,0 +1,109 @@
+"""
+Tabela de preços semanal de um espaço, em slots de 15 minutos.
+
+Regras de preço de um espaço:
+    faixa    dias da semana + horário [inicio, fim) com um multiplicador sobre o
+             preço por hora; faixas sobrepostas se multiplicam (ex.: fim de
+             semana 1.2 e noite 1.5 dão 1.8 no sábado à noite)
+    duracao  multiplicador sobre o total para reservas a partir de N minutos;
+             vale só o de maior duração mínima atingida
+
+As faixas são compiladas em somas prefixadas: `acumulado[s]` é o custo desde
+segunda 00:00 até o início do slot s da semana (7 × 96 + 1 valores). O custo
+de qualquer intervalo é G(fim) − G(inicio), com G(t) = semanas completas ×
+custo da semana + acumulado até t na semana (proporcional dentro do slot),
+em tempo constante, por mais longo que seja o intervalo.
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from typing import NamedTuple
+
+from app.services.ocupacao import SLOT_MINUTOS, SLOTS_POR_DIA
+
+SLOTS_POR_SEMANA = 7 * SLOTS_POR_DIA
+MINUTOS_POR_SEMANA = SLOTS_POR_SEMANA * SLOT_MINUTOS
+# Uma segunda-feira 00:00: origem da contagem de semanas
+SEGUNDA_REFERENCIA = datetime(2000, 1, 3)
+TODOS_OS_DIAS = (1 << 7) - 1
+
+class Faixa(NamedTuple):
+    dias: int               # bit 0 = segunda ... bit 6 = domingo
+    inicio_minutos: int     # múltiplos de SLOT_MINUTOS, 0..1440
+    fim_minutos: int
+    multiplicador: float
+
+class DescontoDuracao(NamedTuple):
+    duracao_minima_minutos: int
+    multiplicador: float
+
+class TabelaPrecos:
+    """Custos compilados de um preço por hora com suas faixas e descontos"""
+    __slots__ = ("custos", "acumulado", "custo_semana", "descontos")
+
+    def __init__(self, preco_por_hora: float, faixas=(), descontos=()):
+        custos = [preco_por_hora * SLOT_MINUTOS / 60] * SLOTS_POR_SEMANA
+        for faixa in faixas:
+            for dia in range(7):
+                if faixa.dias >> dia & 1:
+                    base = dia * SLOTS_POR_DIA
+                    for slot in range(base + faixa.inicio_minutos // SLOT_MINUTOS, base + faixa.fim_minutos // SLOT_MINUTOS):
+                        custos[slot] *= faixa.multiplicador
+        self.custos = custos
+        self.acumulado = list(accumulate(custos, initial=0.0))
+        self.custo_semana = self.acumulado[-1]
+        # Do maior para o menor: o primeiro atingido é o que vale
+        self.descontos = sorted(descontos, reverse=True)
+
+    def _custo_ate(self, instante: datetime) -> float:
+        """Custo acumulado desde SEGUNDA_REFERENCIA até `instante`"""
+        minutos = (instante - SEGUNDA_REFERENCIA) / timedelta(minutes=1)
+        semanas, na_semana = divmod(minutos, MINUTOS_POR_SEMANA)
+        slot, fracao = divmod(na_semana, SLOT_MINUTOS)
+        slot = min(int(slot), SLOTS_POR_SEMANA - 1)
+        return semanas * self.custo_semana + self.acumulado[slot] + self.custos[slot] * fracao / SLOT_MINUTOS
+
+    def preco(self, inicio: datetime, fim: datetime) -> float:
+        """Preço de [inicio, fim), arredondado em centavos"""
+        custo = self._custo_ate(fim) - self._custo_ate(inicio)
+        duracao_minutos = (fim - inicio) / timedelta(minutes=1)
+        for desconto in self.descontos:
+            if duracao_minutos >= desconto.duracao_minima_minutos:
+                custo *= desconto.multiplicador
+                break
+        return round(custo, 2)
+
+def preco_intervalo(preco_por_hora: float, inicio: datetime, fim: datetime, tabela: TabelaPrecos = None) -> float:
+    """
+    Preço de [inicio, fim) pela tabela do espaço; sem regras, preço por hora × duração.
+    Arredondado em centavos nos dois casos
+    """
+    if tabela is not None:
+        return tabela.preco(inicio, fim)
+    return round(preco_por_hora * (fim - inicio).total_seconds() / 3600, 2)
+
+@lru_cache(maxsize=1024)
+def compilar(preco_por_hora: float, faixas: tuple = (), descontos: tuple = ()) -> TabelaPrecos:
+    """Tabela compilada, compartilhada entre espaços com o mesmo preço e as mesmas regras"""
+    return TabelaPrecos(preco_por_hora, faixas, descontos)
+
+def dias_para_bits(dias) -> int:
+    """Dias da semana (0 = segunda ... 6 = domingo) como máscara de bits"""
+    bits = 0
+    for dia in dias:
+        bits |= 1 << dia
+    return bits
+
+def bits_para_dias(bits: int) -> list:
+    return [dia for dia in range(7) if bits >> dia & 1]
+
+def minutos_para_hora(minutos: int) -> str:
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+def hora_para_minutos(hora: str) -> int:
+    """"HH:MM" (até "24:00") em minutos desde a meia-noite"""
+    horas, _, minutos = hora.partition(":")
+    total = int(horas) * 60 + int(minutos)
+    if not 0 <= total <= 24 * 60 or not 0 <= int(minutos) < 60:
+        raise ValueError(f"Horário inválido: {hora}")
+    return total
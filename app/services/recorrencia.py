@@ -0,0 +1,165 @@
+"""
+Regras de recorrência no estilo RRULE (RFC 5545) e expansão das ocorrências.
+
+Subconjunto suportado:
+    FREQ=DAILY|WEEKLY|MONTHLY   obrigatório
+    INTERVAL=n                  a cada n dias/semanas/meses (padrão 1)
+    BYDAY=MO,WE,...             dias da semana (apenas com FREQ=WEEKLY)
+    COUNT=n | UNTIL=AAAAMMDD[THHMMSS]
+
+Exemplo: "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=20"
+
+A expansão é um gerador: as ocorrências são calculadas sob demanda, em ordem
+de início, e só até o limite pedido por quem consome.
+
+Configuração (variáveis de ambiente):
+    RECORRENCIA_HORIZONTE_DIAS    0 materializa a série inteira ao criar; n > 0 materializa
+                                  só os próximos n dias e o restante conforme o horizonte avança
+    RECORRENCIA_MAX_OCORRENCIAS   máximo de ocorrências por série
+"""
+import os
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+RECORRENCIA_HORIZONTE_DIAS = int(os.getenv("RECORRENCIA_HORIZONTE_DIAS", "0"))
+RECORRENCIA_MAX_OCORRENCIAS = int(os.getenv("RECORRENCIA_MAX_OCORRENCIAS", "1000"))
+
+DIAS_SEMANA = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIAS = ("DAILY", "WEEKLY", "MONTHLY")
+
+# Uma regra mensal que nunca casa (ex.: dia 30 a cada 12 meses a partir de
+# fevereiro) não pode prender a expansão para sempre
+LIMITE_ANOS_EXPANSAO = 100
+
+class Ocorrencia(NamedTuple):
+    start_time: datetime
+    end_time: datetime
+
+class RegraRecorrencia(NamedTuple):
+    frequencia: str
+    intervalo: int = 1
+    dias_semana: tuple = ()
+    contagem: Optional[int] = None
+    ate: Optional[datetime] = None
+
+    @property
+    def limitada(self) -> bool:
+        return self.contagem is not None or self.ate is not None
+
+    @classmethod
+    def interpretar(cls, texto: str) -> "RegraRecorrencia":
+        """Interpreta o texto da regra; levanta ValueError se inválido ou não suportado"""
+        texto = texto.strip()
+        if texto.upper().startswith("RRULE:"):
+            texto = texto[len("RRULE:"):]
+
+        partes = {}
+        for parte in texto.split(";"):
+            chave, separador, valor = parte.partition("=")
+            if not separador or not valor:
+                raise ValueError(f"Parte inválida na regra: {parte!r}")
+            partes[chave.strip().upper()] = valor.strip().upper()
+
+        nao_suportadas = set(partes) - {"FREQ", "INTERVAL", "BYDAY", "COUNT", "UNTIL"}
+        if nao_suportadas:
+            raise ValueError(f"Parâmetros não suportados: {', '.join(sorted(nao_suportadas))}")
+
+        frequencia = partes.get("FREQ")
+        if frequencia not in FREQUENCIAS:
+            raise ValueError(f"FREQ deve ser uma de: {', '.join(FREQUENCIAS)}")
+
+        intervalo = int(partes.get("INTERVAL", "1"))
+        if intervalo < 1:
+            raise ValueError("INTERVAL deve ser maior que zero")
+
+        dias_semana = ()
+        if "BYDAY" in partes:
+            if frequencia != "WEEKLY":
+                raise ValueError("BYDAY só é suportado com FREQ=WEEKLY")
+            try:
+                dias_semana = tuple(sorted({DIAS_SEMANA.index(dia) for dia in partes["BYDAY"].split(",")}))
+            except ValueError:
+                raise ValueError(f"BYDAY deve conter apenas: {', '.join(DIAS_SEMANA)}")
+
+        contagem = int(partes["COUNT"]) if "COUNT" in partes else None
+        if contagem is not None and contagem < 1:
+            raise ValueError("COUNT deve ser maior que zero")
+
+        ate = _interpretar_data(partes["UNTIL"]) if "UNTIL" in partes else None
+        if contagem is not None and ate is not None:
+            raise ValueError("COUNT e UNTIL não podem ser usados juntos")
+
+        return cls(frequencia, intervalo, dias_semana, contagem, ate)
+
+def _interpretar_data(valor: str) -> datetime:
+    valor = valor.rstrip("Z")
+    for formato in ("%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            data = datetime.strptime(valor, formato)
+        except ValueError:
+            continue
+        # UNTIL só com a data inclui o dia inteiro
+        return data if "T" in valor else data.replace(hour=23, minute=59, second=59)
+    raise ValueError("UNTIL deve estar no formato AAAAMMDD ou AAAAMMDDTHHMMSS")
+
+def _inicios(regra: RegraRecorrencia, inicio: datetime):
+    """Inícios candidatos, em ordem, a partir do início da série (sem aplicar COUNT/UNTIL)"""
+    limite = inicio.replace(year=min(inicio.year + LIMITE_ANOS_EXPANSAO, 9999), month=1, day=1)
+    if regra.frequencia == "DAILY":
+        passo = timedelta(days=regra.intervalo)
+        atual = inicio
+        while atual < limite:
+            yield atual
+            atual += passo
+    elif regra.frequencia == "WEEKLY":
+        dias = regra.dias_semana or (inicio.weekday(),)
+        semana = inicio - timedelta(days=inicio.weekday())
+        passo = timedelta(weeks=regra.intervalo)
+        while semana < limite:
+            for dia in dias:
+                candidato = semana + timedelta(days=dia)
+                if candidato >= inicio:
+                    yield candidato
+            semana += passo
+    else:
+        meses = 0
+        while True:
+            mes = inicio.month - 1 + meses
+            ano = inicio.year + mes // 12
+            if ano >= limite.year:
+                return
+            try:
+                yield inicio.replace(year=ano, month=mes % 12 + 1)
+            except ValueError:
+                # Mês sem esse dia (ex.: 31): a ocorrência é ignorada, como na RFC 5545
+                pass
+            meses += regra.intervalo
+
+def expandir(
+    regra: RegraRecorrencia,
+    inicio: datetime,
+    duracao: timedelta,
+    desde: datetime = None,
+    ate: datetime = None
+):
+    """
+    Gera as ocorrências da série que começam em [desde, ate), em ordem.
+    COUNT conta desde o início da série, mesmo as ocorrências antes de `desde`.
+    """
+    emitidas = 0
+    for inicio_ocorrencia in _inicios(regra, inicio):
+        if regra.ate is not None and inicio_ocorrencia > regra.ate:
+            return
+        if ate is not None and inicio_ocorrencia >= ate:
+            return
+        emitidas += 1
+        if regra.contagem is not None and emitidas > regra.contagem:
+            return
+        if desde is None or inicio_ocorrencia >= desde:
+            yield Ocorrencia(inicio_ocorrencia, inicio_ocorrencia + duracao)
+
+def horizonte_materializacao(agora: datetime = None) -> Optional[datetime]:
+    """Até quando as ocorrências devem estar materializadas (None: a série inteira)"""
+    if RECORRENCIA_HORIZONTE_DIAS <= 0:
+        return None
+    return (agora or datetime.now()) + timedelta(days=RECORRENCIA_HORIZONTE_DIAS)
@@ -0,0 +1,104 @@
+"""
+Serialização rápida das listagens mais acessadas.
+
+Em vez de carregar objetos do ORM e validá-los de novo nos schemas de resposta
+(`from_attributes`, campo a campo), as rotas quentes selecionam só as colunas
+da resposta, já rotuladas com o nome do campo da API, e montam dicts prontos
+para o JSON. Os mapas abaixo são a fonte da correspondência coluna → campo e
+seguem a ordem dos campos de EspacoResposta e ReservaResposta.
+
+O JSON é gerado com orjson quando instalado (datetime e Enum nativos); sem ele,
+com o módulo json da biblioteca padrão.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+
+from fastapi.responses import JSONResponse
+
+from app.models.booking import Booking
+from app.models.space import Space
+from app.models.user import User
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CAMPOS_ESPACO = {
+    "nome": Space.name,
+    "descricao": Space.description,
+    "capacidade": Space.capacity,
+    "preco_por_hora": Space.price_per_hour,
+    "id": Space.id,
+    "esta_disponivel": Space.is_available,
+    "criado_em": Space.created_at,
+}
+
+CAMPOS_RESERVA = {
+    "space_id": Booking.space_id,
+    "start_time": Booking.start_time,
+    "end_time": Booking.end_time,
+    "id": Booking.id,
+    "user_id": Booking.user_id,
+    "status": Booking.status,
+    "total_price": Booking.total_price,
+    "criado_em": Booking.created_at,
+}
+
+CAMPOS_USUARIO = {
+    "id": User.id,
+    "email": User.email,
+    "nome_completo": User.full_name,
+}
+
+# include=... da API -> (campo aninhado na resposta, campos do relacionado)
+INCLUSOES_RESERVA = {
+    "space": ("espaco", CAMPOS_ESPACO),
+    "user": ("usuario", CAMPOS_USUARIO),
+}
+
+def colunas(campos: dict, entidade=None) -> list:
+    """
+    Colunas rotuladas com o nome do campo da API, para usar em select().
+    Com `entidade` (um aliased() do modelo), as colunas vêm dela.
+    """
+    if entidade is not None:
+        return [getattr(entidade, coluna.key).label(campo) for campo, coluna in campos.items()]
+    return [coluna.label(campo) for campo, coluna in campos.items()]
+
+def como_dicts(resultado) -> list:
+    """Linhas de um resultado Core como dicts {campo: valor}"""
+    chaves = tuple(resultado.keys())
+    return [dict(zip(chaves, linha)) for linha in resultado]
+
+def de_objeto(objeto, campos: dict) -> dict:
+    """Dict {campo: valor} de um objeto do ORM, pelos atributos mapeados em `campos`"""
+    return {campo: getattr(objeto, coluna.key) for campo, coluna in campos.items()}
+
+def reserva_com_inclusoes(reserva, inclusoes=()) -> dict:
+    """Reserva no formato da API, com os relacionados pedidos já carregados aninhados"""
+    dados = de_objeto(reserva, CAMPOS_RESERVA)
+    for nome in inclusoes:
+        campo, campos = INCLUSOES_RESERVA[nome]
+        dados[campo] = de_objeto(getattr(reserva, nome), campos)
+    return dados
+
+def _padrao(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Enum):
+        return valor.value
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+def para_json(dados) -> bytes:
+    if orjson is not None:
+        # UTC como "Z", igual ao que o Pydantic gera
+        return orjson.dumps(dados, option=orjson.OPT_UTC_Z)
+    return json.dumps(dados, default=_padrao, ensure_ascii=False, separators=(",", ":")).encode()
+
+class RespostaJSON(JSONResponse):
+    """JSONResponse que renderiza com `para_json` (conteúdo já no formato da API)"""
+
+    def render(self, content) -> bytes:
+        return para_json(content)
@@ -0,0 +1,259 @@
+"""
+Eventos de ocupação em tempo real por espaço (WebSocket e SSE).
+
+As escritas publicam um delta por espaço depois do commit; cada conexão
+assina alguns espaços e recebe os deltas deles, no lugar de consultar a
+disponibilidade/reservas a cada poucos segundos. Eventos:
+
+    reserva         reserva criada ou com status alterado (id, start_time, end_time, status)
+    espaco          disponibilidade do espaço alterada (esta_disponivel)
+    ressincronizar  mudanças em massa (séries recorrentes, transições, consumidor lento):
+                    o cliente relê o espaço
+    assinado        espaços assinados pela conexão (o cliente carrega o estado inicial ao recebê-lo)
+
+Cada assinante tem uma fila limitada com coalescência: um delta novo da
+mesma reserva substitui o pendente, e um consumidor que acumula mais que
+TEMPO_REAL_FILA_MAX eventos troca os do espaço mais atrasado por um único
+"ressincronizar". Eventos de controle (assinado, erro) não têm espaço e nunca
+são descartados (cada tipo substitui o anterior). Quem publica (threads do threadpool ou o próprio event
+loop) nunca espera um consumidor lento.
+
+Backends (TEMPO_REAL_BACKEND):
+    local    só o processo atual (padrão; um worker ou uma instância)
+    memoria  substituto local de um canal compartilhado: os eventos passam
+             serializados por um canal em memória, como no Redis, para testes
+    redis    pub/sub entre workers e instâncias (requer o pacote `redis`)
+
+Configuração (variáveis de ambiente):
+    TEMPO_REAL_BACKEND      local | memoria | redis
+    TEMPO_REAL_URL          URL do Redis (backend redis)
+    TEMPO_REAL_FILA_MAX     eventos pendentes por assinante antes de coalescer por espaço
+    TEMPO_REAL_MAX_ESPACOS  espaços por conexão
+    TEMPO_REAL_PING_S       intervalo dos pings em conexões ociosas
+"""
+import asyncio
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Callable, Iterable, List
+
+from app.services.serializacao import para_json, orjson
+
+TEMPO_REAL_BACKEND = os.getenv("TEMPO_REAL_BACKEND", "local")
+TEMPO_REAL_URL = os.getenv("TEMPO_REAL_URL", "redis://localhost:6379/0")
+TEMPO_REAL_FILA_MAX = int(os.getenv("TEMPO_REAL_FILA_MAX", "100"))
+TEMPO_REAL_MAX_ESPACOS = int(os.getenv("TEMPO_REAL_MAX_ESPACOS", "50"))
+TEMPO_REAL_PING_S = float(os.getenv("TEMPO_REAL_PING_S", "25"))
+
+def _chave(evento: dict) -> tuple:
+    # Eventos com a mesma chave se substituem na fila (vale o estado mais recente)
+    return (evento.get("space_id"), evento["tipo"], evento.get("id"))
+
+class Assinante:
+    """Fila de uma conexão: eventos pendentes com coalescência, consumidos no event loop"""
+
+    def __init__(self, espacos: Iterable[int], fila_max: int = TEMPO_REAL_FILA_MAX):
+        self.espacos = set(espacos)
+        self.fila_max = fila_max
+        self._pendentes = OrderedDict()
+        self._sinal = asyncio.Event()
+        self.coalescidos = 0
+        self.ressincronizacoes = 0
+
+    def entregar(self, evento: dict):
+        """Enfileira (só no event loop); nunca bloqueia"""
+        chave = _chave(evento)
+        # Com um ressincronizar pendente, o cliente vai reler o espaço depois deste evento
+        if chave[0] is not None and (chave[0], "ressincronizar", None) in self._pendentes:
+            self.coalescidos += 1
+            self._sinal.set()
+            return
+        if self._pendentes.pop(chave, None) is not None:
+            self.coalescidos += 1
+        self._pendentes[chave] = evento
+        if len(self._pendentes) > self.fila_max:
+            # O espaço do evento mais antigo; eventos de controle ficam na fila
+            espaco_id = next((c[0] for c in self._pendentes if c[0] is not None), None)
+            if espaco_id is not None:
+                self._coalescer(espaco_id)
+        self._sinal.set()
+
+    def _coalescer(self, espaco_id: int):
+        """Consumidor lento: os eventos pendentes do espaço viram um único ressincronizar"""
+        for chave in [c for c in self._pendentes if c[0] == espaco_id]:
+            del self._pendentes[chave]
+            self.coalescidos += 1
+        evento = {"tipo": "ressincronizar", "space_id": espaco_id}
+        self._pendentes[_chave(evento)] = evento
+        self.ressincronizacoes += 1
+
+    async def proximos(self) -> List[dict]:
+        """Espera e retorna todos os eventos pendentes, na ordem"""
+        await self._sinal.wait()
+        self._sinal.clear()
+        eventos = list(self._pendentes.values())
+        self._pendentes.clear()
+        return eventos
+
+class BrokerEventos:
+    """
+    Distribuição em processo: assinantes por espaço no event loop. `publicar`
+    pode ser chamado de qualquer thread; a entrega acontece no event loop.
+    """
+
+    def __init__(self, fila_max: int = TEMPO_REAL_FILA_MAX):
+        self.fila_max = fila_max
+        self._assinantes = defaultdict(set)  # space_id -> {Assinante}
+        self._loop = None
+        self.publicados = 0
+        self.entregues = 0
+
+    # ---- conexões (sempre no event loop) ----
+
+    def assinar(self, espaco_ids: Iterable[int]) -> Assinante:
+        self._loop = asyncio.get_running_loop()
+        assinante = Assinante((), self.fila_max)
+        self.alterar(assinante, assinar=espaco_ids)
+        return assinante
+
+    def alterar(self, assinante: Assinante, assinar: Iterable[int] = (), cancelar: Iterable[int] = ()):
+        for espaco_id in cancelar:
+            assinante.espacos.discard(espaco_id)
+            self._remover(espaco_id, assinante)
+        for espaco_id in assinar:
+            assinante.espacos.add(espaco_id)
+            self._assinantes[espaco_id].add(assinante)
+        assinante.entregar({"tipo": "assinado", "espaco_ids": sorted(assinante.espacos)})
+
+    def cancelar(self, assinante: Assinante):
+        for espaco_id in assinante.espacos:
+            self._remover(espaco_id, assinante)
+        assinante.espacos.clear()
+
+    def _remover(self, espaco_id: int, assinante: Assinante):
+        assinantes = self._assinantes.get(espaco_id)
+        if assinantes is not None:
+            assinantes.discard(assinante)
+            if not assinantes:
+                del self._assinantes[espaco_id]
+
+    # ---- publicação (qualquer thread) ----
+
+    def publicar(self, evento: dict):
+        self.publicados += 1
+        self._distribuir_local(evento)
+
+    def _distribuir_local(self, evento: dict):
+        # Sem assinantes do espaço neste processo, não agenda nada no loop
+        loop = self._loop
+        if loop is None or evento["space_id"] not in self._assinantes or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._entregar, evento)
+
+    def _entregar(self, evento: dict):
+        for assinante in list(self._assinantes.get(evento["space_id"], ())):
+            assinante.entregar(evento)
+            self.entregues += 1
+
+    def publicar_reserva(self, reserva):
+        """Delta de uma reserva já gravada (objeto do ORM ou linha com as mesmas colunas)"""
+        self.publicar({
+            "tipo": "reserva",
+            "space_id": reserva.space_id,
+            "id": reserva.id,
+            "start_time": reserva.start_time,
+            "end_time": reserva.end_time,
+            "status": reserva.status.value,
+        })
+
+    def publicar_espaco(self, espaco):
+        self.publicar({"tipo": "espaco", "space_id": espaco.id, "esta_disponivel": espaco.is_available})
+
+    def publicar_ressincronizacao(self, espaco_id: int):
+        self.publicar({"tipo": "ressincronizar", "space_id": espaco_id})
+
+    def estatisticas(self) -> dict:
+        assinantes = {a for conjunto in list(self._assinantes.values()) for a in conjunto}
+        return {
+            "backend": type(self).__name__,
+            "espacos_assinados": len(self._assinantes),
+            "assinantes": len(assinantes),
+            "publicados": self.publicados,
+            "entregues": self.entregues,
+            "coalescidos": sum(a.coalescidos for a in assinantes),
+            "ressincronizacoes": sum(a.ressincronizacoes for a in assinantes),
+        }
+
+class Canal:
+    """Transporte entre processos: entrega cada mensagem a todos os inscritos, inclusive a quem publicou"""
+
+    def publicar(self, mensagem: bytes):
+        raise NotImplementedError
+
+    def inscrever(self, receber: Callable[[bytes], None]):
+        raise NotImplementedError
+
+class CanalMemoria(Canal):
+    """Substituto local de um pub/sub compartilhado: vários brokers no mesmo canal simulam vários nós"""
+
+    def __init__(self):
+        self._inscritos = []
+        self._lock = threading.Lock()
+
+    def publicar(self, mensagem: bytes):
+        with self._lock:
+            inscritos = list(self._inscritos)
+        for receber in inscritos:
+            receber(mensagem)
+
+    def inscrever(self, receber):
+        with self._lock:
+            self._inscritos.append(receber)
+
+class CanalRedis(Canal):
+    """Pub/sub do Redis; as mensagens chegam em uma thread de escuta"""
+
+    def __init__(self, url: str, nome: str = "booking:eventos"):
+        import redis  # dependência opcional, só com TEMPO_REAL_BACKEND=redis
+        self._cliente = redis.Redis.from_url(url)
+        self.nome = nome
+
+    def publicar(self, mensagem: bytes):
+        self._cliente.publish(self.nome, mensagem)
+
+    def inscrever(self, receber):
+        pubsub = self._cliente.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.nome: lambda mensagem: receber(mensagem["data"])})
+        pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+def _ler_json(mensagem: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(mensagem)
+    import json
+    return json.loads(mensagem)
+
+class BrokerDistribuido(BrokerEventos):
+    """Publica no canal; o que chega do canal (de qualquer nó) é distribuído aos assinantes locais"""
+
+    def __init__(self, canal: Canal, fila_max: int = TEMPO_REAL_FILA_MAX):
+        super().__init__(fila_max)
+        self.canal = canal
+        canal.inscrever(self._receber)
+
+    def publicar(self, evento: dict):
+        self.publicados += 1
+        self.canal.publicar(para_json(evento))
+
+    def _receber(self, mensagem: bytes):
+        self._distribuir_local(_ler_json(mensagem))
+
+def criar_broker(nome: str = TEMPO_REAL_BACKEND) -> BrokerEventos:
+    if nome == "local":
+        return BrokerEventos(TEMPO_REAL_FILA_MAX)
+    if nome == "memoria":
+        return BrokerDistribuido(CanalMemoria(), TEMPO_REAL_FILA_MAX)
+    if nome == "redis":
+        return BrokerDistribuido(CanalRedis(TEMPO_REAL_URL), TEMPO_REAL_FILA_MAX)
+    raise ValueError(f"TEMPO_REAL_BACKEND inválido: {nome}")
+
+broker_eventos = criar_broker()
@@ -0,0 +1,80 @@
+"""
+Utilitários compartilhados pelos testes.
+
+`cliente` é um TestClient da aplicação sobre um banco SQLite temporário (nunca
+o de DATABASE_URL); `cabecalhos` autentica um usuário de teste.
+
+`maximo_consultas` falha quando um trecho executa mais consultas SQL do que o
+esperado, para que regressões de N+1 quebrem o CI:
+
+    def test_minhas_reservas_com_espaco(cliente, cabecalhos, maximo_consultas):
+        with maximo_consultas(2):  # reservas + espaços (usuário no cache de tokens)
+            cliente.get("/reservas/minhas?limit=500&include=space", headers=cabecalhos)
+
+Conta as consultas de todas as engines (inclusive a sync_engine do modo assíncrono).
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Antes de importar a aplicação: a engine é criada na importação
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/testes.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.setdefault("LIMITE_TAXA_ATIVO", "false")
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class ConsultasExecutadas(list):
+    """Consultas SQL registradas dentro do bloco, na ordem de execução"""
+
+    def relatorio(self) -> str:
+        return "\n".join(f"  {i}. {' '.join(sql.split())}" for i, sql in enumerate(self, 1))
+
+@contextmanager
+def contar_consultas():
+    consultas = ConsultasExecutadas()
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(Engine, "before_cursor_execute", registrar)
+
+@contextmanager
+def limite_consultas(maximo: int):
+    """Falha se o bloco executar mais de `maximo` consultas SQL"""
+    with contar_consultas() as consultas:
+        yield consultas
+    assert len(consultas) <= maximo, (
+        f"{len(consultas)} consultas SQL executadas (máximo {maximo}):\n{consultas.relatorio()}"
+    )
+
+@pytest.fixture
+def maximo_consultas():
+    return limite_consultas
+
+@pytest.fixture(scope="session")
+def cliente():
+    from fastapi.testclient import TestClient
+
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as cliente:
+        yield cliente
+
+@pytest.fixture(scope="session")
+def cabecalhos(cliente):
+    """Authorization de um usuário de teste, com o token já no cache"""
+    cliente.post("/auth/registrar", json={"email": "teste@exemplo.com", "nome_completo": "Teste", "senha": "senha123"})
+    resposta = cliente.post("/auth/login", json={"email": "teste@exemplo.com", "senha": "senha123"})
+    cabecalhos = {"Authorization": f"Bearer {resposta.json()['access_token']}"}
+    # Primeira requisição autenticada: consulta o usuário e guarda o token no cache
+    cliente.get("/auth/me", headers=cabecalhos).raise_for_status()
+    return cabecalhos
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.database import engine
+from app.models import Booking, BookingStatus
+
+RESERVAS = 500
+ESPACOS = 20
+
+@pytest.fixture(scope="module")
+def reservas(cliente, cabecalhos):
+    """500 reservas do usuário de teste, espalhadas por 20 espaços"""
+    espacos = [
+        cliente.post(
+            "/espacos/", json={"nome": f"Sala {i}", "capacidade": 4, "preco_por_hora": 10}, headers=cabecalhos
+        ).json()["id"]
+        for i in range(ESPACOS)
+    ]
+    usuario_id = cliente.get("/auth/me", headers=cabecalhos).json()["id"]
+    inicio = datetime.now().replace(microsecond=0) + timedelta(days=1)
+    with engine.begin() as conexao:
+        conexao.execute(insert(Booking), [
+            {
+                "user_id": usuario_id,
+                "space_id": espacos[i % ESPACOS],
+                "start_time": inicio + timedelta(hours=i),
+                "end_time": inicio + timedelta(hours=i, minutes=30),
+                "status": BookingStatus.CONFIRMADA,
+                "total_price": 5.0,
+            }
+            for i in range(RESERVAS)
+        ])
+    return usuario_id
+
+def test_minhas_reservas_com_espaco(cliente, cabecalhos, reservas, maximo_consultas):
+    with maximo_consultas(2):  # reservas + espaços
+        resposta = cliente.get("/reservas/minhas", params={"limit": RESERVAS, "include": "space"}, headers=cabecalhos)
+
+    assert resposta.status_code == 200
+    itens = resposta.json()["itens"]
+    assert len(itens) == RESERVAS
+    assert all(item["espaco"]["id"] == item["space_id"] for item in itens)
+    assert "usuario" not in itens[0]
+
+def test_minhas_reservas_com_usuario(cliente, cabecalhos, reservas, maximo_consultas):
+    with maximo_consultas(2):  # reservas + usuários
+        resposta = cliente.get("/reservas/minhas", params={"limit": RESERVAS, "include": "user"}, headers=cabecalhos)
+
+    assert resposta.status_code == 200
+    itens = resposta.json()["itens"]
+    assert len(itens) == RESERVAS
+    assert all(item["usuario"]["id"] == reservas for item in itens)
+    assert "espaco" not in itens[0]
+
+def test_minhas_reservas_include_invalido(cliente, cabecalhos):
+    resposta = cliente.get("/reservas/minhas", params={"include": "space,pagamento"}, headers=cabecalhos)
+
+    assert resposta.status_code == 400
+    assert "pagamento" in resposta.json()["detail"]
+
+def test_busca_de_janelas_cobra_o_preco_da_cotacao(cliente, cabecalhos):
+    espaco_id = cliente.post(
+        "/espacos/", json={"nome": "Auditório", "capacidade": 80, "preco_por_hora": 10}, headers=cabecalhos
+    ).json()["id"]
+    cliente.put(f"/espacos/{espaco_id}/precos", json={"regras": [
+        {"tipo": "faixa", "dias_semana": [5, 6], "inicio": "00:00", "fim": "24:00", "multiplicador": 3},
+        {"tipo": "duracao", "duracao_minima_minutos": 120, "multiplicador": 0.5},
+    ]}, headers=cabecalhos).raise_for_status()
+    hoje = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    sabado = hoje + timedelta(days=(5 - hoje.weekday()) % 7 + 7)
+
+    for duracao in (90, 150):
+        janelas = cliente.get("/disponibilidade/buscar", params={
+            "inicio": (sabado + timedelta(hours=10)).isoformat(),
+            "fim": (sabado + timedelta(hours=16)).isoformat(),
+            "duracao_minutos": duracao,
+            "capacidade_min": 80,
+        }).json()
+        assert [janela["space_id"] for janela in janelas] == [espaco_id]
+        janela = janelas[0]
+        cotacao = cliente.post("/reservas/cotacao", json={"itens": [
+            {"space_id": espaco_id, "start_time": janela["inicio"], "end_time": janela["fim"]}
+        ]}).json()["itens"][0]
+
+        assert janela["preco_total"] == cotacao["total_price"]
+        assert janela["preco_total"] != round(10 * duracao / 60, 2)
+
+def test_exportacao_exige_filtro_e_so_traz_as_proprias_reservas(cliente, cabecalhos, reservas):
+    cliente.post("/auth/registrar", json={"email": "outro@exemplo.com", "nome_completo": "Outro", "senha": "senha123"})
+    token = cliente.post("/auth/login", json={"email": "outro@exemplo.com", "senha": "senha123"}).json()["access_token"]
+    outro = {"Authorization": f"Bearer {token}"}
+    inicio = datetime.now().replace(microsecond=0)
+
+    assert cliente.get("/reservas/exportar", headers=cabecalhos).status_code == 400
+    assert cliente.get("/reservas/exportar", params={"inicio": inicio.isoformat()}, headers=cabecalhos).status_code == 400
+    longo = {"inicio": inicio.isoformat(), "fim": (inicio + timedelta(days=3650)).isoformat()}
+    assert cliente.get("/reservas/exportar", params=longo, headers=cabecalhos).status_code == 400
+
+    periodo = {"inicio": inicio.isoformat(), "fim": (inicio + timedelta(days=60)).isoformat()}
+    proprias = cliente.get("/reservas/exportar", params=periodo, headers=cabecalhos)
+    assert proprias.status_code == 200
+    assert len(proprias.text.splitlines()) == RESERVAS
+    assert cliente.get("/reservas/exportar", params=periodo, headers=outro).text == ""
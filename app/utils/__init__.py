@@ -5,11 +5,15 @@ from app.utils.validators import (
     validar_duracao_minima,
     validar_antecedencia_minima
 )
+from app.utils.paginacao import codificar_cursor, decodificar_cursor, montar_pagina
 
 __all__ = [
     "validar_email",
     "validar_horario_comercial", 
     "calcular_duracao_horas",
     "validar_duracao_minima",
-    "validar_antecedencia_minima"
+    "validar_antecedencia_minima",
+    "codificar_cursor",
+    "decodificar_cursor",
+    "montar_pagina"
 ]
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Paginação por cursor (keyset) com cursores opacos"""
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+
+def codificar_cursor(*valores) -> str:
+    """Codifica os valores da chave de ordenação do último item em um cursor opaco"""
+    serializados = [v.isoformat() if isinstance(v, datetime) else v for v in valores]
+    dados = json.dumps(serializados, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(dados).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str, *tipos) -> tuple:
+    """Decodifica um cursor gerado por `codificar_cursor` nos tipos informados"""
+    try:
+        dados = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        valores = json.loads(dados)
+        if len(valores) != len(tipos):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(v) if tipo is datetime else tipo(v)
+            for v, tipo in zip(valores, tipos)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+def montar_pagina(itens: list, limite: int, chave) -> dict:
+    """
+    Recebe até `limite + 1` itens (o extra só indica que há próxima página)
+    e monta a resposta com o cursor do último item entregue
+    """
+    tem_mais = len(itens) > limite
+    itens = itens[:limite]
+    next_cursor = codificar_cursor(*chave(itens[-1])) if tem_mais else None
+    return {"itens": itens, "next_cursor": next_cursor}
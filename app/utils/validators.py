@@ -6,6 +6,9 @@ def validar_email(email: str) -> bool:
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
+HORARIO_ABERTURA = time(8, 0)     # 8:00 AM
+HORARIO_FECHAMENTO = time(18, 0)  # 6:00 PM
+
 def validar_horario_comercial(inicio: datetime, fim: datetime) -> bool:
     """
     Valida se o horário está dentro do período comercial
@@ -14,11 +17,8 @@ def validar_horario_comercial(inicio: datetime, fim: datetime) -> bool:
     hora_inicio = inicio.time()
     hora_fim = fim.time()
     
-    horario_abertura = time(8, 0)   # 8:00 AM
-    horario_fechamento = time(18, 0) # 6:00 PM
-    
-    return (hora_inicio >= horario_abertura and 
-            hora_fim <= horario_fechamento and
+    return (hora_inicio >= HORARIO_ABERTURA and 
+            hora_fim <= HORARIO_FECHAMENTO and
             hora_inicio < hora_fim)
 
 def calcular_duracao_horas(inicio: datetime, fim: datetime) -> float:
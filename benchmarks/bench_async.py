@@ -0,0 +1,110 @@
+"""
+Compara os modos síncrono (threadpool) e assíncrono (DB_ASYNC=true).
+
+Uso:
+    python -m benchmarks.bench_async                   # 2000 requisições, 200 simultâneas
+    python -m benchmarks.bench_async 5000 500
+
+Cada modo roda em um subprocesso (o modo é lido na importação de app.main),
+contra o mesmo banco SQLite temporário, com httpx.AsyncClient sobre o ASGI
+em processo. Reporta vazão, p50/p99 e o pico de threads do processo.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+def preparar_banco(url):
+    from sqlalchemy import create_engine, insert
+    from app.database import Base
+    from app.models import Space
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Space), [
+            {"name": f"Sala {i}", "capacity": 10, "price_per_hour": 50.0, "is_available": True}
+            for i in range(1, 51)
+        ])
+    engine.dispose()
+
+async def executar_modo(total, simultaneas):
+    import httpx
+    from app.main import app
+
+    pico_threads = threading.active_count()
+    latencias = []
+    erros = 0
+    semaforo = asyncio.Semaphore(simultaneas)
+    inicio_intervalo = (datetime.now() + timedelta(days=1)).replace(microsecond=0)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as cliente:
+        async def requisicao(i):
+            nonlocal pico_threads
+            nonlocal erros
+            async with semaforo:
+                t = time.perf_counter()
+                try:
+                    if i % 2:
+                        resposta = await cliente.get(f"/espacos/{i % 50 + 1}")
+                    else:
+                        resposta = await cliente.post("/reservas/verificar-disponibilidade", json={
+                            "space_id": i % 50 + 1,
+                            "start_time": inicio_intervalo.isoformat(),
+                            "end_time": (inicio_intervalo + timedelta(hours=1)).isoformat(),
+                        })
+                    resposta.raise_for_status()
+                except Exception:
+                    # Ex.: esgotamento do pool de conexões sob alta concorrência
+                    erros += 1
+                latencias.append((time.perf_counter() - t) * 1000)
+                pico_threads = max(pico_threads, threading.active_count())
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(requisicao(i) for i in range(total)))
+        duracao = time.perf_counter() - t0
+
+    from app.database import fechar_engine_async
+    await fechar_engine_async()
+
+    latencias.sort()
+    return {
+        "modo": "async" if os.getenv("DB_ASYNC") == "true" else "sync",
+        "requisicoes": total,
+        "simultaneas": simultaneas,
+        "erros": erros,
+        "req_por_s": round(total / duracao, 1),
+        "p50_ms": round(latencias[len(latencias) // 2], 2),
+        "p99_ms": round(latencias[int(len(latencias) * 0.99)], 2),
+        "pico_threads": pico_threads,
+    }
+
+def main(argv):
+    if argv and argv[0] == "--modo":
+        total, simultaneas = int(argv[1]), int(argv[2])
+        print(json.dumps(asyncio.run(executar_modo(total, simultaneas))))
+        return
+
+    total = int(argv[0]) if argv else 2000
+    simultaneas = int(argv[1]) if len(argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as diretorio:
+        url = f"sqlite:///{os.path.join(diretorio, 'bench.db')}"
+        preparar_banco(url)
+        resultados = []
+        for modo in ("false", "true"):
+            # Mede a capacidade da API: sem o limite de taxa, que recusaria a carga de um só cliente
+            env = {**os.environ, "DATABASE_URL": url, "DB_ASYNC": modo, "LIMITE_TAXA_ATIVO": "false"}
+            saida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_async", "--modo", str(total), str(simultaneas)],
+                env=env, capture_output=True, text=True, check=True
+            )
+            resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    print(json.dumps({"benchmark": "sync_vs_async", "resultados": resultados}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
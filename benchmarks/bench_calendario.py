@@ -0,0 +1,78 @@
+"""
+Benchmark da visão mensal de ocupação para muitos espaços.
+
+Uso:
+    python -m benchmarks.bench_calendario            # 100k reservas
+    python -m benchmarks.bench_calendario 1000000
+
+Popula um banco SQLite temporário (mesma carga de bench_disponibilidade),
+reconstrói o mapa de ocupação e compara, para um mês com reservas de
+todos os espaços (60 a 90 dias à frente):
+  - uma chamada a `obter_reservas_por_espaco` por espaço
+  - uma única leitura do mapa (`obter_calendarios`)
+O resultado (mediana de várias rodadas) é impresso em JSON.
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as hora, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.crud.booking import obter_reservas_por_espaco
+from app.crud.space_occupancy import reconstruir_ocupacao, obter_calendarios
+from benchmarks.bench_disponibilidade import popular, NUM_ESPACOS
+
+RODADAS = 10
+
+def medir(total_reservas):
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        popular(engine, total_reservas)
+        Sessao = sessionmaker(bind=engine)
+
+        with Sessao() as db:
+            t0 = time.perf_counter()
+            reconstrucao = reconstruir_ocupacao(db)
+            tempo_reconstrucao = time.perf_counter() - t0
+
+        # A carga de bench_disponibilidade concentra as reservas futuras no fim dos 90 dias
+        inicio = date.today() + timedelta(days=60)
+        fim = inicio + timedelta(days=30)
+        espacos = list(range(1, NUM_ESPACOS + 1))
+        por_espaco, mapa = [], []
+        with Sessao() as db:
+            for _ in range(RODADAS):
+                t = time.perf_counter()
+                for espaco_id in espacos:
+                    obter_reservas_por_espaco(
+                        db, espaco_id, datetime.combine(inicio, hora()), datetime.combine(fim, hora.max)
+                    )
+                por_espaco.append((time.perf_counter() - t) * 1000)
+                t = time.perf_counter()
+                obter_calendarios(db, espacos, inicio, fim)
+                mapa.append((time.perf_counter() - t) * 1000)
+        engine.dispose()
+
+    return {
+        "reservas": total_reservas,
+        "espacos": NUM_ESPACOS,
+        "dias_no_mapa": reconstrucao["dias"],
+        "reconstrucao_s": round(tempo_reconstrucao, 2),
+        "consulta_por_espaco_ms": round(statistics.median(por_espaco), 1),
+        "mapa_ms": round(statistics.median(mapa), 1),
+    }
+
+def main(argv):
+    tamanhos = [int(a) for a in argv] or [100_000]
+    resultados = [medir(n) for n in tamanhos]
+    print(json.dumps({"benchmark": "calendario_mensal", "resultados": resultados}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
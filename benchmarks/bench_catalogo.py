@@ -0,0 +1,85 @@
+"""
+Benchmark do cache de respostas do catálogo de espaços.
+
+Uso:
+    python -m benchmarks.bench_catalogo            # 2000 espaços, páginas de 100
+    python -m benchmarks.bench_catalogo 10000 500
+
+Com httpx.AsyncClient sobre o ASGI em processo e um banco SQLite temporário,
+mede GET /espacos/ e GET /espacos/{id} em três situações:
+  - sem cache (o cache é invalidado antes de cada requisição)
+  - com cache
+  - revalidação com If-None-Match (304)
+Imprime a mediana das latências e as consultas SQL por requisição, em JSON.
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REQUISICOES = 200
+
+async def medir(total_espacos, limite):
+    import httpx
+    from sqlalchemy import event, insert
+    from app.database import Base, engine
+    from app.main import app
+    from app.models import Space
+    from app.services.cache import cache_catalogo
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Space), [
+            {"name": f"Sala {i}", "capacity": i % 40 + 1, "price_per_hour": 50.0, "is_available": True}
+            for i in range(1, total_espacos + 1)
+        ])
+
+    consultas = 0
+
+    def contar(*_):
+        nonlocal consultas
+        consultas += 1
+
+    event.listen(engine, "before_cursor_execute", contar)
+    rotas = {"lista": f"/espacos/?limit={limite}", "detalhe": "/espacos/1"}
+    resultados = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as cliente:
+        for nome, url in rotas.items():
+            etag = (await cliente.get(url)).headers["etag"]
+            for cenario in ("sem_cache", "com_cache", "304"):
+                cabecalhos = {"If-None-Match": etag} if cenario == "304" else {}
+                latencias = []
+                consultas = 0
+                for _ in range(REQUISICOES):
+                    if cenario == "sem_cache":
+                        cache_catalogo.invalidar()
+                    t = time.perf_counter()
+                    await cliente.get(url, headers=cabecalhos)
+                    latencias.append((time.perf_counter() - t) * 1000)
+                resultados[f"{nome}_{cenario}"] = {
+                    "p50_ms": round(statistics.median(latencias), 3),
+                    "consultas_por_requisicao": round(consultas / REQUISICOES, 2),
+                }
+    event.remove(engine, "before_cursor_execute", contar)
+    return resultados
+
+def main(argv):
+    total_espacos = int(argv[0]) if argv else 2000
+    limite = int(argv[1]) if len(argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(diretorio, 'bench.db')}"
+        # Todas as requisições saem do mesmo cliente: sem limite de taxa
+        os.environ.setdefault("LIMITE_TAXA_ATIVO", "false")
+        resultados = asyncio.run(medir(total_espacos, limite))
+    print(json.dumps({
+        "benchmark": "cache_catalogo",
+        "espacos": total_espacos,
+        "limite": limite,
+        "resultados": resultados,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
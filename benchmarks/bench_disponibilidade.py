@@ -0,0 +1,109 @@
+"""
+Benchmark da verificação de disponibilidade conforme a tabela de reservas cresce.
+
+Uso:
+    python -m benchmarks.bench_disponibilidade                 # 10k, 100k, 1M
+    python -m benchmarks.bench_disponibilidade 10000 5000000   # tamanhos livres
+
+Para cada tamanho cria um banco SQLite temporário, popula com reservas
+distribuídas em vários espaços (a maior parte no passado, como em produção)
+e mede p50/p99 de `verificar_disponibilidade` para intervalos futuros.
+O resultado é impresso em JSON.
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User, Space, Booking, BookingStatus
+from app.crud.booking import verificar_disponibilidade
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+NUM_ESPACOS = 200
+NUM_CONSULTAS = 2_000
+LOTE_INSERCAO = 50_000
+
+def popular(engine, total_reservas, semente=42):
+    """Insere usuários, espaços e reservas em lotes (executemany)"""
+    rng = random.Random(semente)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "email": "bench@exemplo.com", "hashed_password": "x", "full_name": "Bench"
+        }])
+        conn.execute(insert(Space), [
+            {"name": f"Sala {i}", "capacity": 10, "price_per_hour": 50.0, "is_available": True}
+            for i in range(1, NUM_ESPACOS + 1)
+        ])
+
+    agora = datetime.now()
+    # Reservas de 1h, sem sobreposição, espalhadas nos últimos anos e próximos 90 dias
+    por_espaco = total_reservas // NUM_ESPACOS
+    status = [BookingStatus.CONCLUIDA, BookingStatus.CANCELADA, BookingStatus.CONFIRMADA]
+    lote = []
+    with engine.begin() as conn:
+        for espaco_id in range(1, NUM_ESPACOS + 1):
+            inicio = agora - timedelta(hours=por_espaco) + timedelta(days=90)
+            for _ in range(por_espaco):
+                fim = inicio + timedelta(hours=1)
+                lote.append({
+                    "user_id": 1,
+                    "space_id": espaco_id,
+                    "start_time": inicio,
+                    "end_time": fim,
+                    "status": BookingStatus.CONFIRMADA if inicio > agora else rng.choice(status),
+                    "total_price": 50.0,
+                })
+                inicio = fim + timedelta(hours=rng.choice([0, 1, 2]))
+                if len(lote) >= LOTE_INSERCAO:
+                    conn.execute(insert(Booking), lote)
+                    lote = []
+        if lote:
+            conn.execute(insert(Booking), lote)
+
+def percentil(amostras, p):
+    ordenadas = sorted(amostras)
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+def medir(total_reservas):
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+
+        t0 = time.perf_counter()
+        popular(engine, total_reservas)
+        tempo_carga = time.perf_counter() - t0
+
+        rng = random.Random(7)
+        agora = datetime.now()
+        latencias = []
+        Sessao = sessionmaker(bind=engine)
+        with Sessao() as db:
+            for _ in range(NUM_CONSULTAS):
+                inicio = agora + timedelta(minutes=rng.randint(0, 90 * 24 * 60))
+                fim = inicio + timedelta(minutes=rng.choice([30, 60, 120]))
+                t = time.perf_counter()
+                verificar_disponibilidade(db, rng.randint(1, NUM_ESPACOS), inicio, fim)
+                latencias.append((time.perf_counter() - t) * 1000)
+        engine.dispose()
+
+    return {
+        "reservas": total_reservas,
+        "carga_s": round(tempo_carga, 2),
+        "p50_ms": round(percentil(latencias, 0.50), 3),
+        "p99_ms": round(percentil(latencias, 0.99), 3),
+    }
+
+def main(argv):
+    tamanhos = [int(a) for a in argv] or TAMANHOS_PADRAO
+    resultados = [medir(n) for n in tamanhos]
+    print(json.dumps({"benchmark": "verificar_disponibilidade", "resultados": resultados}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,85 @@
+"""
+Benchmark da exportação em streaming contra a listagem carregando tudo em memória.
+
+Uso:
+    python -m benchmarks.bench_exportacao                # 10k, 100k, 500k
+    python -m benchmarks.bench_exportacao 1000000        # tamanhos livres
+
+Para cada tamanho popula um banco SQLite temporário (mesma carga de
+bench_disponibilidade) e mede, com tracemalloc, o pico de memória de:
+  - carregar todas as reservas como objetos do ORM e serializar de uma vez
+  - consumir o gerador de `exportar_reservas` (NDJSON)
+além do tempo até o primeiro bloco e do tempo total do streaming.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Booking
+from app.schemas.booking import ReservaResposta
+from app.services.exportacao import consulta_exportacao, exportar_reservas
+from benchmarks.bench_disponibilidade import popular
+
+TAMANHOS_PADRAO = [10_000, 100_000, 500_000]
+
+def medir_pico(funcao):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - t0
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, duracao, pico / 1024 / 1024
+
+def medir(total_reservas):
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        popular(engine, total_reservas)
+        Sessao = sessionmaker(bind=engine)
+
+        def carregar_tudo():
+            with Sessao() as db:
+                reservas = db.scalars(select(Booking).order_by(Booking.start_time)).all()
+                corpo = json.dumps([
+                    ReservaResposta.model_validate(r, from_attributes=True).model_dump(mode="json")
+                    for r in reservas
+                ])
+                return len(corpo)
+
+        primeiro = {}
+        def transmitir():
+            t0 = time.perf_counter()
+            total = 0
+            for bloco in exportar_reservas(engine, consulta_exportacao(), "ndjson"):
+                primeiro.setdefault("ms", (time.perf_counter() - t0) * 1000)
+                total += len(bloco)
+            return total
+
+        _, tempo_lista, pico_lista = medir_pico(carregar_tudo)
+        _, tempo_stream, pico_stream = medir_pico(transmitir)
+        engine.dispose()
+
+    return {
+        "reservas": total_reservas,
+        "lista_s": round(tempo_lista, 2),
+        "lista_pico_mb": round(pico_lista, 1),
+        "stream_s": round(tempo_stream, 2),
+        "stream_pico_mb": round(pico_stream, 1),
+        "stream_primeiro_bloco_ms": round(primeiro.get("ms", 0), 1),
+    }
+
+def main(argv):
+    tamanhos = [int(a) for a in argv] or TAMANHOS_PADRAO
+    resultados = [medir(n) for n in tamanhos]
+    print(json.dumps({"benchmark": "exportacao_reservas", "resultados": resultados}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,160 @@
+"""
+Tempo de inicialização: importação do app (-X importtime) e primeira requisição atendida.
+
+Uso:
+    python -m benchmarks.bench_inicializacao
+    python -m benchmarks.bench_inicializacao --async --repeticoes 10
+    python -m benchmarks.bench_inicializacao --saida base.json
+    python -m benchmarks.bench_inicializacao --comparar base.json
+
+Cada medição roda em um processo novo, como um worker recém-criado:
+
+    importacao         `python -X importtime -c "import app.main"`: tempo total e os
+                       pacotes que mais pesam (tempo próprio somado por pacote raiz)
+    primeira_resposta  do início de `uvicorn app.main:app` até o primeiro 200 em /health
+
+Também lista os módulos pesados que deveriam ficar para o primeiro uso
+(jose, passlib, bcrypt) e aparecem na importação. Relatório em JSON.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+
+from benchmarks.carga import commit_atual
+
+# Só devem ser importados no primeiro login/token, não ao subir o worker
+ADIADOS = ("jose", "passlib", "bcrypt", "cryptography")
+
+def ambiente(banco: str, modo_async: bool) -> dict:
+    return {
+        **os.environ,
+        "DATABASE_URL": banco,
+        "DB_ASYNC": "true" if modo_async else "false",
+        "PYTHONPATH": os.getcwd(),
+    }
+
+def medir_importacao(env: dict) -> dict:
+    """Uma importação de app.main com -X importtime, em um processo novo"""
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, capture_output=True, text=True, check=True
+    )
+    modulos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = (parte.strip() for parte in linha[len("import time:"):].split("|"))
+        modulos[nome] = (int(proprio), int(acumulado))
+    por_pacote = defaultdict(int)
+    for nome, (proprio, _) in modulos.items():
+        por_pacote[nome.split(".")[0]] += proprio
+    return {
+        "total_ms": modulos["app.main"][1] / 1000,
+        "modulos": len(modulos),
+        "por_pacote_ms": {pacote: proprio / 1000 for pacote, proprio in por_pacote.items()},
+        "adiados_importados": sorted({nome.split(".")[0] for nome in modulos} & set(ADIADOS)),
+    }
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def medir_primeira_resposta(env: dict, limite_s: float = 30.0) -> float:
+    """Segundos do início do processo do uvicorn até o primeiro 200 em /health"""
+    porta = porta_livre()
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(porta), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - inicio < limite_s:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{porta}/health", timeout=1) as resposta:
+                    if resposta.status == 200:
+                        return time.perf_counter() - inicio
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError(f"servidor não respondeu em {limite_s} s")
+    finally:
+        processo.terminate()
+        processo.wait()
+
+def executar(args, banco: str) -> dict:
+    env = ambiente(banco, args.modo_async)
+    # A primeira rodada aquece o cache de bytecode e o do sistema de arquivos
+    medir_importacao(env)
+    importacoes = [medir_importacao(env) for _ in range(args.repeticoes)]
+    respostas = [medir_primeira_resposta(env) for _ in range(args.repeticoes)]
+
+    pacotes = defaultdict(list)
+    for importacao in importacoes:
+        for pacote, ms in importacao["por_pacote_ms"].items():
+            pacotes[pacote].append(ms)
+    mais_pesados = sorted(
+        ((pacote, statistics.median(valores)) for pacote, valores in pacotes.items()),
+        key=lambda item: item[1], reverse=True
+    )[:args.top]
+
+    return {
+        "commit": commit_atual(),
+        "modo": "async" if args.modo_async else "sync",
+        "repeticoes": args.repeticoes,
+        "importacao": {
+            "mediana_ms": round(statistics.median(i["total_ms"] for i in importacoes), 1),
+            "min_ms": round(min(i["total_ms"] for i in importacoes), 1),
+            "modulos": importacoes[0]["modulos"],
+            "pacotes_ms": {pacote: round(ms, 1) for pacote, ms in mais_pesados},
+            "adiados_importados": importacoes[0]["adiados_importados"],
+        },
+        "primeira_resposta": {
+            "mediana_ms": round(statistics.median(respostas) * 1000, 1),
+            "min_ms": round(min(respostas) * 1000, 1),
+        },
+    }
+
+def comparar(relatorio: dict, base: dict) -> dict:
+    """Variação percentual das medianas em relação a um relatório anterior"""
+    comparacao = {"base": {chave: base.get(chave) for chave in ("commit", "modo")}}
+    for secao in ("importacao", "primeira_resposta"):
+        anterior = base.get(secao, {}).get("mediana_ms")
+        if anterior:
+            atual = relatorio[secao]["mediana_ms"]
+            comparacao[secao] = f"{(atual - anterior) / anterior * 100:+.1f}%"
+    return comparacao
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_inicializacao", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--async", dest="modo_async", action="store_true", help="endpoints assíncronos (DB_ASYNC)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="pacotes mais pesados no relatório")
+    parser.add_argument("--saida", help="arquivo para gravar o relatório JSON")
+    parser.add_argument("--comparar", help="relatório JSON anterior para comparar")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Banco vazio e sem tabelas: a inicialização não deve tocar no esquema
+        relatorio = executar(args, f"sqlite:///{os.path.join(diretorio, 'inicializacao.db')}")
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            relatorio["comparacao"] = comparar(relatorio, json.load(arquivo))
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            arquivo.write(texto + "\n")
+    print(texto)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
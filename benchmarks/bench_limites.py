@@ -0,0 +1,164 @@
+"""
+Microbenchmark do limite de taxa (app/services/limites.py).
+
+Uso:
+    python -m benchmarks.bench_limites                 # 200000 operações, 10000 chaves
+    python -m benchmarks.bench_limites --operacoes 1000000 --chaves 100000 --threads 8
+
+Mede, em ns por operação:
+  - nucleo: ArmazemLocal.tomar (o balde de uma chave), com chaves repetidas e
+    com chaves sempre novas acima de max_chaves (caminho de despejo)
+  - threads: a mesma operação em N threads, com e sem disputa pela mesma chave
+  - middleware: uma requisição ASGI mínima com e sem o MiddlewareLimiteTaxa,
+    anônima (chave por IP) e com token no cache (chave por usuário), e o custo
+    relativo sobre uma rota FastAPI mínima (sem banco)
+Resultado em JSON.
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+from app.auth.cache import UsuarioSessao, cache_tokens
+from app.services.limites import PADROES, ArmazemLocal, LimiteTaxa, MiddlewareLimiteTaxa, Regra
+
+# Limite alto: mede o caminho que deixa passar, o de quase todas as requisições
+REGRA = Regra.criar(10**9, 1)
+RODADAS = 5
+
+def ns_por_op(inicio: float, operacoes: int) -> float:
+    return round((time.perf_counter() - inicio) * 1e9 / operacoes, 1)
+
+def medir_nucleo(operacoes: int, chaves: int) -> dict:
+    armazem = ArmazemLocal(max_chaves=chaves * 2)
+    nomes = [f"escrita:ip:10.0.{i // 256}.{i % 256}" for i in range(chaves)]
+    agora = time.monotonic()
+    inicio = time.perf_counter()
+    for i in range(operacoes):
+        armazem.tomar(nomes[i % chaves], REGRA, agora)
+    repetidas = ns_por_op(inicio, operacoes)
+
+    pequeno = ArmazemLocal(max_chaves=chaves // 10 or 16)
+    novas = [f"escrita:ip:{i}" for i in range(operacoes)]
+    inicio = time.perf_counter()
+    for nome in novas:
+        pequeno.tomar(nome, REGRA, agora)
+    despejo = ns_por_op(inicio, operacoes)
+    return {
+        "chaves_repetidas_ns": repetidas,
+        "chaves_novas_com_despejo_ns": despejo,
+        "estatisticas_despejo": pequeno.estatisticas(),
+    }
+
+def medir_threads(operacoes: int, chaves: int, threads: int) -> dict:
+    resultados = {}
+    for cenario in ("chaves_distintas", "mesma_chave"):
+        armazem = ArmazemLocal(max_chaves=chaves * threads * 2)
+        por_thread = operacoes // threads
+
+        def trabalhar(indice: int):
+            nomes = (
+                [f"leitura:u:{indice * chaves + i}" for i in range(chaves)]
+                if cenario == "chaves_distintas" else ["leitura:u:1"]
+            )
+            agora = time.monotonic()
+            for i in range(por_thread):
+                armazem.tomar(nomes[i % len(nomes)], REGRA, agora)
+
+        trabalhadores = [threading.Thread(target=trabalhar, args=(i,)) for i in range(threads)]
+        inicio = time.perf_counter()
+        for trabalhador in trabalhadores:
+            trabalhador.start()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+        resultados[cenario + "_ns"] = ns_por_op(inicio, por_thread * threads)
+    return {"threads": threads, **resultados}
+
+async def _app_vazio(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def _enviar(mensagem):
+    pass
+
+async def _receber():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+def _app_fastapi():
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.post("/reservas/")
+    async def criar():
+        return {}
+
+    return app
+
+async def _medir_app(app, scope: dict, operacoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(operacoes):
+        await app(scope, _receber, _enviar)
+    return ns_por_op(inicio, operacoes)
+
+def medir_middleware(operacoes: int) -> dict:
+    limite = LimiteTaxa(ArmazemLocal(), {grupo: REGRA for grupo in PADROES})
+    middleware = MiddlewareLimiteTaxa(_app_vazio, limite)
+    fastapi = _app_fastapi()
+    fastapi_limitado = MiddlewareLimiteTaxa(fastapi, limite)
+    token = "token-do-benchmark"
+    cache_tokens.guardar(token, {}, UsuarioSessao(1, "a@b.com", True))
+
+    base = {
+        "type": "http", "method": "POST", "path": "/reservas/", "client": ("10.0.0.1", 50000),
+        "query_string": b"", "root_path": "", "scheme": "http", "server": ("api", 80),
+        "http_version": "1.1", "asgi": {"version": "3.0"},
+    }
+    anonima = {**base, "headers": [(b"host", b"api"), (b"content-type", b"application/json")]}
+    autenticada = {**base, "headers": [(b"host", b"api"), (b"authorization", f"Bearer {token}".encode())]}
+
+    async def medir():
+        sem = await _medir_app(_app_vazio, anonima, operacoes)
+        por_ip = await _medir_app(middleware, anonima, operacoes)
+        por_usuario = await _medir_app(middleware, autenticada, operacoes)
+        # Referência: uma rota FastAPI mínima, sem banco, com e sem o middleware;
+        # rodadas alternadas, vale a melhor de cada (o ruído é maior que a diferença)
+        requisicoes = max(operacoes // (10 * RODADAS), 1)
+        rota = rota_limitada = float("inf")
+        for _ in range(RODADAS):
+            rota = min(rota, await _medir_app(fastapi, {**anonima}, requisicoes))
+            rota_limitada = min(rota_limitada, await _medir_app(fastapi_limitado, {**anonima}, requisicoes))
+        return {
+            "sem_middleware_ns": sem,
+            "por_ip_ns": por_ip,
+            "por_usuario_ns": por_usuario,
+            "custo_por_ip_ns": round(por_ip - sem, 1),
+            "custo_por_usuario_ns": round(por_usuario - sem, 1),
+            "rota_fastapi_ns": rota,
+            "rota_fastapi_com_limite_ns": rota_limitada,
+            "custo_relativo_rota": round((rota_limitada - rota) / rota, 4),
+        }
+
+    resultado = asyncio.run(medir())
+    permitidas = limite.estatisticas()["grupos"]["escrita"]["permitidas"]
+    assert permitidas == operacoes * 2 + max(operacoes // (10 * RODADAS), 1) * RODADAS
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_limites", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    parser.add_argument("--chaves", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    print(json.dumps({
+        "benchmark": "limites",
+        "operacoes": args.operacoes,
+        "chaves": args.chaves,
+        "nucleo": medir_nucleo(args.operacoes, args.chaves),
+        "threads": medir_threads(args.operacoes, args.chaves, args.threads),
+        "middleware": medir_middleware(args.operacoes),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
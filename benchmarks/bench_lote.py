@@ -0,0 +1,76 @@
+"""
+Benchmark da criação de reservas em lote contra chamadas individuais.
+
+Uso:
+    python -m benchmarks.bench_lote            # lote de 1000
+    python -m benchmarks.bench_lote 5000
+
+Em um banco SQLite temporário com reservas já existentes (mesma carga de
+bench_disponibilidade), cria N reservas futuras de 1h espalhadas pelos
+espaços: uma vez com N chamadas a `criar_reserva` e outra com uma única
+chamada a `criar_reservas_lote`. O resultado é impresso em JSON.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.schemas.booking import ReservaCriar
+from app.crud.booking import criar_reserva, criar_reservas_lote
+from benchmarks.bench_disponibilidade import popular, NUM_ESPACOS
+
+RESERVAS_EXISTENTES = 100_000
+
+def candidatas(total, deslocamento_dias):
+    # Depois do horizonte populado (90 dias), para não haver conflitos
+    base = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=deslocamento_dias)
+    return [
+        ReservaCriar(
+            space_id=i % NUM_ESPACOS + 1,
+            start_time=base + timedelta(hours=2 * (i // NUM_ESPACOS)),
+            end_time=base + timedelta(hours=2 * (i // NUM_ESPACOS) + 1),
+        )
+        for i in range(total)
+    ]
+
+def medir(total):
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        popular(engine, RESERVAS_EXISTENTES)
+        Sessao = sessionmaker(bind=engine)
+
+        individuais = candidatas(total, 120)
+        with Sessao() as db:
+            t0 = time.perf_counter()
+            for reserva in individuais:
+                criar_reserva(db, reserva, 1)
+            tempo_individual = time.perf_counter() - t0
+
+        lote = candidatas(total, 240)
+        with Sessao() as db:
+            t0 = time.perf_counter()
+            resultado = criar_reservas_lote(db, lote, 1)
+            tempo_lote = time.perf_counter() - t0
+        engine.dispose()
+
+    return {
+        "reservas": total,
+        "individual_s": round(tempo_individual, 3),
+        "lote_s": round(tempo_lote, 3),
+        "lote_criadas": resultado["criadas"],
+        "aceleracao": round(tempo_individual / tempo_lote, 1),
+    }
+
+def main(argv):
+    total = int(argv[0]) if argv else 1000
+    print(json.dumps({"benchmark": "criar_reservas_lote", "resultados": [medir(total)]}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
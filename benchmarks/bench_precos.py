@@ -0,0 +1,141 @@
+"""
+Benchmark da cotação de preços com regras de faixa e desconto.
+
+Uso:
+    python -m benchmarks.bench_precos                 # 500 intervalos
+    python -m benchmarks.bench_precos 100 1000 5000
+
+Para cada tamanho, cota intervalos aleatórios (30 min a 3 dias) em 50 espaços
+com faixas de pico, fim de semana e desconto por duração, de quatro formas:
+  - slot_a_slot: percorre os slots de 15 minutos de cada intervalo
+  - somas_prefixadas: `TabelaPrecos.preco`, tempo constante por intervalo
+  - por_item_banco: espaço e regras lidos a cada item, como N chamadas isoladas
+  - cotacao_banco: `cotar`, duas consultas para o lote inteiro
+Os preços das formas são conferidos entre si. Mediana de várias rodadas, em JSON.
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Space, SpacePriceRule
+from app.crud.space_pricing import cotar, tabela_precos
+from app.schemas.booking import ReservaBase
+from app.services.ocupacao import SLOT_MINUTOS
+from app.services.precos import SEGUNDA_REFERENCIA, SLOTS_POR_SEMANA, compilar
+
+RODADAS = 7
+NUM_ESPACOS = 50
+
+def regras(espaco_id):
+    # Pico nas noites de dia útil, fim de semana inteiro mais caro, 10% a partir de 8 h
+    faixa = {"space_id": espaco_id, "kind": "faixa", "min_duration_minutes": None}
+    return [
+        {**faixa, "weekdays": 0b0011111, "start_minute": 18 * 60, "end_minute": 22 * 60, "multiplier": 1.5},
+        {**faixa, "weekdays": 0b1100000, "start_minute": 0, "end_minute": 24 * 60, "multiplier": 1.2},
+        {
+            "space_id": espaco_id, "kind": "duracao", "weekdays": None, "start_minute": None, "end_minute": None,
+            "min_duration_minutes": 8 * 60, "multiplier": 0.9
+        },
+    ]
+
+def preparar(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Space), [
+            {"name": f"Sala {i}", "capacity": 10, "price_per_hour": 40.0 + i, "is_available": True}
+            for i in range(1, NUM_ESPACOS + 1)
+        ])
+        conn.execute(insert(SpacePriceRule), [r for i in range(1, NUM_ESPACOS + 1) for r in regras(i)])
+
+def intervalos(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    base = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    itens = []
+    for _ in range(quantidade):
+        inicio = base + timedelta(minutes=SLOT_MINUTOS * aleatorio.randrange(4 * 24 * 60))
+        fim = inicio + timedelta(minutes=SLOT_MINUTOS * aleatorio.randint(2, 3 * 24 * 4))
+        itens.append(ReservaBase(space_id=aleatorio.randint(1, NUM_ESPACOS), start_time=inicio, end_time=fim))
+    return itens
+
+def preco_slot_a_slot(tabela, inicio, fim):
+    """Referência ingênua: soma os custos slot a slot (intervalos alinhados aos slots)"""
+    slot = int((inicio - SEGUNDA_REFERENCIA) / timedelta(minutes=SLOT_MINUTOS))
+    ultimo = int((fim - SEGUNDA_REFERENCIA) / timedelta(minutes=SLOT_MINUTOS))
+    custo = sum(tabela.custos[s % SLOTS_POR_SEMANA] for s in range(slot, ultimo))
+    duracao_minutos = (fim - inicio) / timedelta(minutes=1)
+    for desconto in tabela.descontos:
+        if duracao_minutos >= desconto.duracao_minima_minutos:
+            custo *= desconto.multiplicador
+            break
+    return round(custo, 2)
+
+def cronometrar(funcao):
+    tempos = []
+    for _ in range(RODADAS):
+        t = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - t) * 1000)
+    return resultado, round(statistics.median(tempos), 3)
+
+def medir(Sessao, quantidade):
+    itens = intervalos(quantidade)
+    with Sessao() as db:
+        espacos = {e.id: e for e in db.query(Space)}
+        tabelas = {i: tabela_precos(db, e) for i, e in espacos.items()}
+
+        ingenuo, t_ingenuo = cronometrar(lambda: [
+            preco_slot_a_slot(tabelas[i.space_id], i.start_time, i.end_time) for i in itens
+        ])
+        prefixado, t_prefixado = cronometrar(lambda: [
+            tabelas[i.space_id].preco(i.start_time, i.end_time) for i in itens
+        ])
+
+        def por_item():
+            compilar.cache_clear()
+            precos = []
+            for item in itens:
+                db.expire_all()
+                espaco = db.get(Space, item.space_id)
+                precos.append(tabela_precos(db, espaco).preco(item.start_time, item.end_time))
+            return precos
+
+        def em_lote():
+            compilar.cache_clear()
+            db.expire_all()
+            return [cotado["total_price"] for cotado in cotar(db, itens)]
+
+        individual, t_individual = cronometrar(por_item)
+        lote, t_lote = cronometrar(em_lote)
+
+    # Somas em ordens diferentes: no máximo um centavo de arredondamento
+    assert all(abs(a - b) < 0.015 for a, b in zip(ingenuo, prefixado))
+    assert individual == lote == prefixado
+    return {
+        "intervalos": quantidade,
+        "slot_a_slot_ms": t_ingenuo,
+        "somas_prefixadas_ms": t_prefixado,
+        "por_item_banco_ms": t_individual,
+        "cotacao_banco_ms": t_lote,
+    }
+
+def main(argv):
+    tamanhos = [int(a) for a in argv] or [500]
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.db')}")
+        preparar(engine)
+        Sessao = sessionmaker(bind=engine)
+        resultados = [medir(Sessao, n) for n in tamanhos]
+        engine.dispose()
+    print(json.dumps({"benchmark": "cotacao_precos", "resultados": resultados}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+"""
+Benchmark da conferência de conflitos de uma série recorrente.
+
+Uso:
+    python -m benchmarks.bench_recorrencia                # 100k reservas existentes
+    python -m benchmarks.bench_recorrencia 1000000
+
+Popula um banco SQLite temporário (mesma carga de bench_disponibilidade) e
+confere uma série semanal de 2 anos (104 ocorrências) de duas formas:
+  - uma consulta de disponibilidade por ocorrência
+  - `sem_conflito_existente`: uma consulta por espaço e varredura em memória
+O resultado (mediana de várias rodadas) é impresso em JSON.
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.crud.booking import _consultar_disponibilidade, sem_conflito_existente
+from app.services.recorrencia import RegraRecorrencia, expandir
+from benchmarks.bench_disponibilidade import popular, NUM_ESPACOS
+
+RODADAS = 20
+
+def medir(total_reservas):
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        popular(engine, total_reservas)
+        Sessao = sessionmaker(bind=engine)
+
+        inicio = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1, minutes=30)
+        t0 = time.perf_counter()
+        ocorrencias = list(expandir(RegraRecorrencia.interpretar("FREQ=WEEKLY;COUNT=104"), inicio, timedelta(hours=1)))
+        tempo_expansao = (time.perf_counter() - t0) * 1000
+
+        por_ocorrencia, em_lote = [], []
+        with Sessao() as db:
+            for rodada in range(RODADAS):
+                espaco_id = rodada % NUM_ESPACOS + 1
+                t = time.perf_counter()
+                individual = [_consultar_disponibilidade(db, espaco_id, o.start_time, o.end_time) for o in ocorrencias]
+                por_ocorrencia.append((time.perf_counter() - t) * 1000)
+                t = time.perf_counter()
+                lote = sem_conflito_existente(db, espaco_id, ocorrencias)
+                em_lote.append((time.perf_counter() - t) * 1000)
+                assert individual == lote
+        engine.dispose()
+
+    return {
+        "reservas": total_reservas,
+        "ocorrencias": len(ocorrencias),
+        "expansao_ms": round(tempo_expansao, 3),
+        "por_ocorrencia_ms": round(statistics.median(por_ocorrencia), 2),
+        "em_lote_ms": round(statistics.median(em_lote), 2),
+    }
+
+def main(argv):
+    tamanhos = [int(a) for a in argv] or [100_000]
+    resultados = [medir(n) for n in tamanhos]
+    print(json.dumps({"benchmark": "conflitos_recorrencia", "resultados": resultados}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
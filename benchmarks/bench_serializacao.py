@@ -0,0 +1,109 @@
+"""
+Benchmark da serialização das listagens /espacos/ e /reservas/minhas.
+
+Uso:
+    python -m benchmarks.bench_serializacao            # páginas de 1000 linhas
+    python -m benchmarks.bench_serializacao 500
+
+Compara, por página, o caminho antigo (objetos do ORM validados no schema
+de resposta com from_attributes e JSON via json.dumps, como o FastAPI faz
+com `response_model`) com o novo (select só das colunas da resposta, dicts
+e orjson). Mede separadamente consulta e serialização, confere que os dois
+caminhos geram o mesmo JSON e imprime as medianas em JSON.
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Booking, Space, User
+from app.models.booking import BookingStatus
+from app.crud.space import obter_espacos, obter_espacos_serializados
+from app.crud.booking import obter_reservas_usuario, obter_reservas_usuario_serializadas
+from app.schemas.space import EspacoResposta
+from app.schemas.booking import ReservaResposta
+from app.services.serializacao import para_json
+
+RODADAS = 20
+
+def popular(engine, linhas):
+    agora = datetime.now().replace(microsecond=0)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@exemplo.com", "full_name": "Bench", "hashed_password": "x"}])
+        conn.execute(insert(Space), [
+            {"name": f"Sala {i}", "description": "Sala com projetor", "capacity": i % 40 + 1,
+             "price_per_hour": 50.0 + i % 7, "is_available": True}
+            for i in range(linhas)
+        ])
+        conn.execute(insert(Booking), [
+            {"user_id": 1, "space_id": i % linhas + 1, "start_time": agora + timedelta(hours=i),
+             "end_time": agora + timedelta(hours=i + 1), "status": BookingStatus.CONFIRMADA, "total_price": 50.0}
+            for i in range(linhas)
+        ])
+
+def mediana_ms(funcao):
+    tempos = []
+    for _ in range(RODADAS):
+        t = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - t) * 1000)
+    return round(statistics.median(tempos), 2), resultado
+
+def comparar(db, nome, obter_orm, obter_dicts, schema, linhas):
+    adaptador = TypeAdapter(List[schema])
+
+    def serializar_antes(objetos):
+        # O que o FastAPI faz com response_model: valida e serializa em modo JSON, depois json.dumps
+        conteudo = adaptador.dump_python(adaptador.validate_python(objetos), mode="json")
+        return json.dumps(conteudo, ensure_ascii=False, separators=(",", ":")).encode()
+
+    consulta_antes, objetos = mediana_ms(obter_orm)
+    serializacao_antes, json_antes = mediana_ms(lambda: serializar_antes(objetos))
+    consulta_depois, dicts = mediana_ms(obter_dicts)
+    serializacao_depois, json_depois = mediana_ms(lambda: para_json(dicts))
+    assert json.loads(json_antes) == json.loads(json_depois), f"{nome}: JSON diferente entre os caminhos"
+    return {
+        "linhas": linhas,
+        "antes": {"consulta_ms": consulta_antes, "serializacao_ms": serializacao_antes},
+        "depois": {"consulta_ms": consulta_depois, "serializacao_ms": serializacao_depois},
+        "serializacao_por_1000_linhas_ms": {
+            "antes": round(serializacao_antes * 1000 / linhas, 2),
+            "depois": round(serializacao_depois * 1000 / linhas, 2),
+        },
+    }
+
+def main(argv):
+    linhas = int(argv[0]) if argv else 1000
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{os.path.join(diretorio, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        popular(engine, linhas)
+        with sessionmaker(bind=engine)() as db:
+            resultados = {
+                "/espacos/": comparar(
+                    db, "espacos",
+                    lambda: (db.expunge_all(), obter_espacos(db, limit=linhas))[1],
+                    lambda: obter_espacos_serializados(db, limit=linhas),
+                    EspacoResposta, linhas
+                ),
+                "/reservas/minhas": comparar(
+                    db, "reservas",
+                    lambda: (db.expunge_all(), obter_reservas_usuario(db, 1, limit=linhas))[1],
+                    lambda: obter_reservas_usuario_serializadas(db, 1, limit=linhas),
+                    ReservaResposta, linhas
+                ),
+            }
+        engine.dispose()
+    print(json.dumps({"benchmark": "serializacao", "resultados": resultados}, indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
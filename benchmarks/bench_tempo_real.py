@@ -0,0 +1,122 @@
+"""
+Benchmark do broker de eventos em tempo real (app/services/tempo_real.py).
+
+Uso:
+    python -m benchmarks.bench_tempo_real                      # 1000 conexões, 100 espaços
+    python -m benchmarks.bench_tempo_real --conexoes 5000 --espacos 500 --eventos 20000
+    python -m benchmarks.bench_tempo_real --backend memoria
+
+Cada conexão assina um calendário (3 espaços) e consome os eventos no event
+loop; uma thread publica as escritas, como o threadpool da API. Mede:
+  - vazão de publicação e latência publicação -> entrega (p50/p99, conexões rápidas)
+  - coalescência: um décimo das conexões consome devagar
+  - por minuto, em regime: as requisições que as mesmas conexões fariam
+    consultando cada espaço a cada --intervalo-polling segundos, contra as
+    releituras que o push ainda provoca (ressincronizar) e as mensagens enviadas
+Resultado em JSON.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+from app.services.tempo_real import BrokerDistribuido, BrokerEventos, CanalMemoria
+
+ESPACOS_POR_CONEXAO = 3
+
+def criar(backend: str, fila_max: int) -> BrokerEventos:
+    if backend == "memoria":
+        return BrokerDistribuido(CanalMemoria(), fila_max)
+    return BrokerEventos(fila_max)
+
+async def consumir(assinante, latencias, mensagens, lento: bool, parar: asyncio.Event):
+    while not parar.is_set():
+        try:
+            eventos = await asyncio.wait_for(assinante.proximos(), 0.2)
+        except asyncio.TimeoutError:
+            continue
+        mensagens.append(len(eventos))
+        if lento:
+            await asyncio.sleep(0.05)
+        else:
+            agora = time.perf_counter()
+            latencias.extend(agora - e["t"] for e in eventos if "t" in e)
+
+async def executar(args) -> dict:
+    broker = criar(args.backend, args.fila_max)
+    aleatorio = random.Random(42)
+    assinantes = [
+        broker.assinar(aleatorio.sample(range(1, args.espacos + 1), ESPACOS_POR_CONEXAO))
+        for _ in range(args.conexoes)
+    ]
+    latencias, mensagens, parar = [], [], asyncio.Event()
+    consumidores = [
+        asyncio.ensure_future(consumir(a, latencias, mensagens, lento=(i % 10 == 0), parar=parar))
+        for i, a in enumerate(assinantes)
+    ]
+    await asyncio.sleep(0.1)
+
+    def publicar():
+        intervalo = 1 / args.taxa if args.taxa else 0
+        for i in range(args.eventos):
+            broker.publicar({
+                "tipo": "reserva", "space_id": aleatorio.randint(1, args.espacos), "id": i,
+                "status": "pendente", "t": time.perf_counter(),
+            })
+            if intervalo:
+                time.sleep(intervalo)
+
+    inicio = time.perf_counter()
+    publicador = threading.Thread(target=publicar)
+    publicador.start()
+    while publicador.is_alive():
+        await asyncio.sleep(0.01)
+    tempo_publicacao = time.perf_counter() - inicio
+    await asyncio.sleep(0.5)
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    await asyncio.gather(*consumidores)
+
+    estatisticas = broker.estatisticas()
+    for assinante in assinantes:
+        broker.cancelar(assinante)
+    latencias.sort()
+    por_minuto = 60 / duracao
+    polling = args.conexoes * ESPACOS_POR_CONEXAO * 60 / args.intervalo_polling
+    releituras = estatisticas["ressincronizacoes"] * por_minuto
+    return {
+        "backend": args.backend,
+        "conexoes": args.conexoes,
+        "espacos": args.espacos,
+        "eventos": args.eventos,
+        "publicacao_por_s": round(args.eventos / tempo_publicacao),
+        "latencia_p50_ms": round(latencias[len(latencias) // 2] * 1000, 3) if latencias else None,
+        "latencia_p99_ms": round(latencias[int(len(latencias) * 0.99)] * 1000, 3) if latencias else None,
+        "entregues": estatisticas["entregues"],
+        "coalescidos": estatisticas["coalescidos"],
+        "ressincronizacoes": estatisticas["ressincronizacoes"],
+        "duracao_s": round(duracao, 2),
+        "por_minuto": {
+            "requisicoes_polling": round(polling),
+            "releituras_push": round(releituras),
+            "mensagens_push": round((sum(mensagens) - len(assinantes)) * por_minuto),
+            "reducao_requisicoes": round(polling / releituras, 1) if releituras else None,
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_tempo_real", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backend", choices=["local", "memoria"], default="local")
+    parser.add_argument("--conexoes", type=int, default=1000)
+    parser.add_argument("--espacos", type=int, default=100)
+    parser.add_argument("--eventos", type=int, default=1000)
+    parser.add_argument("--taxa", type=float, default=50, help="escritas publicadas por segundo (0 = sem pausa)")
+    parser.add_argument("--fila-max", type=int, default=100)
+    parser.add_argument("--intervalo-polling", type=float, default=5, help="segundos entre consultas de cada calendário")
+    args = parser.parse_args()
+    print(json.dumps({"benchmark": "tempo_real", "resultado": asyncio.run(executar(args))}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+-- Banco separado para a suíte de carga (benchmarks/carga.py recria as tabelas dele)
+CREATE DATABASE booking_bench OWNER booking;
@@ -0,0 +1,113 @@
+"""
+Comandos de manutenção, para rodar fora do servidor (cron, deploy).
+
+Uso:
+    python gerenciar.py migrar [--revisao REV]
+    python gerenciar.py materializar-recorrencias [--dias N]
+    python gerenciar.py reconstruir-ocupacao [--espaco ID]
+    python gerenciar.py aplicar-transicoes
+    python gerenciar.py arquivar-reservas [--dias N] [--max-lotes N]
+    python gerenciar.py varrer-idempotencia [--max-lotes N]
+"""
+import argparse
+import json
+import logging
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal
+
+def migrar(args):
+    from app.migracoes import migrar
+    return {"revisao": migrar(args.revisao)}
+
+def materializar_recorrencias(args):
+    from app.crud.recurring_booking import materializar_recorrencias
+    ate = datetime.now() + timedelta(days=args.dias) if args.dias else None
+    with SessionLocal() as db:
+        return materializar_recorrencias(db, ate)
+
+def reconstruir_ocupacao(args):
+    from app.crud.space_occupancy import reconstruir_ocupacao
+    with SessionLocal() as db:
+        return reconstruir_ocupacao(db, args.espaco)
+
+def aplicar_transicoes(args):
+    from app.crud.booking_lifecycle import aplicar_transicoes
+    with SessionLocal() as db:
+        return aplicar_transicoes(db)
+
+def arquivar_reservas(args):
+    from app.crud.booking_archive import ARQUIVO_RETENCAO_DIAS, arquivar_reservas
+    dias = ARQUIVO_RETENCAO_DIAS if args.dias is None else args.dias
+    with SessionLocal() as db:
+        return arquivar_reservas(db, dias, max_lotes=args.max_lotes)
+
+def varrer_idempotencia(args):
+    from app.crud.idempotency import varrer_chaves_expiradas
+    with SessionLocal() as db:
+        return varrer_chaves_expiradas(db, max_lotes=args.max_lotes)
+
+def main():
+    parser = argparse.ArgumentParser(description="Comandos de manutenção do Booking System")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    migracao = comandos.add_parser(
+        "migrar",
+        help="Aplica as migrações do banco (Alembic) até a revisão"
+    )
+    migracao.add_argument("--revisao", default="head", help="Revisão alvo (padrão: head)")
+    migracao.set_defaults(executar=migrar)
+
+    materializar = comandos.add_parser(
+        "materializar-recorrencias",
+        help="Grava as ocorrências das séries recorrentes até o horizonte"
+    )
+    materializar.add_argument(
+        "--dias", type=int, default=None,
+        help="Horizonte em dias a partir de agora (padrão: RECORRENCIA_HORIZONTE_DIAS)"
+    )
+    materializar.set_defaults(executar=materializar_recorrencias)
+
+    reconstruir = comandos.add_parser(
+        "reconstruir-ocupacao",
+        help="Reconstrói o mapa de ocupação a partir das reservas"
+    )
+    reconstruir.add_argument("--espaco", type=int, default=None, help="Apenas este espaço")
+    reconstruir.set_defaults(executar=reconstruir_ocupacao)
+
+    transicoes = comandos.add_parser(
+        "aplicar-transicoes",
+        help="Cancela pendentes terminadas (ou expiradas pelo TTL) e conclui confirmadas já terminadas"
+    )
+    transicoes.set_defaults(executar=aplicar_transicoes)
+
+    arquivar = comandos.add_parser(
+        "arquivar-reservas",
+        help="Move reservas concluídas/canceladas antigas para bookings_archive, em lotes"
+    )
+    arquivar.add_argument(
+        "--dias", type=int, default=None,
+        help="Retenção em dias após o fim (padrão: ARQUIVO_RETENCAO_DIAS)"
+    )
+    arquivar.add_argument(
+        "--max-lotes", type=int, default=0,
+        help="Para depois de N lotes; rodar de novo continua de onde parou (0 = até acabar)"
+    )
+    arquivar.set_defaults(executar=arquivar_reservas)
+
+    varrer = comandos.add_parser(
+        "varrer-idempotencia",
+        help="Remove as chaves de idempotência expiradas, em lotes"
+    )
+    varrer.add_argument(
+        "--max-lotes", type=int, default=0,
+        help="Para depois de N lotes (0 = até acabar)"
+    )
+    varrer.set_defaults(executar=varrer_idempotencia)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(args.executar(args), indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Servidor de produção com vários workers, dimensionado pelos CPUs disponíveis.
+
+Uso:
+    python gerenciar.py migrar        # passo de deploy, uma vez
+    python producao.py [--migrar]     # --migrar: aplica as migrações antes de subir os workers
+
+Com gunicorn instalado (Linux/macOS), a aplicação é importada uma vez no
+processo mestre e os workers (UvicornWorker) nascem por fork já com tudo
+carregado, então um worker novo atende a primeira requisição sem repetir as
+importações. Sem gunicorn, usa os workers do próprio uvicorn, que importam a
+aplicação em cada processo.
+
+Configuração (variáveis de ambiente):
+    HOST, PORT               endereço de escuta
+    WEB_WORKERS              processos (padrão: CPUs disponíveis para o processo)
+    WEB_SERVIDOR             auto | gunicorn | uvicorn
+    WEB_BACKLOG              conexões pendentes aceitas pelo socket
+    WEB_KEEPALIVE_S          tempo de keep-alive das conexões ociosas
+    WEB_TIMEOUT_S            worker sem resposta por mais que isso é reiniciado (gunicorn)
+    WEB_MAX_REQUISICOES      reinicia o worker após N requisições (0 = nunca; gunicorn)
+
+SENHA_WORKERS, quando não definido, passa a ser a parte de cada worker nos
+CPUs, para os pools de bcrypt de todos os workers não disputarem mais núcleos
+do que existem. Cada worker tem seu próprio pool de conexões (DB_POOL_SIZE).
+"""
+import argparse
+import logging
+import os
+
+logger = logging.getLogger("producao")
+
+def cpus_disponiveis() -> int:
+    """CPUs que o processo pode usar (respeita a afinidade, ex.: taskset/cpuset)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def configuracao() -> dict:
+    cpus = cpus_disponiveis()
+    workers = int(os.getenv("WEB_WORKERS", cpus))
+    return {
+        "host": os.getenv("HOST", "0.0.0.0"),
+        "porta": int(os.getenv("PORT", 8000)),
+        "workers": max(workers, 1),
+        "servidor": os.getenv("WEB_SERVIDOR", "auto"),
+        "backlog": int(os.getenv("WEB_BACKLOG", 2048)),
+        "keepalive_s": int(os.getenv("WEB_KEEPALIVE_S", 5)),
+        "timeout_s": int(os.getenv("WEB_TIMEOUT_S", 60)),
+        "max_requisicoes": int(os.getenv("WEB_MAX_REQUISICOES", 0)),
+        "senha_workers": max(1, cpus // max(workers, 1)),
+    }
+
+def validar(config: dict):
+    if config["workers"] > 1:
+        if os.getenv("MOTOR_DISPONIBILIDADE", "desligado") != "desligado":
+            raise SystemExit(
+                "MOTOR_DISPONIBILIDADE guarda a ocupação na memória de um processo; "
+                "use WEB_WORKERS=1 ou desligue o motor"
+            )
+        if os.getenv("AGENDADOR_ATIVO", "false").lower() in ("1", "true", "sim"):
+            logger.warning(
+                "AGENDADOR_ATIVO com %s workers: as tarefas rodam em todos; prefira `python worker.py`",
+                config["workers"]
+            )
+        if os.getenv("TEMPO_REAL_BACKEND", "local") == "local":
+            logger.warning(
+                "TEMPO_REAL_BACKEND=local com %s workers: cada conexão WebSocket/SSE só recebe as escritas "
+                "do próprio worker; use TEMPO_REAL_BACKEND=redis",
+                config["workers"]
+            )
+        if os.getenv("LIMITE_TAXA_BACKEND", "local") == "local":
+            logger.info(
+                "LIMITE_TAXA_BACKEND=local com %s workers: cada worker aplica o limite à parte "
+                "(até %sx por cliente); use LIMITE_TAXA_BACKEND=redis para um limite único",
+                config["workers"], config["workers"]
+            )
+
+def _gunicorn_disponivel() -> bool:
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _apos_fork(server, worker):
+    # Conexões abertas no mestre (ex.: pelo --migrar) não podem ser compartilhadas
+    from app.database import engine
+    engine.dispose(close=False)
+
+def executar_gunicorn(config: dict):
+    from gunicorn.app.base import BaseApplication
+
+    opcoes = {
+        "bind": f"{config['host']}:{config['porta']}",
+        "workers": config["workers"],
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "backlog": config["backlog"],
+        "keepalive": config["keepalive_s"],
+        "timeout": config["timeout_s"],
+        "graceful_timeout": config["timeout_s"],
+        "max_requests": config["max_requisicoes"],
+        "max_requests_jitter": config["max_requisicoes"] // 10,
+        "post_fork": _apos_fork,
+    }
+
+    class Aplicacao(BaseApplication):
+        def load_config(self):
+            for nome, valor in opcoes.items():
+                self.cfg.set(nome, valor)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    Aplicacao().run()
+
+def executar_uvicorn(config: dict):
+    import uvicorn
+    uvicorn.run(
+        "app.main:app",
+        host=config["host"],
+        port=config["porta"],
+        workers=config["workers"],
+        backlog=config["backlog"],
+        timeout_keep_alive=config["keepalive_s"],
+        log_level="info",
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de produção do Booking System")
+    parser.add_argument("--migrar", action="store_true", help="Aplica as migrações antes de subir os workers")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    # O alembic.ini (--migrar) reconfigura a raiz do logging em WARN
+    logger.setLevel(logging.INFO)
+
+    config = configuracao()
+    validar(config)
+    # Herdado pelos workers (fork ou spawn), lido ao importar app.auth.senhas
+    os.environ.setdefault("SENHA_WORKERS", str(config["senha_workers"]))
+
+    if args.migrar:
+        from app.migracoes import migrar
+        logger.info("Banco na revisão %s", migrar())
+
+    servidor = config["servidor"]
+    if servidor == "auto":
+        servidor = "gunicorn" if _gunicorn_disponivel() else "uvicorn"
+    logger.info("%s com %s workers em %s:%s", servidor, config["workers"], config["host"], config["porta"])
+    if servidor == "gunicorn":
+        executar_gunicorn(config)
+    else:
+        executar_uvicorn(config)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@ import uvicorn
 import os
 
 if __name__ == "__main__":
+    # Desenvolvimento: o esquema é aplicado aqui, uma vez; os reinícios do reload só importam a app
+    from app.migracoes import migrar
+    migrar()
+
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(
         "app.main:app",
@@ -9,4 +13,4 @@ if __name__ == "__main__":
         port=port,
         reload=True,
         log_level="info"
-    )
\ No newline at end of file
+    )
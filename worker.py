@@ -0,0 +1,28 @@
+"""
+Processo separado para as tarefas periódicas (transições de reservas).
+
+Uso:
+    python worker.py
+
+Roda até Ctrl+C / SIGTERM. Para uma única execução, use
+`python gerenciar.py aplicar-transicoes`.
+"""
+import asyncio
+import logging
+import signal
+
+from app.services.agendador import agendador
+
+async def executar():
+    parar = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sinal, parar.set)
+
+    agendador.iniciar()
+    await parar.wait()
+    await agendador.parar()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(executar())